@@ -0,0 +1,3 @@
+"""
+Benchmark suite: deterministic synthetic corpus + timed scenarios (see bench/run.py).
+"""
@@ -0,0 +1,329 @@
+"""
+Reader latency while a bulk matcher writes, per SQLite settings profile.
+
+    cd backend
+    python -m bench.concurrency --scale 10k                       # default vs production
+    python -m bench.concurrency --scale 10k --profile production --out conc.json
+
+Each profile runs in its own process on a private copy of the synthetic DB:
+  - baseline: `--readers` threads issue reads for `--seconds` with no writer
+  - contended: the same readers while one writer re-matches posts in committed batches
+    (run_term_matching(force=True)), i.e. the write pattern of a big backfill
+  - ingest: readers and the matching writer while an ingester loops over
+    ingest_from_subreddit with a fake Reddit fetch that takes `--fetch-seconds` and
+    returns `--ingest-posts` new posts, i.e. the pipeline's fetcher thread (the writer
+    idles `--write-pause` between batches here, like a matcher between drains)
+Reported: reader p50/p95/p99/max latency, reads/s, failed reads ("database is locked"),
+writer posts/s, batch latency and failed batches ("locked" once a wait exceeds
+busy_timeout), ingests/s, store latency (after the fetch) and failed ingests.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from bench.run import DATA_DIR, SCALES, _setup_django
+
+PROFILES = ["default", "production"]
+
+
+def _prepare_db(scale: str, terms: int, seed: int, profile: str) -> tuple[Path, Path]:
+    base = DATA_DIR / f"concurrency-{scale}-t{terms}-s{seed}.sqlite3"
+    work = DATA_DIR / f"concurrency-{scale}-t{terms}-s{seed}-{profile}.work.sqlite3"
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{work}{suffix}").unlink(missing_ok=True)
+    if base.exists():
+        shutil.copyfile(base, work)
+        # WAL is a persistent property of the file; start every profile from rollback journal
+        con = sqlite3.connect(work)
+        con.execute("PRAGMA journal_mode=DELETE")
+        con.close()
+    return base, work
+
+
+def _percentiles_ms(samples: list[float]) -> dict:
+    if not samples:
+        return {"n": 0}
+    samples = sorted(samples)
+    q = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "n": len(samples),
+        "p50_ms": round(q[49] * 1000, 2),
+        "p95_ms": round(q[94] * 1000, 2),
+        "p99_ms": round(q[98] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+def _reader(stop: threading.Event, latencies: list, errors: list):
+    # SQL-bound reads (the API's list + an aggregate over the 7-day window), so the
+    # numbers reflect lock waits rather than Python scoring time competing for the GIL
+    from datetime import timedelta
+
+    from django.db import OperationalError, connection
+    from django.db.models import Count
+    from django.utils import timezone
+
+    from posts.models import Post, PostTerm
+
+    since = timezone.now() - timedelta(days=7)
+    i = 0
+    try:
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            try:
+                if i % 2:
+                    list(
+                        PostTerm.objects.filter(post__created_utc__gte=since)
+                        .values("term_id").annotate(n=Count("id")).order_by("-n")[:20]
+                    )
+                else:
+                    list(Post.objects.order_by("-created_utc").values_list("id", "title")[:20])
+                latencies.append(time.perf_counter() - t0)
+            except OperationalError as e:
+                errors.append(str(e))
+            i += 1
+    finally:
+        connection.close()
+
+
+def _writer(stop: threading.Event, batch: int, stats: dict, pause: float = 0.0):
+    from django.db import OperationalError, connection
+
+    from posts.models import Post
+    from posts.term_matcher import run_term_matching
+
+    ids = list(Post.objects.order_by("id").values_list("id", flat=True))
+    pos = 0
+    try:
+        while not stop.is_set() and ids:
+            chunk = ids[pos:pos + batch] or ids[:batch]
+            pos = (pos + batch) % len(ids)
+            t0 = time.perf_counter()
+            try:
+                run_term_matching(posts_qs=Post.objects.filter(id__in=chunk), limit=None, force=True)
+                stats["posts"] += len(chunk)
+                stats["latencies"].append(time.perf_counter() - t0)
+            except OperationalError as e:
+                stats["errors"].append(str(e))
+            if pause:
+                stop.wait(pause)
+    finally:
+        connection.close()
+
+
+class _SlowResponse:
+    # Stands in for requests.Response: a /new.json page of never-seen posts
+    status_code = 200
+
+    def __init__(self, payload: dict):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def _slow_get(fetch_seconds: float, n_posts: int):
+    counter = iter(range(10**9))
+
+    def get(url, **kwargs):
+        time.sleep(fetch_seconds)
+        now = time.time()
+        children = []
+        for _ in range(n_posts):
+            i = next(counter)
+            children.append({"data": {
+                "id": f"bench-ingest-{i}", "title": f"bench ingest post {i} ramen tacos",
+                "selftext": "", "created_utc": now, "score": 1, "num_comments": 0,
+            }})
+        return _SlowResponse({"data": {"children": children}})
+
+    return get
+
+
+def _ingester(stop: threading.Event, stats: dict):
+    from django.db import OperationalError, connection
+
+    from posts.reddit_json_ingest import ingest_from_subreddit
+
+    try:
+        while not stop.is_set():
+            fetch = {}
+            t0 = time.perf_counter()
+            try:
+                stats["posts"] += ingest_from_subreddit("bench", limit=stats["limit"], stats=fetch)
+                stats["fetches"] += 1
+                # time spent storing, i.e. waiting for and holding the write lock
+                stats["latencies"].append(time.perf_counter() - t0 - fetch["latency_seconds"])
+            except OperationalError as e:
+                stats["errors"].append(str(e))
+    finally:
+        connection.close()
+
+
+def _phase(readers: int, seconds: float, write_batch: int | None, ingest: dict | None = None) -> dict:
+    import contextlib
+    import io
+    from unittest import mock
+
+    stop = threading.Event()
+    latencies, errors = [], []
+    writer_stats = {"posts": 0, "errors": [], "latencies": []}
+    ingest_stats = {"posts": 0, "fetches": 0, "errors": [], "latencies": [],
+                    "limit": ingest["posts"] if ingest else 0}
+
+    threads = [threading.Thread(target=_reader, args=(stop, latencies, errors)) for _ in range(readers)]
+    if write_batch:
+        pause = ingest["write_pause"] if ingest else 0.0
+        threads.append(threading.Thread(target=_writer, args=(stop, write_batch, writer_stats, pause)))
+    patches = contextlib.ExitStack()
+    if ingest:
+        import requests
+
+        threads.append(threading.Thread(target=_ingester, args=(stop, ingest_stats)))
+        patches.enter_context(mock.patch.object(requests, "get", _slow_get(ingest["fetch_seconds"], ingest["posts"])))
+
+    # run_term_matching / ingest print a line per batch
+    with patches, contextlib.redirect_stdout(io.StringIO()):
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+    result = {
+        "readers": _percentiles_ms(latencies),
+        "reads_per_s": round(len(latencies) / seconds, 1),
+        "read_errors": len(errors),
+    }
+    if write_batch:
+        result["writer_posts_per_s"] = round(writer_stats["posts"] / seconds, 1)
+        result["writer_batches"] = _percentiles_ms(writer_stats["latencies"])
+        result["write_errors"] = len(writer_stats["errors"])
+    if ingest:
+        result["ingests_per_s"] = round(ingest_stats["fetches"] / seconds, 2)
+        result["ingest_posts"] = ingest_stats["posts"]
+        result["ingest_store"] = _percentiles_ms(ingest_stats["latencies"])
+        result["ingest_errors"] = len(ingest_stats["errors"])
+    return result
+
+
+def run_profile(args) -> dict:
+    os.environ["FOODTREND_SQLITE_PROFILE"] = args.profile
+    DATA_DIR.mkdir(exist_ok=True)
+    base, work = _prepare_db(args.scale, args.terms, args.seed, args.profile)
+    fresh = not base.exists()
+
+    _setup_django(work)
+
+    from django.db import connection
+
+    if fresh:
+        from bench.synthetic import generate_corpus
+
+        generate_corpus(SCALES[args.scale], n_terms=args.terms, seed=args.seed)
+        with connection.cursor() as c:
+            c.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.close()
+        shutil.copyfile(work, base)
+
+    with connection.cursor() as c:
+        c.execute("PRAGMA journal_mode")
+        journal_mode = c.fetchone()[0]
+    connection.close()
+
+    return {
+        "profile": args.profile,
+        "journal_mode": journal_mode,
+        "baseline": _phase(args.readers, args.seconds, None),
+        "contended": _phase(args.readers, args.seconds, args.write_batch),
+        "ingest": _phase(
+            args.readers, args.seconds, args.write_batch,
+            ingest={"fetch_seconds": args.fetch_seconds, "posts": args.ingest_posts, "write_pause": args.write_pause},
+        ),
+    }
+
+
+def _print(result: dict):
+    print(f"\n[{result['profile']}] journal_mode={result['journal_mode']}")
+    for phase in ("baseline", "contended", "ingest"):
+        r = result[phase]
+        lat = r["readers"]
+        line = (
+            f"  {phase:<10} reads p50 {lat.get('p50_ms', 0):>8.2f}ms  p95 {lat.get('p95_ms', 0):>8.2f}ms  "
+            f"p99 {lat.get('p99_ms', 0):>8.2f}ms  max {lat.get('max_ms', 0):>8.2f}ms  "
+            f"{r['reads_per_s']:>7.1f} reads/s  errors {r['read_errors']}"
+        )
+        if "writer_posts_per_s" in r:
+            line += (
+                f"  | writer {r['writer_posts_per_s']:.1f} posts/s, batch max "
+                f"{r['writer_batches'].get('max_ms', 0):.0f}ms, errors {r['write_errors']}"
+            )
+        if "ingests_per_s" in r:
+            line += (
+                f"  | ingest {r['ingests_per_s']:.2f}/s, store max "
+                f"{r['ingest_store'].get('max_ms', 0):.0f}ms, errors {r['ingest_errors']}"
+            )
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="10k", help="10k | 100k | 1m (number of posts).")
+    parser.add_argument("--terms", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--profile", default="both", choices=PROFILES + ["both"])
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each phase.")
+    parser.add_argument("--write-batch", type=int, default=100, help="Posts per committed matching batch.")
+    parser.add_argument("--fetch-seconds", type=float, default=2.0, help="Fake Reddit fetch latency (ingest phase).")
+    parser.add_argument("--ingest-posts", type=int, default=50, help="New posts per fake fetch (ingest phase).")
+    parser.add_argument("--write-pause", type=float, default=0.2,
+                        help="Writer idle time between batches (ingest phase); a writer that commits "
+                             "back-to-back starves other writers in SQLite's busy handler.")
+    parser.add_argument("--out", default=None, help="Write results JSON here.")
+    args = parser.parse_args(argv)
+
+    if args.scale not in SCALES:
+        parser.error(f"--scale must be one of {', '.join(SCALES)}")
+
+    if args.profile != "both":
+        result = run_profile(args)
+        results = [result]
+        if args.out:
+            Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        _print(result)
+        return 0
+
+    # One process per profile: DATABASES is fixed at django.setup()
+    results = []
+    for profile in PROFILES:
+        out = DATA_DIR / f"concurrency-{profile}.json"
+        DATA_DIR.mkdir(exist_ok=True)
+        cmd = [
+            sys.executable, "-m", "bench.concurrency",
+            "--scale", args.scale, "--terms", str(args.terms), "--seed", str(args.seed),
+            "--profile", profile, "--readers", str(args.readers), "--seconds", str(args.seconds),
+            "--write-batch", str(args.write_batch), "--fetch-seconds", str(args.fetch_seconds),
+            "--ingest-posts", str(args.ingest_posts), "--write-pause", str(args.write_pause),
+            "--out", str(out),
+        ]
+        subprocess.run(cmd, check=True, cwd=Path(__file__).resolve().parent.parent)
+        results.extend(json.loads(out.read_text(encoding="utf-8")))
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Startup import cost of management commands (python -X importtime), with a budget.
+
+    cd backend
+    python -m bench.importtime                          # exit 1 over budget
+    python -m bench.importtime --out importtime.json
+    python -m bench.importtime --compare importtime.json   # also exit 1 on regression
+
+Each target is a fresh interpreter running django.setup() and importing one command
+module under the lean worker settings (config.settings_worker), i.e. what every cron /
+worker invocation pays before handle(). Reported per target: total import time (sum of
+the -X importtime self times, median over --repeat runs) and the slowest top-level
+imports. A target fails when it imports a module that must stay lazy (requests, pandas,
+pyarrow, VADER, numpy where unused, the web apps), or exceeds its budget in ms.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Loaded at first use only (network fetch, offline analytics, sentiment pool workers)
+LAZY = ["requests", "pandas", "pyarrow", "vaderSentiment"]
+# Not installed in the worker profile
+WEB = ["django.contrib.admin", "django.contrib.sessions", "rest_framework", "corsheaders"]
+
+# command -> (budget ms, modules that must not be imported)
+TARGETS = {
+    "import_terms": (400, LAZY + WEB + ["numpy"]),
+    "extract_candidates": (400, LAZY + WEB + ["numpy"]),
+    "score_sentiment": (450, LAZY + WEB + ["numpy"]),
+    "publish_snapshots": (450, LAZY + WEB + ["numpy"]),
+    # matching needs numpy (compiled term index, MinHash)
+    "match_worker": (550, LAZY + WEB),
+    "run_pipeline": (600, LAZY + WEB),
+}
+
+
+def measure(command: str, settings_module: str) -> dict:
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module, "PYTHONPATH": str(BACKEND_DIR)}
+    code = (
+        f"import django; django.setup(); import posts.management.commands.{command}; "
+        "import sys; print('\\n'.join(sys.modules))"
+    )
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"{command}: {proc.stderr.strip().splitlines()[-1]}")
+
+    # -X importtime leaves out some packages; sys.modules is the full list
+    modules = set(proc.stdout.split())
+    total_us = 0
+    top = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        if not name.startswith("  "):
+            top.append((int(cumulative_us), name.strip()))
+    top.sort(reverse=True)
+    return {"total_ms": total_us / 1000, "wall_ms": wall * 1000, "modules": modules, "top": top[:5]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--settings", default="config.settings_worker")
+    parser.add_argument("--only", nargs="*", default=None, help="Run only these commands.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="Multiply every budget (slow machines).")
+    parser.add_argument("--out", default=None, help="Write results JSON here.")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON.")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Allowed slowdown ratio vs baseline.")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0, help="Ignore slowdowns smaller than this.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the slowest top-level imports.")
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["targets"] if args.compare else {}
+    failures = []
+    results = {}
+    for command in args.only or list(TARGETS):
+        budget, forbidden = TARGETS[command]
+        budget *= args.budget_scale
+        measure(command, args.settings)  # warm .pyc files
+        runs = [measure(command, args.settings) for _ in range(max(1, args.repeat))]
+        total = statistics.median(r["total_ms"] for r in runs)
+        wall = statistics.median(r["wall_ms"] for r in runs)
+        loaded = [m for m in forbidden if m in runs[-1]["modules"]]
+        results[command] = {"import_ms": round(total, 1), "wall_ms": round(wall, 1), "budget_ms": budget}
+
+        flags = []
+        if loaded:
+            flags.append(f"IMPORTS {', '.join(loaded)}")
+        if total > budget:
+            flags.append("OVER BUDGET")
+        base = baseline.get(command)
+        if base:
+            old = base["import_ms"]
+            if total > old * (1 + args.tolerance) and total - old > args.min_delta_ms:
+                flags.append(f"REGRESSION (was {old:.0f}ms)")
+        if flags:
+            failures.append(command)
+
+        print(f"{command:<20} import {total:>7.1f}ms  wall {wall:>7.1f}ms  budget {budget:>5.0f}ms  "
+              f"{'  '.join(flags)}")
+        if args.verbose:
+            for cumulative_us, name in runs[-1]["top"]:
+                print(f"    {cumulative_us / 1000:>7.1f}ms  {name}")
+
+    if args.out:
+        payload = {
+            "meta": {"settings": args.settings, "python": sys.version.split()[0], "repeat": args.repeat},
+            "targets": results,
+        }
+        Path(args.out).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Results written to {args.out}")
+
+    if failures:
+        print(f"Failed: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Run the benchmark suite and write JSON results.
+
+    cd backend
+    python -m bench.run --scale 10k --out bench-10k.json
+    python -m bench.run --scale 10k --compare bench-10k.json   # exit 1 on regression
+
+The synthetic DB is generated once per (scale, seed) under bench/.data/ and reused.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCH_DIR / ".data"
+
+SCALES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+
+def _setup_django(db_path: Path):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    os.environ["FOODTREND_DB_PATH"] = str(db_path)
+    sys.path.insert(0, str(BENCH_DIR.parent))
+
+    import django
+
+    django.setup()
+
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time(fn, ctx, repeat: int, warmup: int) -> dict:
+    info = {}
+    for _ in range(warmup):
+        info = fn(ctx)
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        info = fn(ctx)
+        runs.append(time.perf_counter() - t0)
+    return {
+        "median_s": round(statistics.median(runs), 6),
+        "min_s": round(min(runs), 6),
+        "runs_s": [round(r, 6) for r in runs],
+        **info,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_s: float) -> list[str]:
+    """
+    Regressions: median slower than baseline by more than `tolerance` (ratio) AND `min_delta_s`.
+    """
+    regressions = []
+    for name, cur in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        old, new = base["median_s"], cur["median_s"]
+        ratio = new / old if old else float("inf")
+        flag = ratio > 1 + tolerance and new - old > min_delta_s
+        print(f"{name:<24} {old * 1000:>10.2f}ms -> {new * 1000:>10.2f}ms  x{ratio:5.2f}{'  REGRESSION' if flag else ''}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="10k", help="10k | 100k | 1m (number of posts).")
+    parser.add_argument("--terms", type=int, default=2000, help="Vocabulary size.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--unmatched", type=int, default=2000, help="Posts left for the term_matching scenario.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--only", nargs="*", default=None, help="Run only these scenarios.")
+    parser.add_argument("--regenerate", action="store_true", help="Rebuild the synthetic DB.")
+    parser.add_argument("--out", default=None, help="Write results JSON here.")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON; exit 1 on regression.")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Allowed slowdown ratio vs baseline.")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this.")
+    args = parser.parse_args(argv)
+
+    if args.scale not in SCALES:
+        parser.error(f"--scale must be one of {', '.join(SCALES)}")
+    n_posts = SCALES[args.scale]
+
+    DATA_DIR.mkdir(exist_ok=True)
+    db_path = DATA_DIR / f"bench-{args.scale}-t{args.terms}-s{args.seed}-u{args.unmatched}.sqlite3"
+    if args.regenerate and db_path.exists():
+        db_path.unlink()
+    fresh = not db_path.exists()
+
+    _setup_django(db_path)
+
+    from bench import scenarios
+    from bench.synthetic import generate_corpus
+
+    if fresh:
+        t0 = time.perf_counter()
+        stats = generate_corpus(n_posts, n_terms=args.terms, seed=args.seed, unmatched_posts=args.unmatched)
+        print(f"Generated {stats} in {time.perf_counter() - t0:.1f}s -> {db_path}")
+
+    ctx = {
+        "extract_limit": min(n_posts, 20_000),
+        "ingest_rows": 500,
+    }
+    names = args.only or list(scenarios.SCENARIOS)
+
+    results = {}
+    for name in names:
+        fn = scenarios.SCENARIOS[name]
+        results[name] = _time(fn, ctx, repeat=args.repeat, warmup=args.warmup)
+        print(f"{name:<24} median {results[name]['median_s'] * 1000:>10.2f}ms  min {results[name]['min_s'] * 1000:>10.2f}ms")
+
+    import django
+
+    payload = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "machine": platform.machine(),
+            "scale": args.scale,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "corpus": scenarios.corpus_counts(),
+        },
+        "scenarios": results,
+    }
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Results written to {args.out}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(payload, baseline, args.tolerance, args.min_delta_ms / 1000.0)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Timed scenarios. Each returns a small dict of facts about the run (rows, results);
+writes happen inside a rolled-back transaction so every repeat sees the same data.
+"""
+
+from contextlib import contextmanager
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+
+from bench.synthetic import reddit_listing
+from posts.models import Post, Term
+from posts.reddit_json_ingest import store_posts
+from posts.services.search import search_posts
+from posts.services.trending import get_trending_terms
+from posts.term_matcher import run_term_matching
+from posts.trending_cuisines import get_trending_cuisines
+
+
+@contextmanager
+def rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def _popular_term() -> str:
+    # Zipf rank 0 is the first term the generator created
+    return Term.objects.order_by("id").values_list("text", flat=True).first() or "ramen"
+
+
+def term_matching(ctx):
+    with rolled_back():
+        links = run_term_matching(limit=None)
+    return {"links": links}
+
+
+def search(ctx):
+    q = ctx.setdefault("popular_term", _popular_term())
+    results = search_posts(q=q, days=30, limit=30)
+    return {"results": len(results)}
+
+
+def trending_terms_7d(ctx):
+    return {"results": len(get_trending_terms(days=7, limit=20))}
+
+
+def trending_terms_30d(ctx):
+    return {"results": len(get_trending_terms(days=30, limit=20))}
+
+
+def trending_cuisines_7d(ctx):
+    return {"results": len(get_trending_cuisines(days=7, limit=12))}
+
+
+def extract_candidates(ctx):
+    out = StringIO()
+    call_command("extract_candidates", days=14, limit_posts=ctx["extract_limit"], max_ngram=2, stdout=out)
+    return {"lines": out.getvalue().count("\n")}
+
+
+def ingest_bulk_insert(ctx):
+    children = ctx.setdefault("listing", reddit_listing(ctx["ingest_rows"]))
+    with rolled_back():
+        created = store_posts("food", children)
+    return {"inserted": len(created)}
+
+
+SCENARIOS = {
+    "term_matching": term_matching,
+    "search_posts": search,
+    "trending_terms_7d": trending_terms_7d,
+    "trending_terms_30d": trending_terms_30d,
+    "trending_cuisines_7d": trending_cuisines_7d,
+    "extract_candidates": extract_candidates,
+    "ingest_bulk_insert": ingest_bulk_insert,
+}
+
+
+def corpus_counts() -> dict:
+    return {
+        "posts": Post.objects.count(),
+        "unmatched_posts": Post.objects.filter(term_matched_at__isnull=True).count(),
+        "terms": Term.objects.count(),
+    }
@@ -0,0 +1,146 @@
+"""
+Deterministic synthetic corpus: Terms, Posts and PostTerms with a Zipfian term distribution.
+
+The same (n_posts, n_terms, seed) always produces the same rows, so timings are comparable
+across commits. Post text contains the sampled term texts, so run_term_matching finds the
+same links the generator writes directly.
+"""
+
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from posts.models import Post, PostTerm, Term
+
+SUBREDDITS = ["food", "Cooking", "recipes", "AskCulinary", "MealPrepSunday", "EatCheapAndHealthy"]
+
+ORIGINS = [code for code, _ in Term.ORIGINS]
+
+FILLER = (
+    "made this last night with some friends and it turned out really well "
+    "first attempt at a homemade version any tips for getting the texture right "
+    "my family loved it will definitely try again next weekend with extra sauce"
+).split()
+
+_SYLLABLES = ["ka", "mi", "to", "ra", "su", "be", "lo", "chi", "na", "po", "ri", "ta", "gu", "zo", "fe", "an"]
+
+
+def _term_texts(n_terms: int, rng: random.Random) -> list[str]:
+    texts = []
+    seen = set()
+    while len(texts) < n_terms:
+        word = "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+        # ~15% two-word phrases, like "pad thai" / "air fryer"
+        if rng.random() < 0.15:
+            word = f"{word} {''.join(rng.choice(_SYLLABLES) for _ in range(2))}"
+        if word in seen or len(word) < 3:
+            continue
+        seen.add(word)
+        texts.append(word)
+    return texts
+
+
+def zipf_weights(n: int, s: float = 1.1) -> list[float]:
+    return [1.0 / ((rank + 1) ** s) for rank in range(n)]
+
+
+def generate_corpus(
+    n_posts: int,
+    n_terms: int = 2000,
+    seed: int = 1,
+    days: int = 30,
+    zipf_s: float = 1.1,
+    unmatched_posts: int = 0,
+    batch_size: int = 5000,
+) -> dict:
+    """
+    Create the corpus in bulk.
+      - terms: n_terms pseudo-words, ranked by Zipf popularity, random cultural_origin
+      - posts: created over the last `days` (denser towards now), 0-4 terms each
+      - links: written directly for every post except the newest `unmatched_posts`,
+        which are left for run_term_matching (term_matched_at NULL, no links)
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    texts = _term_texts(n_terms, rng)
+    with transaction.atomic():
+        terms = Term.objects.bulk_create(
+            [
+                Term(
+                    text=text,
+                    is_active=True,
+                    cultural_origin=rng.choice(ORIGINS),
+                    origin_confidence=round(rng.random(), 2),
+                )
+                for text in texts
+            ],
+            batch_size=batch_size,
+        )
+    term_ids = [t.id for t in terms]
+    cum_weights = []
+    total = 0.0
+    for w in zipf_weights(n_terms, zipf_s):
+        total += w
+        cum_weights.append(total)
+
+    # Ages sorted descending so the last `unmatched_posts` rows are the newest
+    ages = sorted((rng.random() ** 1.5 * days for _ in range(n_posts)), reverse=True)
+
+    n_links = 0
+    for start in range(0, n_posts, batch_size):
+        batch_posts = []
+        batch_terms = []
+        for i in range(start, min(n_posts, start + batch_size)):
+            k = rng.choices([0, 1, 2, 3, 4], weights=[10, 40, 30, 15, 5])[0]
+            picked = sorted(set(rng.choices(range(n_terms), cum_weights=cum_weights, k=k)))
+            words = rng.sample(FILLER, 6) + [texts[j] for j in picked]
+            rng.shuffle(words)
+
+            matched = i < n_posts - unmatched_posts
+            batch_posts.append(Post(
+                reddit_id=f"s{seed}_{i}",
+                subreddit=rng.choice(SUBREDDITS),
+                title=" ".join(words),
+                body=" ".join(rng.sample(FILLER, 12)),
+                created_utc=now - timedelta(days=ages[i]),
+                score=int(rng.paretovariate(1.2)) - 1,
+                num_comments=int(rng.paretovariate(1.5)) - 1,
+                term_matched_at=now if matched else None,
+            ))
+            batch_terms.append(picked if matched else [])
+
+        with transaction.atomic():
+            created = Post.objects.bulk_create(batch_posts, batch_size=batch_size)
+            links = [
+                PostTerm(post_id=p.id, term_id=term_ids[j])
+                for p, picked in zip(created, batch_terms)
+                for j in picked
+            ]
+            PostTerm.objects.bulk_create(links, batch_size=batch_size)
+        n_links += len(links)
+
+    return {"posts": n_posts, "terms": n_terms, "links": n_links, "seed": seed}
+
+
+def reddit_listing(n: int, seed: int = 1, prefix: str = "ing") -> list[dict]:
+    """
+    Fake `data.children` payload in the shape of reddit's /new.json, for ingest benchmarks.
+    """
+    rng = random.Random(seed)
+    now = timezone.now().timestamp()
+    return [
+        {
+            "data": {
+                "id": f"{prefix}{seed}_{i}",
+                "title": " ".join(rng.sample(FILLER, 8)),
+                "selftext": " ".join(rng.sample(FILLER, 20)),
+                "created_utc": now - rng.random() * 86400,
+                "score": rng.randint(0, 500),
+                "num_comments": rng.randint(0, 80),
+            }
+        }
+        for i in range(n)
+    ]
@@ -12,5 +12,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+os.environ.setdefault("FOODTREND_ASYNC_VIEWS", "1")
 
 application = get_asgi_application()
+
+# Load the hot-window store (FOODTREND_HOT_STORE=1) before the first request
+from posts.hotstore import warm_up  # noqa: E402
+
+warm_up()
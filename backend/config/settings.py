@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "posts.middleware.PerfMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -85,10 +87,50 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.getenv("FOODTREND_DB_PATH") or BASE_DIR / "db.sqlite3",
     }
 }
 
+# FOODTREND_DB_ENGINE=postgres switches to PostgreSQL (psycopg 3). Trends/cuisines then
+# aggregate in SQL, search uses the tsvector GIN index and ingest uses COPY (posts.pg).
+if os.getenv("FOODTREND_DB_ENGINE") == "postgres":
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("FOODTREND_PG_NAME", "foodtrend"),
+        "USER": os.getenv("FOODTREND_PG_USER", "foodtrend"),
+        "PASSWORD": os.getenv("FOODTREND_PG_PASSWORD", ""),
+        "HOST": os.getenv("FOODTREND_PG_HOST", "localhost"),
+        "PORT": os.getenv("FOODTREND_PG_PORT", "5432"),
+        "CONN_MAX_AGE": int(os.getenv("FOODTREND_CONN_MAX_AGE", "600")),
+        "CONN_HEALTH_CHECKS": True,
+    }
+
+# FOODTREND_SQLITE_PROFILE=production: WAL (readers no longer block on the writer),
+# IMMEDIATE transactions (a writer waits for the lock up front instead of failing with
+# "database is locked" when upgrading from a read), busy_timeout, a larger page cache,
+# memory-mapped reads and persistent connections.
+SQLITE_PROFILE = os.getenv("FOODTREND_SQLITE_PROFILE", "default")
+
+if SQLITE_PROFILE == "production" and DATABASES["default"]["ENGINE"].endswith("sqlite3"):
+    _mmap_bytes = int(os.getenv("FOODTREND_SQLITE_MMAP_MB", "256")) * 1024 * 1024
+    _cache_kib = int(os.getenv("FOODTREND_SQLITE_CACHE_MB", "64")) * 1024
+    _busy_ms = int(os.getenv("FOODTREND_SQLITE_BUSY_TIMEOUT_MS", "10000"))
+
+    DATABASES["default"]["OPTIONS"] = {
+        "init_command": (
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            f"PRAGMA mmap_size={_mmap_bytes};"
+            f"PRAGMA cache_size=-{_cache_kib};"
+            f"PRAGMA busy_timeout={_busy_ms};"
+            "PRAGMA temp_store=MEMORY;"
+        ),
+        "transaction_mode": "IMMEDIATE",
+        "timeout": _busy_ms / 1000.0,
+    }
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("FOODTREND_CONN_MAX_AGE", "600"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -130,3 +172,87 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Read API under ASGI
+# config/asgi.py turns this on so the same URLs route to posts.async_views.
+
+ASYNC_VIEWS = os.getenv("FOODTREND_ASYNC_VIEWS") == "1"
+
+# Threads used by async views for CPU-heavy scoring (bounded; excess requests queue)
+ASYNC_SCORING_WORKERS = int(os.getenv("FOODTREND_ASYNC_SCORING_WORKERS", "4"))
+
+# Single-flight for ranking services: concurrent identical calls share one computation.
+# Set a directory to also coalesce across processes (file locks; POSIX only).
+SINGLE_FLIGHT_LOCK_DIR = os.getenv("FOODTREND_SINGLE_FLIGHT_DIR") or None
+# Longest wait for another process's computation before computing anyway
+SINGLE_FLIGHT_LOCK_TIMEOUT = float(os.getenv("FOODTREND_SINGLE_FLIGHT_LOCK_TIMEOUT", "30"))
+
+# Sentiment stage after ingest/pipeline batches: 1 scores in-process (a batch is a few
+# hundred posts; a process pool costs more to start than it saves). score_sentiment
+# --workers N overrides it for large backfills.
+SENTIMENT_WORKERS = max(1, int(os.getenv("FOODTREND_SENTIMENT_WORKERS", "1")))
+
+# Leaderboard snapshots published after each ingest (served in O(1) by the read API).
+# Requests with other `days`, or a larger `limit`, fall back to live computation, as do
+# windows the hot store covers (HOT_STORE below).
+TREND_SNAPSHOT_DAYS = [1, 7, 30]
+TREND_SNAPSHOT_TERMS_LIMIT = 50
+TREND_SNAPSHOT_CUISINES_LIMIT = 20
+TREND_SNAPSHOT_MAX_AGE_SECONDS = 3 * 60 * 60
+
+# Offline analytics: default output directory for `snapshot_columnar`
+COLUMNAR_DIR = BASE_DIR / "columnar"
+
+# Near-duplicate detection at ingest (posts.dedup): posts are compared against the last
+# DEDUP_DAYS; texts shorter than DEDUP_MIN_TOKENS tokens are never flagged
+DEDUP_DAYS = int(os.getenv("FOODTREND_DEDUP_DAYS", "14"))
+DEDUP_THRESHOLD = float(os.getenv("FOODTREND_DEDUP_THRESHOLD", "0.8"))
+DEDUP_MIN_TOKENS = 5
+
+# Compiled term index files (posts.term_index), shared by all matching processes
+TERM_INDEX_DIR = Path(os.getenv("FOODTREND_TERM_INDEX_DIR") or BASE_DIR / "cache")
+# Term matching also accepts singular/plural forms ("taco" <-> "tacos") ...
+TERM_MATCH_VARIANTS = os.getenv("FOODTREND_TERM_VARIANTS", "1") == "1"
+# ... and tokens this long within one edit of a term word (typos); 0 = exact only.
+# Shorter words are too often other real words one edit away ("cooker" / "cooked")
+TERM_FUZZY_MIN_LEN = int(os.getenv("FOODTREND_TERM_FUZZY_MIN_LEN", "7"))
+
+# Per-stage timing (Server-Timing header + /api/metrics). Off: middleware is not loaded
+# and instrumented code paths cost one ContextVar lookup.
+PERF_INSTRUMENTATION = os.getenv("FOODTREND_PERF") == "1"
+
+# In-process hot-window store (posts.hotstore): trends/cuisines for days <= HOT_STORE_DAYS
+# and search term filters read numpy columns instead of scanning PostTerm. Costs about
+# 40 MB per million links in the window (`python manage.py hot_store`).
+HOT_STORE = os.getenv("FOODTREND_HOT_STORE") == "1"
+HOT_STORE_DAYS = int(os.getenv("FOODTREND_HOT_STORE_DAYS", "30"))
+# Read path re-syncs at most this often (ingest normally runs in another process)
+HOT_STORE_SYNC_SECONDS = float(os.getenv("FOODTREND_HOT_STORE_SYNC_SECONDS", "10"))
+# Full reload (drops links of deleted terms/posts); 0 = never
+HOT_STORE_RELOAD_SECONDS = float(os.getenv("FOODTREND_HOT_STORE_RELOAD_SECONDS", "3600"))
+# Link ids below the high-water mark re-read per sync. PostgreSQL hands out ids before
+# commit, so a transaction can commit after a higher id was synced; SQLite serializes
+# writers, so nothing commits behind the mark there.
+HOT_STORE_SYNC_LOOKBACK = int(os.getenv(
+    "FOODTREND_HOT_STORE_SYNC_LOOKBACK",
+    "20000" if DATABASES["default"]["ENGINE"].endswith("postgresql") else "0",
+))
+
+# Trend alerts (posts.alerts): rules evaluated after each matching batch for the terms it
+# touched. Fired alerts are Alert rows (/api/alerts); ALERT_SINKS also delivers them
+# ("log", "webhook", or a dotted path to a callable(alerts)).
+ALERTS = os.getenv("FOODTREND_ALERTS") == "1"
+ALERT_RULES = [
+    {"name": "term_spike", "scope": "term", "metric": "spike", "threshold": 3.0, "min_mentions": 10},
+    {"name": "term_zscore", "scope": "term", "metric": "zscore", "threshold": 4.0, "min_mentions": 10},
+    {"name": "cuisine_spike", "scope": "cuisine", "metric": "spike", "threshold": 2.0, "min_mentions": 30},
+    {"name": "cuisine_zscore", "scope": "cuisine", "metric": "zscore", "threshold": 3.0, "min_mentions": 30},
+]
+# Baseline for z-scores: this many 24h windows before the current one
+ALERT_BASELINE_DAYS = 14
+ALERT_COOLDOWN_SECONDS = int(os.getenv("FOODTREND_ALERT_COOLDOWN_SECONDS", str(6 * 60 * 60)))
+ALERT_SINKS = [s for s in os.getenv("FOODTREND_ALERT_SINKS", "log").split(",") if s]
+# Default: the local stub (`python manage.py alert_webhook_stub`)
+ALERT_WEBHOOK_URL = os.getenv("FOODTREND_ALERT_WEBHOOK_URL", "http://127.0.0.1:8765/alerts")
+ALERT_WEBHOOK_TIMEOUT = 5
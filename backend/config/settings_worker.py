@@ -0,0 +1,26 @@
+"""
+Lean settings for pipeline workers and cron-style management commands.
+
+    DJANGO_SETTINGS_MODULE=config.settings_worker python manage.py match_worker
+
+Same database and pipeline settings as config.settings, without the web stack: only the
+posts app is installed (no admin, auth, contenttypes, sessions, messages, staticfiles,
+CORS or DRF) and there is no middleware, so django.setup() imports and checks much less.
+Do not serve HTTP with it, and run `migrate` with config.settings (the dropped apps'
+migrations would be skipped).
+"""
+
+from config.settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    "posts",
+]
+
+MIDDLEWARE = []
+
+TEMPLATES = []
+
+AUTH_PASSWORD_VALIDATORS = []
+
+# No URLs are served (also keeps the URL system check from importing the views)
+ROOT_URLCONF = None
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Load the hot-window store (FOODTREND_HOT_STORE=1) before the first request
+from posts.hotstore import warm_up  # noqa: E402
+
+warm_up()
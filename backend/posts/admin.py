@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Post, Term, PostTerm
+from .models import IngestFetch, IngestRun, Post, Term, PostTerm
 
 # Register your models here.
 @admin.register(Post)
@@ -18,3 +18,12 @@ class TermAdmin(admin.ModelAdmin):
 class PostTermAdmin(admin.ModelAdmin):
     list_display = ("term", "post", "created_at")
     search_fields = ("term__text", "post__reddit_id", "post__title")
+
+class IngestFetchInline(admin.TabularInline):
+    model = IngestFetch
+    extra = 0
+
+@admin.register(IngestRun)
+class IngestRunAdmin(admin.ModelAdmin):
+    list_display = ("started_at", "posts_inserted", "links_created", "matching_seconds", "total_seconds")
+    inlines = [IngestFetchInline]
@@ -0,0 +1,323 @@
+# posts/alerts.py
+#
+# Trend alerts, evaluated incrementally after each term-matching batch (FOODTREND_ALERTS=1).
+#
+#   inputs   : only the terms whose hour TermBuckets the batch just incremented (links of
+#              posts from the last 24h), plus the cuisines those terms belong to. Their
+#              hour buckets are read with one indexed query per scope; nothing rescans
+#              PostTerm or the trend window. Buckets more than 24h old only change on
+#              backfills, so they are read once per key per hour and cached in-process;
+#              each batch re-reads the last 25 hour buckets.
+#   metrics  : windows are consecutive 24h spans ending now. Window 0 is the current
+#              partial hour, the 23 closed hours before it and the elapsed-time share of
+#              the hour 24h back (mentions spread evenly within an hour), so it always
+#              covers 24h; older windows are prorated the same way.
+#              - spike  = (last 24h + 1) / (previous 24h + 1), as in get_trending_terms
+#              - zscore = (last 24h - mean) / std over the ALERT_BASELINE_DAYS windows
+#                before it (std floored at 1, so a flat baseline does not explode)
+#   rules    : settings.ALERT_RULES, {name, scope: term|cuisine, metric: spike|zscore,
+#              threshold, min_mentions (last 24h)}
+#   dedup    : Alert rows are unique per (rule, key, hour window) and a rule does not fire
+#              again for the same key within ALERT_COOLDOWN_SECONDS
+#   delivery : every fired alert is an Alert row (served at /api/alerts); settings.ALERT_SINKS
+#              adds "log", "webhook" (JSON POST to ALERT_WEBHOOK_URL, e.g. the
+#              `alert_webhook_stub` command) or a dotted path to a callable(alerts).
+#              Per-sink results are stored in Alert.delivered; a failing sink never fails
+#              ingest.
+#
+# Evaluation runs on commit of the matching transaction, so sinks never see rolled-back
+# links and a slow webhook does not hold database locks.
+
+import json
+import logging
+import math
+import threading
+import urllib.request
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from posts.models import Alert, Term, TermBucket
+from posts.services.series import bucket_start
+
+logger = logging.getLogger("posts.alerts")
+
+
+# Hour buckets older than this are only written by backfills: cached per hour
+_STABLE_HOURS = 25
+_baseline = {"end": None, "hours": {}}  # (scope, key) -> {hour offset: mentions}
+_baseline_lock = threading.Lock()
+
+
+def _windows(now):
+    # First hour bucket read, the current hour bucket, the share of it elapsed and the
+    # window count. Hour bucket o hours before the current one holds mentions aged
+    # (o - 1 + elapsed, o + elapsed] hours; window k covers ages [24k, 24(k+1))
+    end = bucket_start(now, "hour")
+    elapsed = (now - end).total_seconds() / 3600
+    n_windows = settings.ALERT_BASELINE_DAYS + 1
+    first = end - timedelta(hours=24 * n_windows)
+    return first, end, elapsed, n_windows
+
+
+def _hourly(rows, end) -> dict:
+    # rows: (key, hour start, mentions) -> {key: {hour offset: mentions}}
+    hours = {}
+    for key, start, mentions in rows:
+        offset = int((end - start).total_seconds() // 3600)
+        per_key = hours.setdefault(key, {})
+        per_key[offset] = per_key.get(offset, 0) + mentions
+    return hours
+
+
+def _window_counts(hours: dict, elapsed: float, n_windows: int) -> list[float]:
+    # {hour offset: mentions} -> [window 0 (last 24h), 1, ...]
+    windows = [0.0] * n_windows
+    for offset, mentions in hours.items():
+        k, r = divmod(offset, 24)
+        if r or not k:
+            if k < n_windows:
+                windows[k] += mentions
+        else:
+            # straddles the boundary between windows k - 1 and k
+            windows[k - 1] += (1 - elapsed) * mentions
+            if k < n_windows:
+                windows[k] += elapsed * mentions
+    return windows
+
+
+def _bucket_rows(scope: str, keys, since, until):
+    # (key, hour start, mentions) for hour buckets in [since, until)
+    buckets = TermBucket.objects.filter(bucket="hour", start__gte=since, start__lt=until)
+    if scope == "term":
+        return buckets.filter(term_id__in=keys).values_list("term_id", "start", "mentions")
+    return (
+        buckets
+        .filter(term__cultural_origin__in=keys, term__is_active=True)
+        .values("term__cultural_origin", "start")
+        .annotate(n=Sum("mentions"))
+        .order_by()
+        .values_list("term__cultural_origin", "start", "n")
+    )
+
+
+def _series(scope: str, keys, first, end, elapsed, n_windows) -> dict:
+    """
+    {key: windows} for keys with mentions in the baseline. Only the last _STABLE_HOURS
+    hour buckets are read per call; older ones come from the per-hour cache.
+    """
+    split = end - timedelta(hours=_STABLE_HOURS - 1)
+    with _baseline_lock:
+        if _baseline["end"] != end:
+            _baseline["end"], _baseline["hours"] = end, {}
+        cached = _baseline["hours"]
+        missing = [key for key in keys if (scope, key) not in cached]
+    if missing:
+        old = _hourly(_bucket_rows(scope, missing, first, split), end)
+        with _baseline_lock:
+            if _baseline["end"] == end:
+                for key in missing:
+                    cached[(scope, key)] = old.get(key, {})
+
+    recent = _hourly(_bucket_rows(scope, keys, split, end + timedelta(hours=1)), end)
+    series = {}
+    for key in keys:
+        hours = {**cached.get((scope, key), {}), **recent.get(key, {})}
+        if hours:
+            series[key] = _window_counts(hours, elapsed, n_windows)
+    return series
+
+
+def _metrics(windows: list[float]) -> dict:
+    recent, baseline = windows[0], windows[1:]
+    prev = baseline[0] if baseline else 0
+    mean = sum(baseline) / len(baseline) if baseline else 0.0
+    var = sum((x - mean) ** 2 for x in baseline) / len(baseline) if baseline else 0.0
+    return {
+        "recent_24h": round(recent),
+        "prev_24h": round(prev),
+        "spike": (recent + 1) / (prev + 1),
+        "zscore": (recent - mean) / max(math.sqrt(var), 1.0),
+    }
+
+
+def find_alerts(term_ids, now=None) -> list[dict]:
+    """
+    Rule hits for the given terms and their cuisines (no writes). Each hit:
+    {rule, scope, key, label, metric, value, threshold, recent_24h, prev_24h, window_start}.
+    """
+    rules = settings.ALERT_RULES
+    term_ids = set(term_ids)
+    if not rules or not term_ids:
+        return []
+
+    now = now or timezone.now()
+    first, end, elapsed, n_windows = _windows(now)
+    scopes = {rule["scope"] for rule in rules}
+
+    terms = {
+        term_id: (text, origin)
+        for term_id, text, origin in (
+            Term.objects.filter(id__in=term_ids, is_active=True).values_list("id", "text", "cultural_origin")
+        )
+    }
+    series = {}
+    labels = {}
+
+    if "term" in scopes and terms:
+        for key, windows in _series("term", list(terms), first, end, elapsed, n_windows).items():
+            series[("term", str(key))] = windows
+            labels[("term", str(key))] = terms[key][0]
+
+    origins = sorted({origin for _, origin in terms.values() if origin and origin != "other"})
+    if "cuisine" in scopes and origins:
+        for key, windows in _series("cuisine", origins, first, end, elapsed, n_windows).items():
+            series[("cuisine", key)] = windows
+            labels[("cuisine", key)] = key
+
+    hits = []
+    for (scope, key), windows in series.items():
+        metrics = _metrics(windows)
+        for rule in rules:
+            if rule["scope"] != scope or metrics["recent_24h"] < rule.get("min_mentions", 0):
+                continue
+            value = metrics[rule["metric"]]
+            if value >= rule["threshold"]:
+                hits.append({
+                    "rule": rule["name"],
+                    "scope": scope,
+                    "key": key,
+                    "label": labels[(scope, key)],
+                    "metric": rule["metric"],
+                    "value": round(value, 4),
+                    "threshold": rule["threshold"],
+                    "recent_24h": metrics["recent_24h"],
+                    "prev_24h": metrics["prev_24h"],
+                    "window_start": end,
+                })
+    hits.sort(key=lambda h: (h["rule"], -h["value"]))
+    return hits
+
+
+def fire_alerts(hits: list[dict], now=None) -> list[Alert]:
+    """
+    Record hits that are not a duplicate / in cooldown as Alert rows, then deliver the new
+    ones to every sink. Returns the new alerts.
+    """
+    if not hits:
+        return []
+    now = now or timezone.now()
+    cooling = set(
+        Alert.objects
+        .filter(
+            rule__in={h["rule"] for h in hits},
+            key__in={h["key"] for h in hits},
+            fired_at__gte=now - timedelta(seconds=settings.ALERT_COOLDOWN_SECONDS),
+        )
+        .values_list("rule", "key")
+    )
+
+    fired = []
+    for hit in hits:
+        if (hit["rule"], hit["key"]) in cooling:
+            continue
+        # the unique (rule, key, window_start) row decides between concurrent workers
+        alert, created = Alert.objects.get_or_create(
+            rule=hit["rule"],
+            key=hit["key"],
+            window_start=hit["window_start"],
+            defaults={
+                "scope": hit["scope"],
+                "label": hit["label"][:80],
+                "metric": hit["metric"],
+                "value": hit["value"],
+                "threshold": hit["threshold"],
+                "mentions_24h": hit["recent_24h"],
+                "prev_24h": hit["prev_24h"],
+                "fired_at": now,
+            },
+        )
+        if created:
+            fired.append(alert)
+            cooling.add((hit["rule"], hit["key"]))
+
+    if fired:
+        _deliver(fired)
+    return fired
+
+
+def evaluate_alerts(term_ids) -> list[Alert]:
+    return fire_alerts(find_alerts(term_ids))
+
+
+def schedule_alerts(term_ids):
+    """
+    Evaluate after the current transaction commits (immediately outside one). Called by
+    run_term_matching with the terms whose recent buckets it incremented.
+    """
+    if settings.ALERTS and term_ids:
+        transaction.on_commit(partial(evaluate_alerts, set(term_ids)), robust=True)
+
+
+def alert_payload(alert: Alert) -> dict:
+    return {
+        "id": alert.id,
+        "rule": alert.rule,
+        "scope": alert.scope,
+        "key": alert.key,
+        "label": alert.label,
+        "metric": alert.metric,
+        "value": alert.value,
+        "threshold": alert.threshold,
+        "recent_24h": alert.mentions_24h,
+        "prev_24h": alert.prev_24h,
+        "window_start": alert.window_start.isoformat(),
+        "fired_at": alert.fired_at.isoformat(),
+    }
+
+
+def log_sink(alerts: list[Alert]):
+    for alert in alerts:
+        logger.warning(
+            "trend alert %s: %s %s=%.2f (>= %s), %d mentions in 24h (prev %d)",
+            alert.rule, alert.label, alert.metric, alert.value, alert.threshold,
+            alert.mentions_24h, alert.prev_24h,
+        )
+
+
+def webhook_sink(alerts: list[Alert]):
+    body = json.dumps({"alerts": [alert_payload(a) for a in alerts]}).encode("utf-8")
+    req = urllib.request.Request(
+        settings.ALERT_WEBHOOK_URL, data=body, method="POST",
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req, timeout=settings.ALERT_WEBHOOK_TIMEOUT) as resp:
+        resp.read()
+
+
+SINKS = {
+    "log": log_sink,
+    "webhook": webhook_sink,
+}
+
+
+def _sink(name: str):
+    return SINKS.get(name) or import_string(name)
+
+
+def _deliver(alerts: list[Alert]):
+    for name in settings.ALERT_SINKS:
+        try:
+            _sink(name)(alerts)
+            status = "ok"
+        except Exception as e:
+            logger.error("alert sink %s failed: %s", name, e)
+            status = f"error: {e}"[:200]
+        for alert in alerts:
+            alert.delivered[name] = status
+    Alert.objects.bulk_update(alerts, ["delivered"])
@@ -3,3 +3,12 @@ from django.apps import AppConfig
 class PostsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "posts"
+
+    def ready(self):
+        from django.conf import settings
+
+        if getattr(settings, "PERF_INSTRUMENTATION", False):
+            from django.db.backends.signals import connection_created
+            from posts.perf import install_query_counter
+
+            connection_created.connect(install_query_counter)
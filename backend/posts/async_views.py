@@ -0,0 +1,89 @@
+"""
+Async (ASGI) versions of the read API.
+
+Scoring stays in the sync service functions; they run on a bounded thread pool so a slow
+search never blocks the event loop. Identical in-flight requests are coalesced by the
+ranking services themselves (@single_flight).
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.views.decorators.http import require_GET
+
+from posts.models import Post
+from posts.perf import json_response
+from posts.services.search import search_posts
+from posts.services.snapshots import get_cuisines_leaderboard, get_terms_leaderboard
+
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=getattr(settings, "ASYNC_SCORING_WORKERS", 4),
+    thread_name_prefix="scoring",
+)
+
+
+def _run_sync(fn, kwargs):
+    # Executor threads outlive requests; drop stale/expired DB connections around each job
+    close_old_connections()
+    try:
+        return fn(**kwargs)
+    finally:
+        close_old_connections()
+
+
+async def _on_scoring_pool(fn, **kwargs):
+    # copy_context: perf stage timings of the request follow it into the pool
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, contextvars.copy_context().run, _run_sync, fn, kwargs)
+
+
+@require_GET
+async def api_trending_cuisines(request):
+    days = int(request.GET.get("days", 7))
+    limit = int(request.GET.get("limit", 12))
+    dedupe = request.GET.get("dedupe") == "1"
+    results = await _on_scoring_pool(get_cuisines_leaderboard, days=days, limit=limit, dedupe=dedupe)
+    return json_response({"days": days, "limit": limit, "dedupe": dedupe, "results": results})
+
+
+@require_GET
+async def api_posts(request):
+    limit = int(request.GET.get("limit", 20))
+    qs = Post.objects.order_by("-created_utc")[:limit]
+
+    results = [{
+        "reddit_id": p.reddit_id,
+        "subreddit": p.subreddit,
+        "title": p.title,
+        "created_utc": p.created_utc.isoformat(),
+        "score": p.score,
+        "num_comments": p.num_comments,
+    } async for p in qs]
+
+    return json_response({"limit": limit, "results": results})
+
+
+@require_GET
+async def api_trends(request):
+    days = int(request.GET.get("days", 7))
+    limit = int(request.GET.get("limit", 20))
+    dedupe = request.GET.get("dedupe") == "1"
+    results = await _on_scoring_pool(get_terms_leaderboard, days=days, limit=limit, dedupe=dedupe)
+    return json_response({"days": days, "limit": limit, "dedupe": dedupe, "results": results})
+
+
+@require_GET
+async def api_search(request):
+    q = request.GET.get("q", "").strip()
+    if not q:
+        return json_response({"results": [], "error": "Missing q parameter"}, status=400)
+
+    days = int(request.GET.get("days", 30))
+    limit = int(request.GET.get("limit", 20))
+    term = request.GET.get("term")  # optional exact Term.text
+
+    results = await _on_scoring_pool(search_posts, q=q, days=days, limit=limit, term_text=term)
+    return json_response({"q": q, "days": days, "limit": limit, "term": term, "results": results})
@@ -0,0 +1,176 @@
+# posts/backtest.py
+#
+# Vectorized backtest of the trend_score formula used by get_trending_terms():
+#
+#   contrib = decay(age, half_life) * (1 + a*log1p(score) + b*log1p(comments))
+#
+# Per-term sums split into three parts that do not depend on (a, b):
+#
+#   D  = sum(decay)   DS = sum(decay * log1p(score))   DC = sum(decay * log1p(comments))
+#   trend_score(a, b) = D + a*DS + b*DC
+#
+# So each (as-of step, half_life) costs three bincounts over the window slice, and the
+# whole (a, b) grid is a broadcast on top. The links are loaded once.
+
+import math
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from posts.models import PostTerm
+
+
+def _arrays(term_ids, created, score, comments) -> dict:
+    # Sort by time so every as-of window is a contiguous slice (searchsorted)
+    order = np.argsort(created, kind="stable")
+    term_ids = np.asarray(term_ids, dtype=np.int64)[order]
+    uniq, term_idx = np.unique(term_ids, return_inverse=True)
+    return {
+        "term_ids": uniq,
+        "term_idx": term_idx.astype(np.int64),
+        "created": np.asarray(created, dtype=np.float64)[order],
+        "log_score": np.log1p(np.clip(np.asarray(score, dtype=np.float64)[order], 0, None)),
+        "log_comments": np.log1p(np.clip(np.asarray(comments, dtype=np.float64)[order], 0, None)),
+    }
+
+
+def load_links_from_db(start: datetime, end: datetime) -> dict:
+    """
+    One query: active-term links whose post was created in [start, end].
+    """
+    rows = list(
+        PostTerm.objects
+        .filter(term__is_active=True, post__created_utc__gte=start, post__created_utc__lte=end)
+        .values_list("term_id", "post__created_utc", "post__score", "post__num_comments")
+    )
+    if not rows:
+        return _arrays([], [], [], [])
+    term_ids, created, score, comments = zip(*rows)
+    return _arrays(term_ids, [c.timestamp() for c in created], score, comments)
+
+
+def load_links_from_frames(frames: dict, start: datetime, end: datetime) -> dict:
+    """
+    Same arrays from a posts.columnar snapshot (no DB access).
+    """
+    terms = frames["terms"]
+    active_ids = terms.loc[terms["is_active"].astype(bool), "id"].to_numpy()
+    links = frames["post_terms"]
+    created = links["created_utc"]
+    links = links.loc[
+        (created >= start) & (created <= end) & links["term_id"].isin(active_ids)
+    ]
+    return _arrays(
+        links["term_id"].to_numpy(),
+        (links["created_utc"] - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy(),
+        links["score"].fillna(0).to_numpy(),
+        links["num_comments"].fillna(0).to_numpy(),
+    )
+
+
+def sweep(
+    links: dict,
+    as_of: list[float],
+    days: float,
+    half_lives: list[float],
+    a_values: list[float],
+    b_values: list[float],
+    top_k: int = 20,
+    min_peak_mentions: int = 3,
+) -> list[dict]:
+    """
+    Evaluate every (half_life, a, b) over the as-of timestamps (epoch seconds, ascending).
+
+    Per combination:
+      - rank_stability: mean Jaccard overlap of the top-k between consecutive steps
+      - lead time: for terms whose per-step mentions peak after the first step (with at
+        least `min_peak_mentions`), hours between first entering the top-k and the peak
+    """
+    created = links["created"]
+    term_idx = links["term_idx"]
+    n_terms = len(links["term_ids"])
+    as_of = np.asarray(sorted(as_of), dtype=np.float64)
+    n_steps = len(as_of)
+
+    a_grid = np.asarray(a_values, dtype=np.float64)[:, None, None]
+    b_grid = np.asarray(b_values, dtype=np.float64)[None, :, None]
+    grid_shape = (len(a_values), len(b_values), n_terms)
+    k = min(top_k, n_terms)
+
+    if n_terms == 0 or n_steps == 0:
+        return []
+
+    window = days * 86400.0
+    lo = np.searchsorted(created, as_of - window, side="right")
+    hi = np.searchsorted(created, as_of, side="right")
+
+    # Ground truth (parameter-independent): mentions per term since the previous step
+    step_lo = np.searchsorted(created, np.concatenate(([as_of[0] - window], as_of[:-1])), side="right")
+    step_mentions = np.stack([
+        np.bincount(term_idx[step_lo[s]:hi[s]], minlength=n_terms) for s in range(n_steps)
+    ])
+    peak_step = step_mentions.argmax(axis=0)
+    peaked = (step_mentions.max(axis=0) >= min_peak_mentions) & (peak_step > 0)
+
+    step_hours = np.diff(as_of, prepend=as_of[0]) / 3600.0
+    hours_at = np.cumsum(step_hours)
+
+    report = []
+    for half_life in half_lives:
+        lam = math.log(2) / (half_life * 86400.0)
+
+        overlap_sum = np.zeros(grid_shape[:2])
+        overlap_n = 0
+        prev_member = None
+        first_entry = np.full(grid_shape, -1, dtype=np.int64)
+
+        for s in range(n_steps):
+            sl = slice(lo[s], hi[s])
+            idx = term_idx[sl]
+            decay = np.exp(-lam * (as_of[s] - created[sl]))
+            D = np.bincount(idx, decay, minlength=n_terms)
+            DS = np.bincount(idx, decay * links["log_score"][sl], minlength=n_terms)
+            DC = np.bincount(idx, decay * links["log_comments"][sl], minlength=n_terms)
+
+            scores = D[None, None, :] + a_grid * DS[None, None, :] + b_grid * DC[None, None, :]
+
+            # top-k membership per (a, b); terms without mentions in the window never qualify
+            top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+            member = np.zeros(grid_shape, dtype=bool)
+            np.put_along_axis(member, top, True, axis=-1)
+            member &= (D > 0)[None, None, :]
+
+            newly = member & (first_entry < 0)
+            first_entry[newly] = s
+
+            if prev_member is not None:
+                inter = (member & prev_member).sum(axis=-1)
+                union = (member | prev_member).sum(axis=-1)
+                overlap_sum += np.where(union > 0, inter / np.maximum(union, 1), 1.0)
+                overlap_n += 1
+            prev_member = member
+
+        detected = peaked[None, None, :] & (first_entry >= 0) & (first_entry <= peak_step[None, None, :])
+        lead_hours = np.where(
+            detected,
+            hours_at[peak_step][None, None, :] - hours_at[np.clip(first_entry, 0, None)],
+            np.nan,
+        )
+
+        n_peaked = int(peaked.sum())
+        for i, a in enumerate(a_values):
+            for j, b in enumerate(b_values):
+                leads = lead_hours[i, j][~np.isnan(lead_hours[i, j])]
+                report.append({
+                    "half_life_days": half_life,
+                    "a": a,
+                    "b": b,
+                    "rank_stability": round(float(overlap_sum[i, j] / overlap_n), 4) if overlap_n else None,
+                    "peaked_terms": n_peaked,
+                    "detected_before_peak": int(len(leads)),
+                    "mean_lead_hours": round(float(leads.mean()), 2) if len(leads) else None,
+                    "median_lead_hours": round(float(np.median(leads)), 2) if len(leads) else None,
+                })
+
+    return report
@@ -0,0 +1,318 @@
+# posts/columnar.py
+#
+# Columnar (Arrow/Feather) snapshots of Post/Term/PostTerm for offline trend research,
+# plus vectorized re-implementations of get_trending_terms / get_trending_cuisines.
+#
+# Layout under `root`:
+#   manifest.json                      partitions + high-water mark of the last run
+#   terms.feather                      full Term dump (small; rewritten every run)
+#   posts/day=YYYY-MM-DD.feather       one partition per UTC day of Post.created_utc
+#   post_terms/day=YYYY-MM-DD.feather  PostTerm links, denormalized with post fields
+#
+# Feather v2 files are compressed (zstd) by default. Write with compression="uncompressed"
+# to memory-map partitions zero-copy.
+
+import json
+import math
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from django.db.models import Q
+from django.utils import timezone
+
+from posts.models import Post, PostTerm, Term
+
+MANIFEST = "manifest.json"
+
+POST_COLUMNS = ["id", "reddit_id", "subreddit", "created_utc", "score", "num_comments", "sentiment"]
+POST_TEXT_COLUMNS = ["title", "body"]
+LINK_COLUMNS = ["post_id", "term_id", "created_utc", "score", "num_comments", "subreddit", "sentiment"]
+TERM_COLUMNS = ["id", "text", "is_active", "cultural_origin", "origin_confidence"]
+
+
+def _day_bounds(day: date):
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def _partition_path(root: Path, table: str, day: date) -> Path:
+    return root / table / f"day={day.isoformat()}.feather"
+
+
+def _read_manifest(root: Path) -> dict:
+    path = root / MANIFEST
+    if not path.exists():
+        return {"high_water": None, "partitions": {}}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_frame(df: pd.DataFrame, path: Path, compression: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    feather.write_feather(df, tmp, compression=compression)
+    tmp.replace(path)
+
+
+def _affected_days(manifest: dict, start: date, end: date, refresh_days: int) -> list[date]:
+    """
+    Days to (re)write:
+      - never-written days in [start, end]
+      - the trailing `refresh_days` (partial day)
+      - days touched by posts/links added or posts updated since the last run (late
+        arrivals, backfills, sentiment scored later)
+    """
+    written = set(manifest["partitions"])
+    days = set()
+
+    d = start
+    while d <= end:
+        if d.isoformat() not in written:
+            days.add(d)
+        d += timedelta(days=1)
+
+    for i in range(max(0, refresh_days)):
+        d = end - timedelta(days=i)
+        if d >= start:
+            days.add(d)
+
+    if manifest["high_water"]:
+        hw = datetime.fromisoformat(manifest["high_water"])
+        touched = (
+            Post.objects
+            .filter(Q(fetched_at__gte=hw) | Q(updated_at__gte=hw) | Q(term_links__created_at__gte=hw))
+            .dates("created_utc", "day")
+        )
+        days.update(d for d in touched if start <= d <= end)
+
+    return sorted(days)
+
+
+def write_snapshot(
+    root,
+    start: date | None = None,
+    end: date | None = None,
+    refresh_days: int = 2,
+    compression: str = "zstd",
+    with_text: bool = False,
+    rebuild: bool = False,
+) -> dict:
+    """
+    Incrementally dump Post/Term/PostTerm into day-partitioned Feather files.
+    Only affected partitions are rewritten; returns a summary dict.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = {"high_water": None, "partitions": {}} if rebuild else _read_manifest(root)
+
+    run_started = timezone.now()
+    end = end or run_started.date()
+    if start is None:
+        first = Post.objects.order_by("created_utc").values_list("created_utc", flat=True).first()
+        start = first.date() if first else end
+
+    # Terms: small dimension table, always rewritten
+    terms_df = pd.DataFrame.from_records(
+        list(Term.objects.order_by("id").values_list(*TERM_COLUMNS)),
+        columns=TERM_COLUMNS,
+    )
+    _write_frame(terms_df, root / "terms.feather", compression)
+
+    post_columns = POST_COLUMNS + (POST_TEXT_COLUMNS if with_text else [])
+    days = _affected_days(manifest, start, end, refresh_days)
+
+    posts_rows = 0
+    links_rows = 0
+    for day in days:
+        day_start, day_end = _day_bounds(day)
+
+        posts_df = pd.DataFrame.from_records(
+            list(
+                Post.objects
+                .filter(created_utc__gte=day_start, created_utc__lt=day_end)
+                .order_by("id")
+                .values_list(*post_columns)
+            ),
+            columns=post_columns,
+        )
+        links_df = pd.DataFrame.from_records(
+            list(
+                PostTerm.objects
+                .filter(post__created_utc__gte=day_start, post__created_utc__lt=day_end)
+                .order_by("id")
+                .values_list(
+                    "post_id", "term_id", "post__created_utc", "post__score",
+                    "post__num_comments", "post__subreddit", "post__sentiment",
+                )
+            ),
+            columns=LINK_COLUMNS,
+        )
+
+        for df in (posts_df, links_df):
+            df["created_utc"] = pd.to_datetime(df["created_utc"], utc=True)
+            df["sentiment"] = df["sentiment"].astype("float64")
+            df["subreddit"] = df["subreddit"].astype("category")
+
+        _write_frame(posts_df, _partition_path(root, "posts", day), compression)
+        _write_frame(links_df, _partition_path(root, "post_terms", day), compression)
+
+        manifest["partitions"][day.isoformat()] = {"posts": len(posts_df), "post_terms": len(links_df)}
+        posts_rows += len(posts_df)
+        links_rows += len(links_df)
+
+    manifest["high_water"] = run_started.isoformat()
+    manifest["compression"] = compression
+    (root / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+    return {
+        "partitions_written": len(days),
+        "posts": posts_rows,
+        "post_terms": links_rows,
+        "terms": len(terms_df),
+    }
+
+
+def load_frames(root, start: date | None = None, end: date | None = None, memory_map: bool = True) -> dict:
+    """
+    Load {"terms", "posts", "post_terms"} DataFrames for partitions in [start, end].
+    """
+    root = Path(root)
+    manifest = _read_manifest(root)
+    days = sorted(
+        d for d in manifest["partitions"]
+        if (start is None or d >= start.isoformat()) and (end is None or d <= end.isoformat())
+    )
+
+    def read(path: Path) -> pa.Table:
+        return feather.read_table(path, memory_map=memory_map)
+
+    frames = {"terms": read(root / "terms.feather").to_pandas()}
+    for table in ("posts", "post_terms"):
+        parts = [read(_partition_path(root, table, date.fromisoformat(d))) for d in days]
+        if parts:
+            frames[table] = pa.concat_tables(parts, promote_options="permissive").to_pandas()
+        else:
+            columns = LINK_COLUMNS if table == "post_terms" else POST_COLUMNS
+            frames[table] = pd.DataFrame(columns=columns)
+    return frames
+
+
+def _window_links(frames: dict, now, days: int, half_life_days: float, a: float, b: float) -> pd.DataFrame:
+    # Active-term links in (now - days, now] with per-link contribution + 24h flags
+    now = pd.Timestamp(now)
+    window_start = now - pd.Timedelta(days=days)
+    last_24h_start = now - pd.Timedelta(hours=24)
+    prev_24h_start = now - pd.Timedelta(hours=48)
+
+    terms = frames["terms"]
+    active = terms.loc[terms["is_active"].astype(bool), ["id", "text", "cultural_origin"]]
+
+    links = frames["post_terms"]
+    created = links["created_utc"]
+    links = links.loc[(created >= window_start) & (created <= now)]
+    links = links.merge(active, left_on="term_id", right_on="id", how="inner")
+
+    age_days = ((now - links["created_utc"]).dt.total_seconds() / 86400.0).clip(lower=0.0)
+    decay = np.exp(-math.log(2) * age_days.to_numpy() / half_life_days)
+    score = links["score"].fillna(0).clip(lower=0).to_numpy(dtype="float64")
+    comments = links["num_comments"].fillna(0).clip(lower=0).to_numpy(dtype="float64")
+
+    recent = (links["created_utc"] >= last_24h_start).to_numpy()
+    prev = (links["created_utc"] >= prev_24h_start).to_numpy() & ~recent
+
+    return links.assign(
+        contrib=decay * (1.0 + a * np.log1p(score) + b * np.log1p(comments)),
+        recent_24h=recent.astype("int64"),
+        prev_24h=prev.astype("int64"),
+        origin=links["cultural_origin"].fillna("other").replace("", "other"),
+    )
+
+
+def trending_terms(
+    frames: dict,
+    now=None,
+    days: int = 7,
+    limit: int = 20,
+    half_life_days: float = 2.5,
+    a: float = 0.25,
+    b: float = 0.15,
+) -> list[dict]:
+    """
+    Vectorized get_trending_terms() over snapshot frames, as of `now` (default: now).
+    """
+    now = now or timezone.now()
+    links = _window_links(frames, now, days, half_life_days, a, b)
+    if links.empty:
+        return []
+
+    g = links.groupby("term_id", sort=False).agg(
+        term=("text", "first"),
+        trend_score=("contrib", "sum"),
+        mentions=("contrib", "size"),
+        recent_24h=("recent_24h", "sum"),
+        prev_24h=("prev_24h", "sum"),
+        sentiment=("sentiment", "mean"),
+    )
+    g["spike"] = (g["recent_24h"] + 1) / (g["prev_24h"] + 1)
+    g = g.nlargest(limit, "trend_score")
+
+    return [
+        {
+            "term_id": int(term_id),
+            "term": row.term,
+            "trend_score": round(float(row.trend_score), 4),
+            "mentions": int(row.mentions),
+            "recent_24h": int(row.recent_24h),
+            "prev_24h": int(row.prev_24h),
+            "spike": round(float(row.spike), 4),
+            "sentiment": None if pd.isna(row.sentiment) else round(float(row.sentiment), 4),
+        }
+        for term_id, row in g.iterrows()
+    ]
+
+
+def trending_cuisines(
+    frames: dict,
+    now=None,
+    days: int = 7,
+    limit: int = 20,
+    half_life_days: float = 2.5,
+    a: float = 0.25,
+    b: float = 0.15,
+) -> list[dict]:
+    """
+    Vectorized get_trending_cuisines() over snapshot frames, as of `now` (default: now).
+    """
+    now = now or timezone.now()
+    links = _window_links(frames, now, days, half_life_days, a, b)
+    if links.empty:
+        return []
+
+    g = links.groupby("origin", sort=False).agg(
+        trend_score=("contrib", "sum"),
+        mentions=("contrib", "size"),
+        recent_24h=("recent_24h", "sum"),
+        prev_24h=("prev_24h", "sum"),
+        unique_terms=("term_id", "nunique"),
+        subreddit_spread=("subreddit", "nunique"),
+    )
+    g["spike"] = (g["recent_24h"] + 1) / (g["prev_24h"] + 1)
+    g = g.nlargest(limit, "trend_score")
+
+    return [
+        {
+            "origin": origin,
+            "trend_score": round(float(row.trend_score), 4),
+            "mentions": int(row.mentions),
+            "recent_24h": int(row.recent_24h),
+            "prev_24h": int(row.prev_24h),
+            "spike": round(float(row.spike), 4),
+            "unique_terms": int(row.unique_terms),
+            "subreddit_spread": int(row.subreddit_spread),
+        }
+        for origin, row in g.iterrows()
+    ]
@@ -0,0 +1,162 @@
+# posts/dedup.py
+#
+# Near-duplicate posts (reposts / crossposts) flagged at ingest with MinHash + LSH.
+#
+#   signature : NUM_PERM minhashes (uint32) of the post's word-bigram shingles,
+#               stored packed in Post.minhash (NUM_PERM * 4 bytes)
+#   LSH       : the signature cut into BANDS bands of ROWS values; each band hashes to
+#               one PostLshBand row (band, bucket). Posts sharing any bucket within the
+#               last DEDUP_DAYS are candidates (one indexed bucket__in query), and a
+#               candidate is a duplicate when the estimated Jaccard similarity (share
+#               of equal minhashes) is >= DEDUP_THRESHOLD.
+#   clusters  : Post.dup_of points at the cluster's first post (never at another dup), so
+#               "count each cluster once" is `dup_of IS NULL`.
+#
+# With 16 bands x 4 rows, pairs at Jaccard 0.8 are candidates ~99.9% of the time and
+# pairs at 0.3 ~12%; the signature check removes the false candidates.
+
+import hashlib
+import zlib
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from posts.models import Post, PostLshBand
+from posts.term_matcher import _tokens
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240607)
+_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+_CHUNK = 900
+
+
+def _shingles(tokens: list[str]) -> set[str]:
+    return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash_signature(tokens: list[str]) -> np.ndarray | None:
+    """
+    uint32[NUM_PERM] for a token list, or None when the text is too short to compare
+    (fewer than DEDUP_MIN_TOKENS tokens: "dinner tonight" is not a repost signal).
+    """
+    if len(tokens) < settings.DEDUP_MIN_TOKENS:
+        return None
+    x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in _shingles(tokens)), dtype=np.uint64)
+    x %= _PRIME
+    # (a * x + b) mod p for every (shingle, permutation); a*x < 2^62 fits in uint64
+    hashed = (np.outer(x, _A) + _B) % _PRIME
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def pack(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def unpack(data) -> np.ndarray:
+    return np.frombuffer(bytes(data), dtype="<u4")
+
+
+def band_buckets(sig: np.ndarray) -> list[int]:
+    # One signed 64-bit bucket id per band (fits BigIntegerField)
+    raw = sig.astype("<u4").tobytes()
+    width = ROWS * 4
+    return [
+        int.from_bytes(hashlib.blake2b(raw[i * width:(i + 1) * width], digest_size=8).digest(), "little", signed=True)
+        for i in range(BANDS)
+    ]
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def _post_tokens(post) -> list[str]:
+    # same tokenization as term matching
+    return _tokens(f"{post.title} {post.body}")
+
+
+def mark_duplicates(posts: list[Post]) -> int:
+    """
+    Ingest stage for freshly inserted posts (ids set): store signatures + LSH bands, and
+    point dup_of at the cluster root of the most similar earlier post (from the last
+    DEDUP_DAYS, or earlier in this batch). Call inside the insert transaction.
+    Returns the number of posts flagged as duplicates.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(days=settings.DEDUP_DAYS)
+    # Keep the band table to the comparison window (indexed range delete)
+    PostLshBand.objects.filter(created_utc__lt=cutoff).delete()
+
+    signed = []
+    for post in sorted(posts, key=lambda p: (p.created_utc, p.id)):
+        sig = minhash_signature(_post_tokens(post))
+        if sig is not None:
+            signed.append((post, sig, band_buckets(sig)))
+    if not signed:
+        return 0
+
+    # Earlier posts sharing any bucket: {(band, bucket): [post_id, ...]}
+    all_buckets = sorted({b for _, _, buckets in signed for b in buckets})
+    index: dict[tuple[int, int], list[int]] = {}
+    for i in range(0, len(all_buckets), _CHUNK):
+        rows = (
+            PostLshBand.objects
+            .filter(bucket__in=all_buckets[i:i + _CHUNK], created_utc__gte=cutoff)
+            .values_list("band", "bucket", "post_id")
+        )
+        for band, bucket, post_id in rows:
+            index.setdefault((band, bucket), []).append(post_id)
+
+    candidate_ids = {pid for ids in index.values() for pid in ids}
+    known = {}  # post_id -> (signature, cluster root id)
+    for ids in _chunks(sorted(candidate_ids), _CHUNK):
+        for post_id, minhash, dup_of in Post.objects.filter(id__in=ids).values_list("id", "minhash", "dup_of_id"):
+            if minhash:
+                known[post_id] = (unpack(minhash), dup_of or post_id)
+
+    flagged = 0
+    bands = []
+    for post, sig, buckets in signed:
+        best_root, best_sim = None, settings.DEDUP_THRESHOLD
+        seen = set()
+        for band, bucket in enumerate(buckets):
+            for other_id in index.get((band, bucket), ()):
+                if other_id in seen or other_id == post.id:
+                    continue
+                seen.add(other_id)
+                other = known.get(other_id)
+                if other is None:
+                    continue
+                sim = similarity(sig, other[0])
+                if sim >= best_sim:
+                    best_root, best_sim = other[1], sim
+
+        post.minhash = pack(sig)
+        post.dup_of_id = best_root
+        flagged += best_root is not None
+
+        # Later posts in this batch compare against this one
+        known[post.id] = (sig, best_root or post.id)
+        for band, bucket in enumerate(buckets):
+            index.setdefault((band, bucket), []).append(post.id)
+            bands.append(PostLshBand(band=band, bucket=bucket, post_id=post.id, created_utc=post.created_utc))
+
+    flagged_at = timezone.now()
+    for post, _, _ in signed:
+        post.updated_at = flagged_at
+    Post.objects.bulk_update([p for p, _, _ in signed], ["minhash", "dup_of", "updated_at"], batch_size=500)
+    PostLshBand.objects.bulk_create(bands, batch_size=500)
+    return flagged
+
+
+def _chunks(items: list, n: int):
+    for i in range(0, len(items), n):
+        yield items[i:i + n]
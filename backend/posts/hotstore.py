@@ -0,0 +1,79 @@
+# posts/hotstore.py
+#
+# Optional in-process hot-window store (FOODTREND_HOT_STORE=1): the trailing
+# HOT_STORE_DAYS of PostTerm links as compact numpy columns, so trend queries are a few
+# vectorized passes over memory instead of an ORM scan.
+#
+#   per link  : created (epoch s, float64), score, comments, term (row in the term
+#               arrays), subreddit (code), post_id, sentiment (float64, NaN = unscored)
+#               -> 40 bytes/link (see `python manage.py hot_store`)
+#   per term  : term_id, text, origin code, is_active (origin lives here, not per link)
+#
+# Loaded at process startup (config/wsgi.py, config/asgi.py) or lazily on first use.
+# Kept current by sync(): links with PostTerm.id above the high-water mark (and, on
+# PostgreSQL, late commits within HOT_STORE_SYNC_LOOKBACK ids below it) are appended,
+# links older than the window age out, term metadata (is_active / cultural_origin) is
+# re-read, and the newest unscored links pick up their sentiment. sync() runs after
+# matching in the same process (the sentiment stage pushes its scores directly), and at
+# most every HOT_STORE_SYNC_SECONDS from the read path (ingest usually runs in another
+# process).
+# A full reload every HOT_STORE_RELOAD_SECONDS drops links of deleted terms/posts and
+# re-reads score / num_comments, which are otherwise frozen when a link is loaded.
+#
+# The services fall back to the ORM when the store is off or the requested window is
+# longer than the store's. The arrays live in posts.hotstore_columns (numpy), imported
+# only when the store is first loaded.
+
+import threading
+
+from django.conf import settings
+
+# Larger term filters in search keep the PostTerm subquery (SQLite bound-parameter limit)
+SEARCH_MAX_IDS = 5000
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return getattr(settings, "HOT_STORE", False)
+
+
+def get_store(days: int | None = None):
+    """
+    The process-wide store, loaded on first call and synced at most every
+    HOT_STORE_SYNC_SECONDS. None if the store is off or shorter than `days`.
+    """
+    global _store
+    if not enabled():
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from posts.hotstore_columns import HotStore
+
+                store = HotStore(getattr(settings, "HOT_STORE_DAYS", 30))
+                store.load()
+                _store = store
+    else:
+        _store.maybe_sync()
+    if days is not None and not _store.covers(days):
+        return None
+    return _store
+
+
+def warm_up():
+    # Startup hook (wsgi/asgi): pay the load before the first request
+    if enabled():
+        get_store()
+
+
+def notify_ingest():
+    # Post-ingest hook: links matched in this process are visible immediately
+    if _store is not None:
+        _store.sync()
+
+
+def notify_sentiment(scores: dict):
+    if _store is not None:
+        _store.update_sentiment(scores)
@@ -0,0 +1,367 @@
+# posts/hotstore_columns.py
+#
+# The HotStore arrays (see posts.hotstore). Kept apart from the posts.hotstore entry
+# points so the trend services, ingest and sentiment stages do not import numpy while the
+# store is off.
+
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from posts.models import Post, PostTerm, Term
+
+_LINK_COLUMNS = {
+    "created": np.float64,
+    "score": np.int32,
+    "comments": np.int32,
+    "term": np.int32,
+    "subreddit": np.int32,
+    "post_id": np.int64,
+    "sentiment": np.float64,
+}
+
+# Unscored posts re-checked per sync (newest first) for scores written by another
+# process; older ones are fixed by the reload
+SENTIMENT_RECHECK = 5000
+_CHUNK = 900
+
+
+def _epoch(dt) -> float:
+    return dt.timestamp()
+
+
+class HotStore:
+    """
+    Array-backed trailing-window link store. Readers use the arrays published in
+    self._view (replaced as a whole), so queries need no lock; sync() is serialized.
+    A link's score / num_comments are read once, when it is loaded, and stay frozen
+    until it ages out or the next full reload; only sentiment is refreshed.
+    """
+
+    def __init__(self, days: int):
+        self.days = days
+        self.loaded_at = None
+        self.synced_at = 0.0
+        self._lock = threading.Lock()
+        self._view = None
+        self._cols = {name: np.empty(0, dtype=dt) for name, dt in _LINK_COLUMNS.items()}
+        self._n = 0
+        self._high_water = 0
+        # ids loaded within the lookback margin below _high_water (see _sync_locked)
+        self._recent_ids: set[int] = set()
+        self._subreddits: dict[str, int] = {}
+
+        self._term_row: dict[int, int] = {}
+        self._term_ids = np.empty(0, dtype=np.int64)
+        self._term_text: list[str] = []
+        self._term_origin = np.empty(0, dtype=np.int16)
+        self._term_active = np.empty(0, dtype=bool)
+        self._origins: list[str] = []
+
+    # --- loading / syncing ---
+
+    def load(self):
+        with self._lock:
+            self._load_locked()
+
+    def _load_locked(self):
+        self._cols = {name: np.empty(0, dtype=dt) for name, dt in _LINK_COLUMNS.items()}
+        self._n = 0
+        self._high_water = 0
+        self._recent_ids = set()
+        self._subreddits = {}
+        self._term_row, self._term_text, self._origins = {}, [], []
+        self._sync_locked(full=True)
+        self.loaded_at = time.monotonic()
+
+    def _sync_or_reload_locked(self):
+        reload_after = getattr(settings, "HOT_STORE_RELOAD_SECONDS", 3600)
+        if self.loaded_at is None or (reload_after and time.monotonic() - self.loaded_at >= reload_after):
+            self._load_locked()
+        else:
+            self._sync_locked(full=False)
+
+    def sync(self):
+        with self._lock:
+            self._sync_or_reload_locked()
+
+    def maybe_sync(self):
+        interval = getattr(settings, "HOT_STORE_SYNC_SECONDS", 10)
+        if time.monotonic() - self.synced_at < interval:
+            return
+        # Another thread is syncing: keep serving the published view
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            # re-checked under the lock: a sync may have finished since the check above
+            if time.monotonic() - self.synced_at >= interval:
+                self._sync_or_reload_locked()
+        finally:
+            self._lock.release()
+
+    def _sync_locked(self, full: bool):
+        cutoff = _epoch(timezone.now()) - self.days * 86400
+        self._load_terms()
+        # Bound the read first: links committed meanwhile are picked up by the next sync
+        last = PostTerm.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        # Links that committed behind the high-water mark (PostgreSQL) are re-read from
+        # the lookback margin; ids already loaded are skipped
+        lookback = getattr(settings, "HOT_STORE_SYNC_LOOKBACK", 0)
+        start = max(0, self._high_water - lookback)
+
+        rows = (
+            PostTerm.objects
+            .filter(
+                id__gt=start, id__lte=last,
+                post__created_utc__gte=datetime.fromtimestamp(cutoff, dt_timezone.utc),
+            )
+            .order_by("id")
+            .values_list(
+                "id", "term_id", "post_id", "post__created_utc", "post__score",
+                "post__num_comments", "post__subreddit", "post__sentiment",
+            )
+        )
+        recent = self._recent_ids
+        new_rows = [
+            r for r in rows.iterator(chunk_size=20000)
+            if r[1] in self._term_row and (r[0] > self._high_water or r[0] not in recent)
+        ]
+        if new_rows:
+            self._append(new_rows)
+        # Links whose post is out of the window were skipped; move past them too
+        self._high_water = max(self._high_water, last)
+        if lookback:
+            floor = self._high_water - lookback
+            self._recent_ids = {i for i in recent if i > floor}
+            self._recent_ids.update(r[0] for r in new_rows if r[0] > floor)
+
+        self._age_out(cutoff)
+        if not full:
+            self._refresh_sentiment()
+        self._publish()
+        self.synced_at = time.monotonic()
+
+    def _load_terms(self):
+        origins = {o: i for i, o in enumerate(self._origins)}
+        terms = list(Term.objects.order_by("id").values_list("id", "text", "cultural_origin", "is_active"))
+        # Term rows only ever grow (a deleted term keeps its slot until the next reload)
+        for term_id, text, _, _ in terms:
+            if term_id not in self._term_row:
+                self._term_row[term_id] = len(self._term_text)
+                self._term_text.append(text)
+
+        n = len(self._term_text)
+        term_ids = np.zeros(n, dtype=np.int64)
+        origin = np.zeros(n, dtype=np.int16)
+        active = np.zeros(n, dtype=bool)
+        for term_id, text, cultural_origin, is_active in terms:
+            row = self._term_row[term_id]
+            self._term_text[row] = text
+            o = cultural_origin or "other"
+            if o not in origins:
+                origins[o] = len(self._origins)
+                self._origins.append(o)
+            term_ids[row] = term_id
+            origin[row] = origins[o]
+            active[row] = is_active
+        self._term_ids, self._term_origin, self._term_active = term_ids, origin, active
+
+    def _append(self, rows: list[tuple]):
+        k = len(rows)
+        need = self._n + k
+        if need > len(self._cols["created"]):
+            # amortized growth; readers keep the old arrays until _publish
+            cap = max(need, int(len(self._cols["created"]) * 1.5), 1024)
+            grown = {}
+            for name, arr in self._cols.items():
+                new = np.empty(cap, dtype=arr.dtype)
+                new[:self._n] = arr[:self._n]
+                grown[name] = new
+            self._cols = grown
+
+        subs = self._subreddits
+        for name, values in (
+            ("created", [_epoch(r[3]) for r in rows]),
+            ("score", [r[4] or 0 for r in rows]),
+            ("comments", [r[5] or 0 for r in rows]),
+            ("term", [self._term_row[r[1]] for r in rows]),
+            ("subreddit", [subs.setdefault(r[6], len(subs)) for r in rows]),
+            ("post_id", [r[2] for r in rows]),
+            ("sentiment", [math.nan if r[7] is None else r[7] for r in rows]),
+        ):
+            self._cols[name][self._n:need] = values
+        self._n = need
+        self._high_water = max(self._high_water, rows[-1][0])
+
+    def _age_out(self, cutoff: float):
+        created = self._cols["created"][:self._n]
+        keep = created >= cutoff
+        if keep.all():
+            return
+        # Fresh arrays (not in-place) so concurrent readers see consistent columns
+        self._cols = {name: arr[:self._n][keep] for name, arr in self._cols.items()}
+        self._n = len(self._cols["created"])
+
+    def _refresh_sentiment(self):
+        sentiment = self._cols["sentiment"][:self._n]
+        unscored = np.flatnonzero(np.isnan(sentiment))
+        if not len(unscored):
+            return
+        post_ids = self._cols["post_id"][unscored]
+        recheck = np.unique(post_ids)[-SENTIMENT_RECHECK:].tolist()
+        scores = {}
+        for i in range(0, len(recheck), _CHUNK):
+            scores.update(
+                Post.objects
+                .filter(id__in=recheck[i:i + _CHUNK], sentiment__isnull=False)
+                .values_list("id", "sentiment")
+            )
+        self._apply_sentiment(scores)
+
+    def _apply_sentiment(self, scores: dict):
+        if not scores:
+            return
+        sentiment = self._cols["sentiment"][:self._n]
+        unscored = np.flatnonzero(np.isnan(sentiment))
+        post_ids = self._cols["post_id"][unscored]
+        ids = np.fromiter(scores.keys(), dtype=np.int64, count=len(scores))
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+        order = np.argsort(ids)
+        ids, values = ids[order], values[order]
+        pos = np.searchsorted(ids, post_ids)
+        pos[pos == len(ids)] = 0
+        hit = ids[pos] == post_ids
+        # Written in place: a reader sees each link either unscored or scored
+        sentiment[unscored[hit]] = values[pos[hit]]
+
+    def update_sentiment(self, scores: dict):
+        # {post_id: compound} from the sentiment stage in this process
+        with self._lock:
+            self._apply_sentiment(scores)
+
+    def _publish(self):
+        view = {name: arr[:self._n] for name, arr in self._cols.items()}
+        view["term_ids"] = self._term_ids
+        view["term_origin"] = self._term_origin
+        view["term_active"] = self._term_active
+        view["term_text"] = list(self._term_text)
+        view["origins"] = list(self._origins)
+        self._view = view
+
+    # --- queries ---
+
+    def covers(self, days: int) -> bool:
+        return self._view is not None and days <= self.days
+
+    def _window(self, now, days: int, half_life_days: float, a: float, b: float):
+        # (view, link mask, contrib, recent flags, prev flags) for active-term links in the window
+        v = self._view
+        now_e = _epoch(now)
+        created = v["created"]
+        mask = (created >= now_e - days * 86400) & v["term_active"][v["term"]]
+        c = created[mask]
+
+        age_days = np.maximum(0.0, (now_e - c) / 86400.0)
+        decay = np.exp(-math.log(2) * age_days / half_life_days)
+        score = np.maximum(v["score"][mask], 0).astype(np.float64)
+        comments = np.maximum(v["comments"][mask], 0).astype(np.float64)
+        contrib = decay * (1.0 + a * np.log1p(score) + b * np.log1p(comments))
+
+        recent = c >= now_e - 86400
+        prev = (c >= now_e - 2 * 86400) & ~recent
+        return v, mask, contrib, recent, prev
+
+    def aggregate_terms(self, now, days: int, half_life_days: float, a: float, b: float) -> dict:
+        """
+        Same by_term dict as the ORM scan in get_trending_terms (input to _rank_terms).
+        """
+        v, mask, contrib, recent, prev = self._window(now, days, half_life_days, a, b)
+        term = v["term"][mask]
+        n = len(v["term_ids"])
+        sentiment = v["sentiment"][mask].astype(np.float64)
+        scored = ~np.isnan(sentiment)
+
+        mentions = np.bincount(term, minlength=n)
+        trend = np.bincount(term, weights=contrib, minlength=n)
+        recent_n = np.bincount(term, weights=recent, minlength=n)
+        prev_n = np.bincount(term, weights=prev, minlength=n)
+        sent_sum = np.bincount(term[scored], weights=sentiment[scored], minlength=n)
+        sent_n = np.bincount(term[scored], minlength=n)
+
+        term_ids, text = v["term_ids"], v["term_text"]
+        return {
+            int(term_ids[row]): {
+                "term": text[row],
+                "trend_score": float(trend[row]),
+                "mentions": int(mentions[row]),
+                "recent_24h": int(recent_n[row]),
+                "prev_24h": int(prev_n[row]),
+                "sentiment_sum": float(sent_sum[row]),
+                "sentiment_n": int(sent_n[row]),
+            }
+            for row in np.flatnonzero(mentions)
+        }
+
+    def aggregate_origins(self, now, days: int, half_life_days: float, a: float, b: float) -> dict:
+        """
+        Same by_origin dict as get_trending_cuisines (distinct counts as ints, like posts.pg).
+        """
+        v, mask, contrib, recent, prev = self._window(now, days, half_life_days, a, b)
+        term = v["term"][mask]
+        origin = v["term_origin"][term].astype(np.int64)
+        n = len(v["origins"])
+
+        mentions = np.bincount(origin, minlength=n)
+        trend = np.bincount(origin, weights=contrib, minlength=n)
+        recent_n = np.bincount(origin, weights=recent, minlength=n)
+        prev_n = np.bincount(origin, weights=prev, minlength=n)
+        # distinct (origin, term) / (origin, subreddit) pairs
+        n_terms = len(v["term_ids"])
+        unique_terms = np.bincount(np.unique(origin * n_terms + term) // n_terms, minlength=n)
+        subreddit = v["subreddit"][mask].astype(np.int64)
+        n_subs = int(subreddit.max()) + 1 if len(subreddit) else 1
+        unique_subs = np.bincount(np.unique(origin * n_subs + subreddit) // n_subs, minlength=n)
+
+        names = v["origins"]
+        return {
+            names[o]: {
+                "origin": names[o],
+                "trend_score": float(trend[o]),
+                "mentions": int(mentions[o]),
+                "recent_24h": int(recent_n[o]),
+                "prev_24h": int(prev_n[o]),
+                "unique_terms": int(unique_terms[o]),
+                "unique_subreddits": int(unique_subs[o]),
+            }
+            for o in np.flatnonzero(mentions)
+        }
+
+    def term_post_ids(self, term_id: int, now, days: int) -> np.ndarray:
+        # Posts linked to one term inside the window (search candidate filter)
+        v = self._view
+        row = self._term_row.get(term_id)
+        if row is None:
+            return np.empty(0, dtype=np.int64)
+        mask = (v["term"] == row) & (v["created"] >= _epoch(now) - days * 86400)
+        return np.unique(v["post_id"][mask])
+
+    def stats(self) -> dict:
+        v = self._view or {}
+        links = len(v.get("created", ()))
+        link_bytes = sum(v[name].nbytes for name in _LINK_COLUMNS) if v else 0
+        capacity_bytes = sum(arr.nbytes for arr in self._cols.values())
+        return {
+            "days": self.days,
+            "links": links,
+            "terms": len(v.get("term_ids", ())),
+            "subreddits": len(self._subreddits),
+            "bytes_per_link": sum(np.dtype(dt).itemsize for dt in _LINK_COLUMNS.values()),
+            "link_bytes": link_bytes,
+            "allocated_bytes": capacity_bytes,
+            "high_water": self._high_water,
+        }
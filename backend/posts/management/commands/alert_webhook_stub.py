@@ -0,0 +1,50 @@
+# posts/management/commands/alert_webhook_stub.py
+#
+# Local receiver for the "webhook" alert sink: prints every alert POSTed to it.
+#   FOODTREND_ALERTS=1 FOODTREND_ALERT_SINKS=log,webhook python manage.py run_pipeline ...
+#   python manage.py alert_webhook_stub --port 8765
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from posts.profiling import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = "Run a local HTTP stub that prints alerts delivered by the webhook sink."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+
+    def handle(self, *args, **opts):
+        stdout = self.stdout
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    alerts = json.loads(self.rfile.read(length) or b"{}").get("alerts", [])
+                except ValueError:
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+                for a in alerts:
+                    stdout.write(
+                        f"[{a.get('fired_at')}] {a.get('rule')}: {a.get('label')} "
+                        f"{a.get('metric')}={a.get('value')} 24h={a.get('recent_24h')} prev={a.get('prev_24h')}"
+                    )
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((opts["host"], opts["port"]), Handler)
+        self.stdout.write(f"Alert webhook stub on http://{opts['host']}:{opts['port']}/ (Ctrl-C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,103 @@
+import json
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from posts.profiling import ProfiledCommand
+
+
+def _floats(value: str) -> list[float]:
+    return [float(x) for x in value.split(",") if x.strip()]
+
+
+class Command(ProfiledCommand):
+    help = "Backtest trend_score parameters (half_life, a, b) over a grid: rank stability + lead time before peak."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", default=None, help="First as-of day (YYYY-MM-DD). Default: 30 days ago.")
+        parser.add_argument("--end", default=None, help="Last as-of day (YYYY-MM-DD). Default: now.")
+        parser.add_argument("--step-hours", type=float, default=24.0, help="Hours between as-of evaluations.")
+        parser.add_argument("--days", type=int, default=7, help="Trend window in days (like get_trending_terms).")
+        parser.add_argument("--top", type=int, default=20, help="Leaderboard size (top-k).")
+        parser.add_argument("--half-lives", default="1,2.5,5", help="Comma-separated half-life days.")
+        parser.add_argument("--a", dest="a_values", default="0,0.25,0.5", help="Comma-separated score weights.")
+        parser.add_argument("--b", dest="b_values", default="0,0.15,0.3", help="Comma-separated comment weights.")
+        parser.add_argument("--min-peak", type=int, default=3, help="Min per-step mentions for a term to count as peaking.")
+        parser.add_argument("--from-columnar", default=None, help="Read links from a snapshot_columnar directory instead of the DB.")
+        parser.add_argument("--out", default=None, help="Write the full report as JSON here.")
+
+    def handle(self, *args, **opts):
+        try:
+            end = (
+                datetime.combine(date.fromisoformat(opts["end"]), time.max, tzinfo=dt_timezone.utc)
+                if opts["end"] else timezone.now()
+            )
+            start = (
+                datetime.combine(date.fromisoformat(opts["start"]), time.min, tzinfo=dt_timezone.utc)
+                if opts["start"] else end - timedelta(days=30)
+            )
+            half_lives = _floats(opts["half_lives"])
+            a_values = _floats(opts["a_values"])
+            b_values = _floats(opts["b_values"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if start >= end or opts["step_hours"] <= 0:
+            raise CommandError("Need --start < --end and a positive --step-hours.")
+
+        # pandas / numpy are only loaded once the arguments are valid
+        from posts.backtest import load_links_from_db, load_links_from_frames, sweep
+
+        # Load the window once: as-of range plus one trend window of history
+        load_start = start - timedelta(days=opts["days"])
+        if opts["from_columnar"]:
+            from posts.columnar import load_frames
+
+            frames = load_frames(opts["from_columnar"], start=load_start.date(), end=end.date())
+            links = load_links_from_frames(frames, load_start, end)
+        else:
+            links = load_links_from_db(load_start, end)
+
+        step = opts["step_hours"] * 3600.0
+        as_of = []
+        t = start.timestamp()
+        while t <= end.timestamp():
+            as_of.append(t)
+            t += step
+
+        report = sweep(
+            links,
+            as_of=as_of,
+            days=opts["days"],
+            half_lives=half_lives,
+            a_values=a_values,
+            b_values=b_values,
+            top_k=opts["top"],
+            min_peak_mentions=opts["min_peak"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backtested {len(report)} parameter sets over {len(as_of)} steps, "
+            f"{len(links['created'])} links, {len(links['term_ids'])} terms."
+        ))
+        self.stdout.write(f"{'half_life':>9} {'a':>6} {'b':>6} {'stability':>9} {'detected':>8} {'mean_lead_h':>11}")
+        ranked = sorted(report, key=lambda r: (r["mean_lead_hours"] or 0.0, r["rank_stability"] or 0.0), reverse=True)
+        for r in ranked:
+            self.stdout.write(
+                f"{r['half_life_days']:>9} {r['a']:>6} {r['b']:>6} {str(r['rank_stability']):>9} "
+                f"{r['detected_before_peak']:>4}/{r['peaked_terms']:<3} {str(r['mean_lead_hours']):>11}"
+            )
+
+        if opts["out"]:
+            payload = {
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "step_hours": opts["step_hours"],
+                "days": opts["days"],
+                "top": opts["top"],
+                "results": report,
+            }
+            with open(opts["out"], "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, indent=2)
+            self.stdout.write(f"Report written to {opts['out']}")
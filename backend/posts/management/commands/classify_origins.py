@@ -0,0 +1,114 @@
+# posts/management/commands/classify_origins.py
+#
+# Label unlabeled terms (cultural_origin "other", confidence 0) from the origins of the
+# terms they co-occur with (TermCooccurrence, kept current by term matching):
+#
+#   votes(term, origin) = sum over labeled partners p with that origin of
+#                         cooccurrence(term, p) / degree(p) * weight(p)
+#
+# degree(p) is p's total co-occurrence, so a ubiquitous partner ("chicken") does not
+# outvote specific ones; weight(p) is p's origin_confidence (1.0 for labels without a
+# confidence, e.g. manual).
+# The winning origin's confidence is its vote share shrunk toward 0 for thin evidence:
+# share * evidence / (evidence + prior), evidence = raw co-occurrences with labeled
+# partners. Each extra --rounds pass lets newly labeled terms vote.
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from posts.models import Term, TermCooccurrence
+from posts.profiling import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = "Infer cultural_origin for unlabeled terms from co-occurrence with labeled terms."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Only count co-occurrence from the last N days.")
+        parser.add_argument("--min-evidence", type=int, default=3,
+                            help="Minimum co-occurrences with labeled terms.")
+        parser.add_argument("--min-confidence", type=float, default=0.5)
+        parser.add_argument("--prior", type=float, default=2.0, help="Shrinkage for terms with little evidence.")
+        parser.add_argument("--rounds", type=int, default=2, help="Propagation passes.")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        unlabeled = {
+            t.id: t for t in Term.objects.filter(cultural_origin="other", origin_confidence=0.0)
+        }
+        labels = {
+            term_id: (origin, confidence or 1.0)
+            for term_id, origin, confidence in (
+                Term.objects.exclude(cultural_origin="other")
+                .values_list("id", "cultural_origin", "origin_confidence")
+            )
+        }
+        if not unlabeled or not labels:
+            self.stdout.write("Nothing to classify (no unlabeled or no labeled terms).")
+            return
+
+        qs = TermCooccurrence.objects.filter(term__cultural_origin="other", term__origin_confidence=0.0)
+        if opts["days"]:
+            qs = qs.filter(day__gte=timezone.now() - timedelta(days=opts["days"]))
+
+        # Sparse rows: term -> {partner: count}
+        matrix = defaultdict(dict)
+        rows = qs.values("term_id", "other_id").annotate(n=Sum("count")).order_by()
+        for term_id, other_id, n in rows.values_list("term_id", "other_id", "n"):
+            matrix[term_id][other_id] = n
+
+        degree_qs = TermCooccurrence.objects.all()
+        if opts["days"]:
+            degree_qs = degree_qs.filter(day__gte=timezone.now() - timedelta(days=opts["days"]))
+        degree = dict(degree_qs.values("term_id").annotate(n=Sum("count")).order_by().values_list("term_id", "n"))
+
+        assigned = {}
+        for _ in range(max(1, opts["rounds"])):
+            new = {}
+            for term_id, partners in matrix.items():
+                if term_id in assigned or term_id not in unlabeled:
+                    continue
+                votes = defaultdict(float)
+                evidence = 0
+                for other_id, n in partners.items():
+                    label = labels.get(other_id)
+                    if label is None:
+                        continue
+                    origin, weight = label
+                    votes[origin] += n / degree.get(other_id, n) * weight
+                    evidence += n
+                if evidence < opts["min_evidence"]:
+                    continue
+
+                total = sum(votes.values())
+                origin, best = max(votes.items(), key=lambda kv: kv[1])
+                confidence = (best / total) * evidence / (evidence + opts["prior"])
+                if confidence >= opts["min_confidence"]:
+                    new[term_id] = (origin, round(confidence, 4))
+            if not new:
+                break
+            assigned.update(new)
+            labels.update(new)
+
+        counts = defaultdict(int)
+        updates = []
+        for term_id, (origin, confidence) in assigned.items():
+            term = unlabeled[term_id]
+            term.cultural_origin = origin
+            term.origin_confidence = confidence
+            updates.append(term)
+            counts[origin] += 1
+            if opts["verbosity"] > 1:
+                self.stdout.write(f"  {term.text!r} -> {origin} ({confidence:.2f})")
+
+        if not opts["dry_run"]:
+            Term.objects.bulk_update(updates, ["cultural_origin", "origin_confidence"], batch_size=500)
+
+        summary = ", ".join(f"{origin} {n}" for origin, n in sorted(counts.items(), key=lambda kv: -kv[1]))
+        prefix = "Would label" if opts["dry_run"] else "Labeled"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {len(updates)} of {len(unlabeled)} unlabeled terms" + (f" ({summary})" if summary else "")
+        ))
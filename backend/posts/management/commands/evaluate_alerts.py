@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from posts.alerts import find_alerts, fire_alerts
+from posts.models import TermBucket
+from posts.profiling import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = (
+        "Evaluate ALERT_RULES for terms with hour buckets in the last N hours (ingest does this "
+        "automatically with FOODTREND_ALERTS=1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="Terms mentioned in the last N hours.")
+        parser.add_argument("--dry-run", action="store_true", help="List rule hits without recording or delivering.")
+
+    def handle(self, *args, **opts):
+        since = timezone.now() - timedelta(hours=opts["hours"])
+        term_ids = set(
+            TermBucket.objects.filter(bucket="hour", start__gte=since).values_list("term_id", flat=True).distinct()
+        )
+        hits = find_alerts(term_ids)
+        for hit in hits:
+            self.stdout.write(
+                f"  {hit['rule']:<16} {hit['label']:<24} {hit['metric']}={hit['value']:.2f} "
+                f"(>= {hit['threshold']}) 24h={hit['recent_24h']} prev={hit['prev_24h']}"
+            )
+
+        if opts["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"DRY RUN: {len(hits)} rule hits over {len(term_ids)} terms."))
+            return
+
+        fired = fire_alerts(hits)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(hits)} rule hits over {len(term_ids)} terms; fired {len(fired)} "
+            f"(others duplicate / cooling down)."
+        ))
@@ -2,10 +2,10 @@ import re
 from collections import Counter
 from datetime import timedelta
 
-from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from posts.models import Post
+from posts.profiling import ProfiledCommand
 
 
 WORD_RE = re.compile(r"[a-z0-9]+")
@@ -57,7 +57,7 @@ def generate_ngrams(tokens: list[str], n: int) -> list[str]:
     return out
 
 
-class Command(BaseCommand):
+class Command(ProfiledCommand):
     help = "Extract candidate food terms (unigrams/bigrams/trigrams) from recent posts."
 
     def add_arguments(self, parser):
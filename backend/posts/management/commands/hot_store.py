@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from posts.hotstore_columns import HotStore
+from posts.profiling import ProfiledCommand
+from posts.services.trending import _rank_terms
+from posts.trending_cuisines import _rank_origins
+
+
+def _ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+class Command(ProfiledCommand):
+    help = "Load the hot-window store (independent of FOODTREND_HOT_STORE) and report its memory and query times."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Window to load (default: HOT_STORE_DAYS).")
+        parser.add_argument("--repeat", type=int, default=5, help="Query repeats (best time is reported).")
+
+    def handle(self, *args, **opts):
+        days = opts["days"] or settings.HOT_STORE_DAYS
+        store = HotStore(days)
+
+        t0 = time.perf_counter()
+        store.load()
+        load_s = time.perf_counter() - t0
+
+        s = store.stats()
+        links = s["links"]
+        self.stdout.write(
+            f"Loaded {links} links ({s['terms']} terms, {s['subreddits']} subreddits) "
+            f"for the last {days}d in {load_s:.2f}s"
+        )
+        self.stdout.write(
+            f"  columns {s['link_bytes'] / 1e6:.1f} MB ({s['bytes_per_link']} bytes/link, "
+            f"{s['bytes_per_link']:.0f} MB per million links), allocated {s['allocated_bytes'] / 1e6:.1f} MB"
+        )
+        if not links:
+            return
+
+        now = timezone.now()
+        repeat = max(1, opts["repeat"])
+        for window in sorted({1, 7, days}):
+            if window > days:
+                continue
+            terms_ms = _ms(lambda: _rank_terms(store.aggregate_terms(now, window, 2.5, 0.25, 0.15), 20), repeat)
+            origins_ms = _ms(lambda: _rank_origins(store.aggregate_origins(now, window, 2.5, 0.25, 0.15), 20), repeat)
+            self.stdout.write(f"  {window:>3}d  trending terms {terms_ms:8.2f}ms  cuisines {origins_ms:8.2f}ms")
+
+        t0 = time.perf_counter()
+        store.sync()
+        self.stdout.write(f"  incremental sync (no new links) {(time.perf_counter() - t0) * 1000:.1f}ms")
@@ -1,29 +1,52 @@
 # posts/management/commands/import_terms.py
+#
+# Bulk, idempotent vocabulary import: the file is read once, diffed against all Terms
+# with one query, and the creates / reactivations / relabels / deactivations are written
+# with bulk_create / bulk_update in one transaction (posts.services.term_import).
+# Re-running the same file is a no-op.
 
 from pathlib import Path
 
-from django.core.management.base import BaseCommand, CommandError
-from posts.models import Term
+from django.core.management.base import CommandError
 
+from posts.profiling import ProfiledCommand
+from posts.services.term_import import (
+    apply_term_diff, diff_terms, format_term_diff, read_term_file, summarize_term_diff,
+)
 
-class Command(BaseCommand):
-    help = "Import food terms from a text file (one term per line)."
+
+class Command(ProfiledCommand):
+    help = "Import food terms from a text file (one term per line) or a CSV (text[,cultural_origin])."
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--file",
             required=True,
-            help="Path to a .txt file with one term per line (lines starting with # are ignored).",
+            help=(
+                "Path to a .txt file with one term per line (lines starting with # are ignored), "
+                "or a .csv with a header row: text (or term) and optional cultural_origin."
+            ),
         )
         parser.add_argument(
             "--deactivate",
             action="store_true",
             help="Import terms as inactive (is_active=False). Default is active.",
         )
+        parser.add_argument(
+            "--deactivate-missing",
+            action="store_true",
+            help="Deactivate active terms that are not in the file (full vocabulary sync).",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=1000,
+            help="Rows per bulk_create / bulk_update statement.",
+        )
         parser.add_argument(
             "--dry-run",
             action="store_true",
-            help="Show what would happen without writing to the DB.",
+            help="Print the exact diff (one line per change) without writing to the DB.",
         )
 
     def handle(self, *args, **opts):
@@ -31,54 +54,30 @@ class Command(BaseCommand):
         if not file_path.exists() or not file_path.is_file():
             raise CommandError(f"File not found: {file_path}")
 
-        make_active = not opts["deactivate"]
-        dry_run = opts["dry_run"]
-
-        created = 0
-        reactivated = 0
-        unchanged = 0
-        skipped_blank = 0
-        skipped_comment = 0
+        try:
+            rows, skipped = read_term_file(file_path)
+        except ValueError as e:
+            raise CommandError(str(e))
 
-        lines = file_path.read_text(encoding="utf-8").splitlines()
-
-        for raw in lines:
-            line = (raw or "").strip()
-
-            if not line:
-                skipped_blank += 1
-                continue
-
-            if line.startswith("#"):
-                skipped_comment += 1
-                continue
-
-            # normalize term text
-            text = line.lower()
-
-            existing = Term.objects.filter(text=text).first()
-
-            if existing is None:
-                if dry_run:
-                    created += 1
-                    continue
+        make_active = not opts["deactivate"]
+        # Importing as inactive only sets the flag on new terms (existing ones keep theirs)
+        diff = diff_terms(
+            rows,
+            is_active=make_active,
+            update_active=make_active,
+            deactivate_missing=opts["deactivate_missing"],
+        )
 
-                Term.objects.create(text=text, is_active=make_active)
-                created += 1
-            else:
-                # If term exists but is inactive and we’re importing as active -> reactivate
-                if make_active and not existing.is_active:
-                    if dry_run:
-                        reactivated += 1
-                        continue
-                    existing.is_active = True
-                    existing.save(update_fields=["is_active"])
-                    reactivated += 1
-                else:
-                    unchanged += 1
+        dry_run = opts["dry_run"]
+        if dry_run:
+            for line in format_term_diff(diff):
+                self.stdout.write(line)
+        else:
+            apply_term_diff(diff, batch_size=max(1, opts["batch"]))
 
+        counts = summarize_term_diff(diff)
         mode = "DRY RUN" if dry_run else "DONE"
         self.stdout.write(self.style.SUCCESS(
-            f"{mode}: created={created}, reactivated={reactivated}, unchanged={unchanged}, "
-            f"skipped_blank={skipped_blank}, skipped_comment={skipped_comment}"
-        ))
\ No newline at end of file
+            f"{mode}: " + ", ".join(f"{k}={v}" for k, v in counts.items()) + ", "
+            + ", ".join(f"skipped_{k}={v}" for k, v in skipped.items())
+        ))
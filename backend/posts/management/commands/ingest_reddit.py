@@ -1,30 +1,68 @@
-from django.core.management.base import BaseCommand
+import time
+
+from django.utils import timezone
+
+from posts.match_queue import drain_match_queue
+from posts.profiling import ProfiledCommand
 from posts.reddit_json_ingest import ingest_reddit_json
-from posts.term_matcher import run_term_matching
-from posts.models import Post
+from posts.sentiment import run_sentiment_scoring
+from posts.services.pipeline_stats import record_fetches
+from posts.services.snapshots import publish_snapshots
+from posts.models import IngestRun
 
-class Command(BaseCommand):
+class Command(ProfiledCommand):
     help = "Ingest posts from Reddit public JSON endpoints and run term matching."
 
     def add_arguments(self, parser):
         parser.add_argument("--limit", type=int, default=50)
         parser.add_argument("--sleep", type=float, default=2.0)
         parser.add_argument("--subs", nargs="*", default=None)
+        parser.add_argument("--no-sentiment", action="store_true",
+                            help="Skip the VADER sentiment stage after matching.")
+        parser.add_argument("--no-snapshots", action="store_true",
+                            help="Skip publishing leaderboard snapshots after matching.")
 
     def handle(self, *args, **options):
         limit = options["limit"]
         sleep = options["sleep"]
         subs = options["subs"]
 
-        before_ids = set(Post.objects.values_list("id", flat=True))
-        ingest_reddit_json(subreddits=subs, limit=limit, sleep_seconds=sleep)
-        after_ids = set(Post.objects.values_list("id", flat=True))
+        # Row is created up front so runs that crash show up with finished_at NULL
+        run = IngestRun.objects.create(started_at=timezone.now())
+        t_run = time.perf_counter()
+
+        fetches = []
+        t0 = time.perf_counter()
+        ingest_reddit_json(subreddits=subs, limit=limit, sleep_seconds=sleep, fetches=fetches)
+        run.fetch_seconds = time.perf_counter() - t0
+        record_fetches(run, fetches)
+
+        new_ids = [pid for f in fetches for pid in f["post_ids"]]
+
+        # New posts were queued by store_posts; draining also picks up posts left
+        # behind by a run that crashed before matching
+        t0 = time.perf_counter()
+        matched = drain_match_queue()
+        run.matching_seconds = time.perf_counter() - t0
+        links = run.links_created = matched["links"]
+
+        if not options["no_sentiment"]:
+            t0 = time.perf_counter()
+            run_sentiment_scoring()
+            run.sentiment_seconds = time.perf_counter() - t0
 
-        new_ids = after_ids - before_ids
-        new_posts_qs = Post.objects.filter(id__in=new_ids)
+        snapshots = 0
+        if not options["no_snapshots"]:
+            t0 = time.perf_counter()
+            snapshots = publish_snapshots()
+            run.snapshot_seconds = time.perf_counter() - t0
 
-        links = run_term_matching(posts_qs=new_posts_qs)
+        run.total_seconds = time.perf_counter() - t_run
+        run.finished_at = timezone.now()
+        run.save()
 
         self.stdout.write(
-            self.style.SUCCESS(f"Done. New posts: {len(new_ids)}, term links created: {links}")
-        )
\ No newline at end of file
+            self.style.SUCCESS(
+                f"Done. New posts: {len(new_ids)}, term links created: {links}, snapshots: {snapshots}"
+            )
+        )
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from posts.dedup import mark_duplicates
+from posts.models import Post
+from posts.profiling import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = "Compute MinHash signatures / near-duplicate flags for recent posts ingested without them (backfill)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Default: DEDUP_DAYS.")
+        parser.add_argument("--chunk", type=int, default=2000, help="Posts per transaction.")
+
+    def handle(self, *args, **opts):
+        days = opts["days"] or settings.DEDUP_DAYS
+        since = timezone.now() - timedelta(days=days)
+        # Oldest first, so every cluster root is the earliest post
+        ids = list(
+            Post.objects.filter(created_utc__gte=since, minhash__isnull=True)
+            .order_by("created_utc", "id")
+            .values_list("id", flat=True)
+        )
+
+        chunk = max(1, opts["chunk"])
+        flagged = 0
+        for i in range(0, len(ids), chunk):
+            posts = list(Post.objects.filter(id__in=ids[i:i + chunk]).only("id", "title", "body", "created_utc"))
+            with transaction.atomic():
+                flagged += mark_duplicates(posts)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {len(ids)} posts from the last {days} days: {flagged} near-duplicates flagged."
+        ))
@@ -0,0 +1,54 @@
+import signal
+import threading
+
+from django.db import close_old_connections
+
+from posts.match_queue import DEFAULT_LEASE_SECONDS, backfill_match_queue, drain_match_queue, queue_status
+from posts.profiling import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = "Match posts from the durable MatchQueue (claim/ack batches). Safe to run several workers at once."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch", type=int, default=500, help="Posts claimed per batch.")
+        parser.add_argument("--lease", type=int, default=DEFAULT_LEASE_SECONDS,
+                            help="Seconds before a claimed batch is given to another worker.")
+        parser.add_argument("--backfill", action="store_true",
+                            help="First enqueue every post with term_matched_at IS NULL (one-off scan).")
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit.")
+        parser.add_argument("--poll", type=float, default=5.0, help="Seconds between polls when the queue is empty.")
+        parser.add_argument("--status", action="store_true", help="Print queue counts and exit.")
+
+    def handle(self, *args, **opts):
+        if opts["status"]:
+            s = queue_status()
+            self.stdout.write(f"pending {s['pending']}, leased {s['leased']}, dead {s['dead']}")
+            return
+
+        if opts["backfill"]:
+            queued = backfill_match_queue()
+            self.stdout.write(f"Enqueued {queued} unmatched posts.")
+
+        stop = threading.Event()
+        if not opts["once"]:
+            signal.signal(signal.SIGINT, lambda *a: stop.set())
+            signal.signal(signal.SIGTERM, lambda *a: stop.set())
+
+        totals = {"batches": 0, "posts": 0, "links": 0, "failed": 0}
+        while not stop.is_set():
+            close_old_connections()
+            # one batch per call so a stop signal is honoured between batches
+            drained = drain_match_queue(batch_size=opts["batch"], lease_seconds=opts["lease"], max_batches=1)
+            for k in totals:
+                totals[k] += drained[k]
+            if drained["posts"]:
+                continue
+            if opts["once"]:
+                break
+            stop.wait(opts["poll"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. Batches: {totals['batches']}, posts: {totals['posts']}, term links created: {totals['links']}, "
+            f"failed posts: {totals['failed']}"
+        ))
@@ -0,0 +1,37 @@
+from posts.profiling import ProfiledCommand
+from posts.services.pipeline_stats import get_pipeline_stats
+
+
+def _fmt(p: dict) -> str:
+    if not p["n"]:
+        return "no samples"
+    return f"p50 {p['p50']:.3f}s  p90 {p['p90']:.3f}s  p99 {p['p99']:.3f}s  max {p['max']:.3f}s  (n={p['n']})"
+
+
+class Command(ProfiledCommand):
+    help = "Show ingest run history: per-subreddit fetch latency percentiles, HTTP statuses and matcher timings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7)
+
+    def handle(self, *args, **opts):
+        stats = get_pipeline_stats(days=opts["days"])
+
+        runs = stats["runs"]
+        self.stdout.write(f"Runs in last {stats['days']}d: {runs['count']} ({runs['unfinished']} unfinished)")
+        self.stdout.write(f"  run duration   {_fmt(runs['total_seconds'])}")
+
+        m = stats["matching"]
+        self.stdout.write(f"  matching       {_fmt(m['seconds'])}")
+        self.stdout.write(f"  links created  {m['links_created']} ({m['links_per_second'] or 0} links/s)")
+
+        self.stdout.write("\nFetch latency by subreddit:")
+        for s in stats["subreddits"]:
+            statuses = ", ".join(f"{code}x{n}" for code, n in sorted(s["statuses"].items()))
+            self.stdout.write(
+                f"  r/{s['subreddit']:<20} {_fmt(s['latency_seconds'])}\n"
+                f"  {'':<22} HTTP {statuses}  errors {s['error_rate']:.0%}  "
+                f"seen {s['posts_seen']} inserted {s['posts_inserted']}"
+            )
+        if not stats["subreddits"]:
+            self.stdout.write("  (no fetches recorded)")
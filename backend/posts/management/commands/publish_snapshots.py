@@ -0,0 +1,14 @@
+from posts.profiling import ProfiledCommand
+from posts.services.snapshots import publish_snapshots
+
+
+class Command(ProfiledCommand):
+    help = "Compute and store trend leaderboard snapshots for the preset windows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, nargs="*", default=None,
+                            help="Preset windows in days (default: settings.TREND_SNAPSHOT_DAYS).")
+
+    def handle(self, *args, **opts):
+        written = publish_snapshots(days_presets=opts["days"])
+        self.stdout.write(self.style.SUCCESS(f"Published {written} snapshots."))
@@ -0,0 +1,19 @@
+from django.db import transaction
+
+from posts.profiling import ProfiledCommand
+from posts.services.cooccurrence import rebuild_cooccurrences
+
+
+class Command(ProfiledCommand):
+    help = "Rebuild TermCooccurrence (term x term per day) from existing PostTerm links (backfill)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk", type=int, default=2000, help="Posts per rollup write.")
+
+    def handle(self, *args, **opts):
+        with transaction.atomic():
+            n_posts, rows = rebuild_cooccurrences(chunk_posts=max(1, opts["chunk"]))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt co-occurrence from {n_posts} linked posts ({rows} row increments)."
+        ))
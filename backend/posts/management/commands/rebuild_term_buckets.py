@@ -0,0 +1,40 @@
+from django.db import transaction
+
+from posts.models import PostTerm, TermBucket
+from posts.profiling import ProfiledCommand
+from posts.services.series import record_link_buckets
+
+
+class Command(ProfiledCommand):
+    help = "Rebuild TermBucket (hour/day) rollups from existing PostTerm links (backfill)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk", type=int, default=5000, help="Links per rollup write.")
+
+    def handle(self, *args, **opts):
+        chunk_size = max(1, opts["chunk"])
+
+        qs = (
+            PostTerm.objects
+            .order_by("id")
+            .values_list("term_id", "post__created_utc", "post__score", "post__num_comments")
+        )
+
+        total = 0
+        with transaction.atomic():
+            deleted, _ = TermBucket.objects.all().delete()
+
+            chunk = []
+            for row in qs.iterator(chunk_size=chunk_size):
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    record_link_buckets(chunk)
+                    total += len(chunk)
+                    chunk = []
+            if chunk:
+                record_link_buckets(chunk)
+                total += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt term buckets from {total} links (removed {deleted} old bucket rows)."
+        ))
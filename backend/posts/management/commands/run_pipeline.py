@@ -0,0 +1,40 @@
+import signal
+
+from posts.pipeline import Pipeline
+from posts.profiling import ProfiledCommand
+from posts.reddit_json_ingest import DEFAULT_SUBREDDITS
+
+
+class Command(ProfiledCommand):
+    help = "Run ingest as a long-lived daemon: adaptive per-subreddit fetches feeding a concurrent matcher."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subs", nargs="*", default=None)
+        parser.add_argument("--limit", type=int, default=100, help="Posts per listing request.")
+        parser.add_argument("--min-interval", type=float, default=30.0, help="Fastest per-subreddit fetch interval (s).")
+        parser.add_argument("--max-interval", type=float, default=900.0, help="Slowest per-subreddit fetch interval (s).")
+        parser.add_argument("--queue-size", type=int, default=20, help="Fetches buffered before fetching pauses.")
+        parser.add_argument("--batch-posts", type=int, default=500, help="Max posts per matching transaction.")
+        parser.add_argument("--snapshot-interval", type=float, default=300.0,
+                            help="Seconds between leaderboard snapshot publishes (0 = never).")
+        parser.add_argument("--no-sentiment", action="store_true", help="Skip the VADER sentiment stage.")
+        parser.add_argument("--sentiment-workers", type=int, default=None,
+                            help="Sentiment worker processes (default: SENTIMENT_WORKERS).")
+        parser.add_argument("--run-for", type=float, default=None, help="Stop after this many seconds.")
+
+    def handle(self, *args, **opts):
+        pipeline = Pipeline(
+            subreddits=opts["subs"] or DEFAULT_SUBREDDITS,
+            limit=opts["limit"],
+            min_interval=opts["min_interval"],
+            max_interval=opts["max_interval"],
+            queue_size=max(1, opts["queue_size"]),
+            batch_posts=max(1, opts["batch_posts"]),
+            sentiment=not opts["no_sentiment"],
+            sentiment_workers=opts["sentiment_workers"],
+            snapshot_interval=opts["snapshot_interval"],
+        )
+        signal.signal(signal.SIGINT, pipeline.stop)
+        signal.signal(signal.SIGTERM, pipeline.stop)
+
+        pipeline.run(run_for=opts["run_for"])
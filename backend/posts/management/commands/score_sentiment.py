@@ -0,0 +1,15 @@
+from posts.profiling import ProfiledCommand
+from posts.sentiment import run_sentiment_scoring
+
+
+class Command(ProfiledCommand):
+    help = "Score VADER sentiment for posts that have not been scored yet (batched, multiprocess)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=None, help="Max posts to score (default: all pending).")
+        parser.add_argument("--batch", type=int, default=500, help="Posts per worker batch.")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: SENTIMENT_WORKERS).")
+
+    def handle(self, *args, **opts):
+        scored = run_sentiment_scoring(limit=opts["limit"], batch_size=opts["batch"], workers=opts["workers"])
+        self.stdout.write(self.style.SUCCESS(f"Done. Scored {scored} posts."))
@@ -1,5 +1,6 @@
-from django.core.management.base import BaseCommand
 from posts.models import Term
+from posts.profiling import ProfiledCommand
+from posts.services.term_import import apply_term_diff, diff_terms, normalize_term, summarize_term_diff
 
 BASE_TERMS = [
     # Dishes / cuisines
@@ -26,7 +27,7 @@ DEFAULT_STOP_TERMS = [
     "cutting", "dinner", "lunch", "breakfast",
 ]
 
-class Command(BaseCommand):
+class Command(ProfiledCommand):
     help = "Seed Term table with a curated list of food-related terms."
 
     def add_arguments(self, parser):
@@ -40,30 +41,18 @@ class Command(BaseCommand):
             Term.objects.all().delete()
             self.stdout.write(self.style.WARNING("Wiped all existing terms."))
 
-        created = 0
-        reactivated = 0
-
-        for t in BASE_TERMS:
-            t = t.strip().lower()
-            obj, was_created = Term.objects.get_or_create(text=t, defaults={"is_active": True})
-            if was_created:
-                created += 1
-            else:
-                if obj.is_active is False:
-                    obj.is_active = True
-                    obj.save(update_fields=["is_active"])
-                    reactivated += 1
+        # One diff + bulk write per list (posts.services.term_import)
+        diff = diff_terms({normalize_term(t): None for t in BASE_TERMS}, is_active=True)
+        apply_term_diff(diff)
+        seeded = summarize_term_diff(diff)
 
         stop_deactivated = 0
         if opts["deactivate_stops"]:
-            for t in DEFAULT_STOP_TERMS:
-                t = t.strip().lower()
-                obj, _ = Term.objects.get_or_create(text=t, defaults={"is_active": False})
-                if obj.is_active:
-                    obj.is_active = False
-                    obj.save(update_fields=["is_active"])
-                    stop_deactivated += 1
+            stops = diff_terms({normalize_term(t): None for t in DEFAULT_STOP_TERMS}, is_active=False)
+            apply_term_diff(stops)
+            stop_deactivated = summarize_term_diff(stops)["deactivated"]
 
         self.stdout.write(self.style.SUCCESS(
-            f"Seeded terms. Created={created}, Reactivated={reactivated}, StopDeactivated={stop_deactivated}"
-        ))
\ No newline at end of file
+            f"Seeded terms. Created={seeded['created']}, Reactivated={seeded['reactivated']}, "
+            f"StopDeactivated={stop_deactivated}"
+        ))
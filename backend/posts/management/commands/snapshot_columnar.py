@@ -0,0 +1,44 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+from posts.profiling import ProfiledCommand
+
+
+class Command(ProfiledCommand):
+    help = "Dump Post/Term/PostTerm into day-partitioned Feather files (incremental) for offline analytics."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--out", default=str(settings.COLUMNAR_DIR), help="Snapshot directory.")
+        parser.add_argument("--start", default=None, help="First day (YYYY-MM-DD). Default: oldest post.")
+        parser.add_argument("--end", default=None, help="Last day (YYYY-MM-DD). Default: today (UTC).")
+        parser.add_argument("--refresh-days", type=int, default=2,
+                            help="Always rewrite this many trailing days (partial day, late scores).")
+        parser.add_argument("--compression", default="zstd", choices=["zstd", "lz4", "uncompressed"],
+                            help="Feather compression (uncompressed = zero-copy memory-mappable).")
+        parser.add_argument("--with-text", action="store_true", help="Include post title/body columns.")
+        parser.add_argument("--rebuild", action="store_true", help="Ignore the manifest and rewrite every partition.")
+
+    def handle(self, *args, **opts):
+        try:
+            start = date.fromisoformat(opts["start"]) if opts["start"] else None
+            end = date.fromisoformat(opts["end"]) if opts["end"] else None
+        except ValueError as e:
+            raise CommandError(f"Bad date: {e}")
+
+        from posts.columnar import write_snapshot  # pandas / pyarrow
+
+        stats = write_snapshot(
+            opts["out"],
+            start=start,
+            end=end,
+            refresh_days=opts["refresh_days"],
+            compression=opts["compression"],
+            with_text=opts["with_text"],
+            rebuild=opts["rebuild"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {stats['partitions_written']} day partitions to {opts['out']}: "
+            f"posts={stats['posts']}, post_terms={stats['post_terms']}, terms={stats['terms']}"
+        ))
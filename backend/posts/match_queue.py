@@ -0,0 +1,159 @@
+# posts/match_queue.py
+#
+# Durable queue between ingestion and term matching (MatchQueue table).
+#
+#   store_posts()          -> enqueue_posts(ids)       same transaction as the INSERT
+#   drain_match_queue()    -> claim_batch / run_term_matching / ack_batch
+#                             (a failing batch is split until the bad posts are isolated)
+#
+# Crash recovery only looks at the queue (O(pending)), never the whole Post table.
+# A claim is a lease: if a worker dies, its rows become claimable again once lease_until
+# passes. Matching is idempotent (already-matched posts are skipped), so a post that is
+# claimed twice after an expired lease is not linked twice.
+
+import uuid
+from datetime import timedelta
+
+from django.db import InterfaceError, OperationalError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from posts import hotstore
+from posts.models import MatchQueue, Post
+from posts.term_matcher import run_term_matching
+
+DEFAULT_LEASE_SECONDS = 300
+MAX_ATTEMPTS = 5
+
+
+def enqueue_posts(post_ids) -> int:
+    rows = [MatchQueue(post_id=pid) for pid in post_ids]
+    MatchQueue.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+    return len(rows)
+
+
+def claim_batch(limit: int = 500, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> tuple[str, list[int]]:
+    """
+    Lease up to `limit` pending posts (oldest first). Returns (claim_token, post_ids).
+    The UPDATE re-checks the lease condition, so two workers racing for the same rows
+    each get a disjoint set.
+    """
+    token = uuid.uuid4().hex
+    now = timezone.now()
+    claimable = Q(lease_until__isnull=True) | Q(lease_until__lt=now)
+
+    with transaction.atomic():
+        ids = list(
+            MatchQueue.objects
+            .filter(claimable, attempts__lt=MAX_ATTEMPTS)
+            .order_by("id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return token, []
+        MatchQueue.objects.filter(claimable, id__in=ids).update(
+            claim_token=token,
+            lease_until=now + timedelta(seconds=lease_seconds),
+            attempts=F("attempts") + 1,
+        )
+
+    post_ids = list(MatchQueue.objects.filter(claim_token=token).values_list("post_id", flat=True))
+    return token, post_ids
+
+
+def ack_batch(token: str) -> int:
+    deleted, _ = MatchQueue.objects.filter(claim_token=token).delete()
+    return deleted
+
+
+def release_batch(token: str) -> int:
+    # Give the rows back immediately (e.g. after a failed matching transaction)
+    return MatchQueue.objects.filter(claim_token=token).update(claim_token="", lease_until=None)
+
+
+def _match_claimed(token: str, post_ids: list[int]) -> int:
+    # ack commits together with the links
+    with transaction.atomic():
+        links = run_term_matching(posts_qs=Post.objects.filter(id__in=post_ids), limit=None)
+        MatchQueue.objects.filter(claim_token=token, post_id__in=post_ids).delete()
+    return links
+
+
+def _match_isolating(token: str, post_ids: list[int], stats: dict) -> int:
+    """
+    Match claimed posts; if the batch fails, retry it in halves so only a post that fails
+    on its own keeps its claim (and its spent attempt) until the lease expires, instead of
+    the whole batch marching toward MAX_ATTEMPTS. Database errors (locks, lost
+    connections) are not caused by a post and propagate.
+    """
+    try:
+        return _match_claimed(token, post_ids)
+    except (OperationalError, InterfaceError):
+        raise
+    except Exception as e:
+        if len(post_ids) == 1:
+            print(f"Post {post_ids[0]} failed term matching ({e!r}); retried after its lease.")
+            stats["failed"] += 1
+            return 0
+    mid = len(post_ids) // 2
+    return _match_isolating(token, post_ids[:mid], stats) + _match_isolating(token, post_ids[mid:], stats)
+
+
+def drain_match_queue(batch_size: int = 500, lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                      max_batches: int | None = None) -> dict:
+    """
+    Claim / match / ack until the queue is empty (or max_batches).
+    Returns {"batches", "posts" (matched), "links", "failed" (posts left for a later retry)}.
+    """
+    stats = {"batches": 0, "posts": 0, "links": 0, "failed": 0}
+    while max_batches is None or stats["batches"] < max_batches:
+        token, post_ids = claim_batch(limit=batch_size, lease_seconds=lease_seconds)
+        if not post_ids:
+            break
+        failed = stats["failed"]
+        try:
+            links = _match_isolating(token, post_ids, stats)
+        except Exception:
+            release_batch(token)
+            raise
+
+        stats["batches"] += 1
+        stats["posts"] += len(post_ids) - (stats["failed"] - failed)
+        stats["links"] += links
+
+    if stats["links"]:
+        hotstore.notify_ingest()
+    return stats
+
+
+def backfill_match_queue(chunk_size: int = 5000) -> int:
+    """
+    One-off: enqueue every post that was never matched (term_matched_at IS NULL) and is
+    not queued yet.
+    """
+    qs = (
+        Post.objects
+        .filter(term_matched_at__isnull=True, match_queue__isnull=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    queued = 0
+    chunk = []
+    for post_id in qs.iterator(chunk_size=chunk_size):
+        chunk.append(post_id)
+        if len(chunk) >= chunk_size:
+            queued += enqueue_posts(chunk)
+            chunk = []
+    if chunk:
+        queued += enqueue_posts(chunk)
+    return queued
+
+
+def queue_status() -> dict:
+    now = timezone.now()
+    qs = MatchQueue.objects.all()
+    return {
+        "pending": qs.filter(Q(lease_until__isnull=True) | Q(lease_until__lt=now), attempts__lt=MAX_ATTEMPTS).count(),
+        "leased": qs.filter(lease_until__gte=now).count(),
+        "dead": qs.filter(attempts__gte=MAX_ATTEMPTS).count(),
+    }
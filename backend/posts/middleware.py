@@ -0,0 +1,46 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from posts import perf
+
+
+class PerfMiddleware:
+    """
+    Per-request stage timings -> `Server-Timing` header + process-wide metrics registry.
+    Removed from the stack entirely (MiddlewareNotUsed) unless PERF_INSTRUMENTATION is on.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        t0 = time.perf_counter()
+        with perf.recording() as timings:
+            response = self.get_response(request)
+        return self._finish(request, response, timings, time.perf_counter() - t0)
+
+    async def __acall__(self, request):
+        t0 = time.perf_counter()
+        with perf.recording() as timings:
+            response = await self.get_response(request)
+        return self._finish(request, response, timings, time.perf_counter() - t0)
+
+    def _finish(self, request, response, timings, total_seconds):
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        perf.observe_request(route, response.status_code, total_seconds, timings)
+        response["Server-Timing"] = perf.server_timing_header(timings, total_seconds)
+        return response
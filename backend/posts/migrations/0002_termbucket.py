@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='term_matched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='cultural_origin',
+            field=models.CharField(choices=[('american_canadian', 'American/Canadian'), ('italian', 'Italian'), ('mexican', 'Mexican'), ('korean', 'Korean'), ('japanese', 'Japanese'), ('chinese', 'Chinese'), ('indian', 'Indian'), ('middle_eastern', 'Middle Eastern'), ('southeast_asian', 'Southeast Asian'), ('french', 'French'), ('fusion', 'Fusion'), ('other', 'Other/Unclear')], db_index=True, default='other', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='term',
+            name='origin_confidence',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.CreateModel(
+            name='TermBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=8)),
+                ('start', models.DateTimeField()),
+                ('mentions', models.IntegerField(default=0)),
+                ('score_sum', models.BigIntegerField(default=0)),
+                ('comments_sum', models.BigIntegerField(default=0)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='posts.term')),
+            ],
+            options={
+                'unique_together': {('term', 'bucket', 'start')},
+            },
+        ),
+    ]
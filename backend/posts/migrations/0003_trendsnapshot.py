@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_termbucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('terms', 'Terms'), ('cuisines', 'Cuisines')], max_length=16)),
+                ('days', models.IntegerField()),
+                ('limit', models.IntegerField()),
+                ('results', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'unique_together': {('kind', 'days')},
+            },
+        ),
+    ]
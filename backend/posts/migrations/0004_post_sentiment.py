@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_trendsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='sentiment',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_sentiment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField(db_index=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('posts_seen', models.IntegerField(default=0)),
+                ('posts_inserted', models.IntegerField(default=0)),
+                ('fetch_seconds', models.FloatField(default=0.0)),
+                ('matching_seconds', models.FloatField(blank=True, null=True)),
+                ('links_created', models.IntegerField(default=0)),
+                ('sentiment_seconds', models.FloatField(blank=True, null=True)),
+                ('snapshot_seconds', models.FloatField(blank=True, null=True)),
+                ('total_seconds', models.FloatField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IngestFetch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subreddit', models.CharField(max_length=100)),
+                ('status', models.IntegerField(default=0)),
+                ('latency_seconds', models.FloatField(default=0.0)),
+                ('posts_seen', models.IntegerField(default=0)),
+                ('posts_inserted', models.IntegerField(default=0)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fetches', to='posts.ingestrun')),
+            ],
+        ),
+    ]
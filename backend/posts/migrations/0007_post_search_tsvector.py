@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# Same expression as posts.pg.SEARCH_TSV_SQL (the query must match it to use the index)
+SEARCH_TSV_SQL = (
+    "to_tsvector('simple'::regconfig, COALESCE(\"posts_post\".\"title\", '') || ' ' || "
+    "COALESCE(\"posts_post\".\"body\", ''))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    # PostgreSQL only; SQLite keeps scanning the window in Python
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS posts_post_search_tsv ON posts_post USING GIN (({SEARCH_TSV_SQL}))"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS posts_post_search_tsv")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_matchqueue'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
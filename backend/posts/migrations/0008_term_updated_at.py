@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_search_tsvector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='term',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_term_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TermCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateTimeField()),
+                ('count', models.IntegerField(default=0)),
+                ('other', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='posts.term')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='posts.term')),
+            ],
+            options={
+                'unique_together': {('term', 'other', 'day')},
+            },
+        ),
+    ]
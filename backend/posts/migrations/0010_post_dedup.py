@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_termcooccurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='dup_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='posts.post'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='minhash',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='PostLshBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.SmallIntegerField()),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('created_utc', models.DateTimeField(db_index=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_bands', to='posts.post')),
+            ],
+        ),
+    ]
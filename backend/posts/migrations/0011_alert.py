@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_dedup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Alert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule', models.CharField(max_length=64)),
+                ('scope', models.CharField(choices=[('term', 'Term'), ('cuisine', 'Cuisine')], max_length=16)),
+                ('key', models.CharField(max_length=80)),
+                ('label', models.CharField(max_length=80)),
+                ('window_start', models.DateTimeField()),
+                ('metric', models.CharField(max_length=16)),
+                ('value', models.FloatField()),
+                ('threshold', models.FloatField()),
+                ('mentions_24h', models.IntegerField()),
+                ('prev_24h', models.IntegerField()),
+                ('fired_at', models.DateTimeField(db_index=True)),
+                ('delivered', models.JSONField(default=dict)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['rule', 'key', 'fired_at'], name='posts_alert_rule_34ac71_idx')],
+                'unique_together': {('rule', 'key', 'window_start')},
+            },
+        ),
+    ]
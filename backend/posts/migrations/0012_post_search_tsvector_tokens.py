@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Same expression as posts.pg.SEARCH_TSV_SQL (the query must match it to use the index).
+# Runs of anything but [a-z0-9] become spaces first, so the lexemes are exactly the
+# search scorer's tokens (posts.services.search._tokens): 'jalapeño' is indexed as
+# 'jalape' + 'o' and '3.5' as '3' + '5', like the Python path sees them.
+SEARCH_TSV_SQL = (
+    "to_tsvector('simple'::regconfig, regexp_replace(lower(COALESCE(\"posts_post\".\"title\", '') || ' ' || "
+    "COALESCE(\"posts_post\".\"body\", '')), '[^a-z0-9]+', ' ', 'g'))"
+)
+
+# Expression indexed by 0007
+OLD_SEARCH_TSV_SQL = (
+    "to_tsvector('simple'::regconfig, COALESCE(\"posts_post\".\"title\", '') || ' ' || "
+    "COALESCE(\"posts_post\".\"body\", ''))"
+)
+
+
+def _replace_index(schema_editor, expression):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS posts_post_search_tsv")
+    schema_editor.execute(f"CREATE INDEX posts_post_search_tsv ON posts_post USING GIN (({expression}))")
+
+
+def use_token_index(apps, schema_editor):
+    _replace_index(schema_editor, SEARCH_TSV_SQL)
+
+
+def use_parser_index(apps, schema_editor):
+    _replace_index(schema_editor, OLD_SEARCH_TSV_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_alert'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_token_index, use_parser_index),
+    ]
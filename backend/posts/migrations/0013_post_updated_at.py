@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_search_tsvector_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
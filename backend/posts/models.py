@@ -15,6 +15,17 @@ class Post(models.Model):
 
     fetched_at = models.DateTimeField(auto_now_add=True)
     term_matched_at = models.DateTimeField(null=True, blank=True)
+    # VADER compound score in [-1, 1]; NULL until the sentiment stage has scored the post
+    sentiment = models.FloatField(null=True, blank=True)
+    # Last write after insert (sentiment, dedup flags); NULL = unchanged since fetch.
+    # bulk_update skips auto_now, so the writers set it explicitly
+    updated_at = models.DateTimeField(null=True, blank=True)
+    # Near-duplicate detection (posts.dedup): packed MinHash signature, and the first post
+    # of this post's duplicate cluster (NULL = not a duplicate)
+    minhash = models.BinaryField(null=True, blank=True)
+    dup_of = models.ForeignKey(
+        "self", null=True, blank=True, on_delete=models.SET_NULL, related_name="duplicates",
+    )
 
     def __str__(self) -> str:
         return f"[r/{self.subreddit}] {self.title[:60]}"
@@ -46,6 +57,9 @@ class Term(models.Model):
         db_index=True,
     )
     origin_confidence = models.FloatField(default=0.0)
+    # Part of the compiled term index fingerprint (posts.term_index); QuerySet.update()
+    # skips auto_now, so pass updated_at there when changing text / is_active
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.text
@@ -62,4 +76,163 @@ class PostTerm(models.Model):
         unique_together = ("post", "term")
 
     def __str__(self) -> str:
-        return f"{self.term.text} in {self.post.reddit_id}"
\ No newline at end of file
+        return f"{self.term.text} in {self.post.reddit_id}"
+
+class TermBucket(models.Model):
+    """
+    Pre-bucketed per-term counts (hour/day), maintained incrementally by term matching.
+    Engagement is the post score/comments at match time.
+    """
+    BUCKETS = [
+        ("hour", "Hour"),
+        ("day", "Day"),
+    ]
+
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="buckets")
+    bucket = models.CharField(max_length=8, choices=BUCKETS)
+    start = models.DateTimeField()
+    mentions = models.IntegerField(default=0)
+    score_sum = models.BigIntegerField(default=0)
+    comments_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("term", "bucket", "start")
+
+    def __str__(self) -> str:
+        return f"{self.term_id} {self.bucket} {self.start:%Y-%m-%d %H:00}"
+
+
+class TrendSnapshot(models.Model):
+    """
+    Precomputed leaderboard for one preset window, published after each ingest run.
+    `limit` is how many rows were stored; smaller requests are served by slicing.
+    """
+    KINDS = [
+        ("terms", "Terms"),
+        ("cuisines", "Cuisines"),
+    ]
+
+    kind = models.CharField(max_length=16, choices=KINDS)
+    days = models.IntegerField()
+    limit = models.IntegerField()
+    results = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("kind", "days")
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.days}d @ {self.computed_at:%Y-%m-%d %H:%M}"
+
+
+class IngestRun(models.Model):
+    """
+    One ingest_reddit run: stage durations and totals (per-subreddit fetches in IngestFetch).
+    """
+    started_at = models.DateTimeField(db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    posts_seen = models.IntegerField(default=0)
+    posts_inserted = models.IntegerField(default=0)
+    fetch_seconds = models.FloatField(default=0.0)
+    matching_seconds = models.FloatField(null=True, blank=True)
+    links_created = models.IntegerField(default=0)
+    sentiment_seconds = models.FloatField(null=True, blank=True)
+    snapshot_seconds = models.FloatField(null=True, blank=True)
+    total_seconds = models.FloatField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"run {self.id} @ {self.started_at:%Y-%m-%d %H:%M}"
+
+
+class IngestFetch(models.Model):
+    """
+    One listing request within an IngestRun. status is the HTTP status (0 = request failed).
+    """
+    run = models.ForeignKey(IngestRun, on_delete=models.CASCADE, related_name="fetches")
+    subreddit = models.CharField(max_length=100)
+    status = models.IntegerField(default=0)
+    latency_seconds = models.FloatField(default=0.0)
+    posts_seen = models.IntegerField(default=0)
+    posts_inserted = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"r/{self.subreddit} HTTP {self.status} in {self.latency_seconds:.2f}s"
+
+
+class MatchQueue(models.Model):
+    """
+    Outbox of posts waiting for term matching, written in the same transaction as the post.
+    Workers claim batches under a lease (claim_token + lease_until) and delete rows on ack;
+    rows whose lease expired (crashed worker) are claimable again.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, related_name="match_queue")
+    enqueued_at = models.DateTimeField(auto_now_add=True)
+    claim_token = models.CharField(max_length=32, blank=True, default="", db_index=True)
+    lease_until = models.DateTimeField(null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"post {self.post_id} (attempts {self.attempts})"
+
+
+class TermCooccurrence(models.Model):
+    """
+    Sparse term x term co-occurrence: posts (by post day) linked to both terms.
+    Stored in both directions, so all partners of a term are one indexed range.
+    Maintained incrementally by term matching (posts.services.cooccurrence).
+    """
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="cooccurrences")
+    other = models.ForeignKey(Term, on_delete=models.CASCADE, related_name="+")
+    day = models.DateTimeField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ("term", "other", "day")
+
+    def __str__(self) -> str:
+        return f"{self.term_id} ~ {self.other_id} {self.day:%Y-%m-%d}: {self.count}"
+
+
+class PostLshBand(models.Model):
+    """
+    LSH bucket of one MinHash band of a post (posts.dedup). Posts sharing a (band, bucket)
+    are near-duplicate candidates; rows older than DEDUP_DAYS are pruned at ingest.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="lsh_bands")
+    band = models.SmallIntegerField()
+    bucket = models.BigIntegerField(db_index=True)
+    created_utc = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"post {self.post_id} band {self.band}"
+
+
+class Alert(models.Model):
+    """
+    A fired trend alert (posts.alerts). Also the dedup / cooldown ledger: one row per
+    (rule, key, hour window), and a rule stays quiet for a key during ALERT_COOLDOWN_SECONDS.
+    """
+    SCOPES = [
+        ("term", "Term"),
+        ("cuisine", "Cuisine"),
+    ]
+
+    rule = models.CharField(max_length=64)
+    scope = models.CharField(max_length=16, choices=SCOPES)
+    key = models.CharField(max_length=80)  # term id or cultural_origin
+    label = models.CharField(max_length=80)
+    window_start = models.DateTimeField()
+    metric = models.CharField(max_length=16)
+    value = models.FloatField()
+    threshold = models.FloatField()
+    mentions_24h = models.IntegerField()
+    prev_24h = models.IntegerField()
+    fired_at = models.DateTimeField(db_index=True)
+    delivered = models.JSONField(default=dict)  # {sink: "ok" | error}
+
+    class Meta:
+        unique_together = ("rule", "key", "window_start")
+        indexes = [models.Index(fields=["rule", "key", "fired_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.rule} {self.label} {self.metric}={self.value:.2f}"
@@ -0,0 +1,193 @@
+# posts/perf.py
+#
+# Lightweight per-request / per-stage timing.
+#
+#   with stage("trending.scan"):
+#       ...
+#   add_rows("trending.scan", n)
+#
+# Nothing is recorded unless a recording is active (PerfMiddleware per request, or
+# `with recording() as timings:` in scripts/commands); otherwise stage() returns a shared
+# no-op context manager, so instrumented code pays one ContextVar lookup.
+# Finished requests are folded into a process-wide registry exposed as Prometheus text.
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from django.http import JsonResponse
+
+_current = contextvars.ContextVar("perf_timings", default=None)
+_NOOP = nullcontext()
+
+
+class Timings:
+    __slots__ = ("stages", "rows", "queries", "query_seconds")
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.rows: dict[str, int] = {}
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+class _Stage:
+    __slots__ = ("timings", "name", "t0")
+
+    def __init__(self, timings: Timings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        stages = self.timings.stages
+        stages[self.name] = stages.get(self.name, 0.0) + elapsed
+        return False
+
+
+def stage(name: str):
+    timings = _current.get()
+    if timings is None:
+        return _NOOP
+    return _Stage(timings, name)
+
+
+def add_rows(name: str, n: int):
+    timings = _current.get()
+    if timings is not None:
+        timings.rows[name] = timings.rows.get(name, 0) + n
+
+
+def active() -> Timings | None:
+    return _current.get()
+
+
+@contextmanager
+def recording():
+    """
+    Record stages for the enclosed block (also used by PerfMiddleware per request).
+    """
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def json_response(payload, status: int = 200) -> JsonResponse:
+    # JSON encoding happens in the JsonResponse constructor
+    with stage("serialize"):
+        return JsonResponse(payload, status=status)
+
+
+def count_queries(execute, sql, params, many, context):
+    """
+    connection.execute_wrappers hook (installed per connection when instrumentation is on).
+    """
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.query_seconds += time.perf_counter() - t0
+
+
+def server_timing_header(timings: Timings, total_seconds: float) -> str:
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.stages.items()]
+    parts.append(f'db;dur={timings.query_seconds * 1000:.2f};desc="{timings.queries} queries"')
+    parts.append(f"total;dur={total_seconds * 1000:.2f}")
+    return ", ".join(parts)
+
+
+# --- process-wide registry (Prometheus text exposition) ---
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.n += 1
+
+
+_lock = threading.Lock()
+_request_seconds: dict[tuple[str, str], _Histogram] = {}
+_stage_seconds: dict[str, _Histogram] = {}
+_db_queries: dict[str, int] = {}
+_rows_scanned: dict[str, int] = {}
+
+
+def observe_request(route: str, status: int, total_seconds: float, timings: Timings):
+    status_class = f"{status // 100}xx"
+    with _lock:
+        _request_seconds.setdefault((route, status_class), _Histogram()).observe(total_seconds)
+        for name, seconds in timings.stages.items():
+            _stage_seconds.setdefault(name, _Histogram()).observe(seconds)
+        _db_queries[route] = _db_queries.get(route, 0) + timings.queries
+        for name, n in timings.rows.items():
+            _rows_scanned[name] = _rows_scanned.get(name, 0) + n
+
+
+def _histogram_lines(metric: str, label_sets: dict) -> list[str]:
+    lines = []
+    for labels, hist in label_sets.items():
+        cumulative = 0
+        for le, count in zip(BUCKETS + (float("inf"),), hist.counts):
+            cumulative += count
+            le_str = "+Inf" if le == float("inf") else repr(le)
+            lines.append(f'{metric}_bucket{{{labels},le="{le_str}"}} {cumulative}')
+        lines.append(f"{metric}_sum{{{labels}}} {hist.total}")
+        lines.append(f"{metric}_count{{{labels}}} {hist.n}")
+    return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    with _lock:
+        requests = {
+            f'route="{_escape(route)}",status="{status}"': h for (route, status), h in _request_seconds.items()
+        }
+        stages = {f'stage="{_escape(name)}"': h for name, h in _stage_seconds.items()}
+
+        lines = [
+            "# HELP foodtrend_request_seconds Request latency by route.",
+            "# TYPE foodtrend_request_seconds histogram",
+            *_histogram_lines("foodtrend_request_seconds", requests),
+            "# HELP foodtrend_stage_seconds Time spent per instrumented stage (per request).",
+            "# TYPE foodtrend_stage_seconds histogram",
+            *_histogram_lines("foodtrend_stage_seconds", stages),
+            "# HELP foodtrend_db_queries_total DB queries executed by route.",
+            "# TYPE foodtrend_db_queries_total counter",
+            *[f'foodtrend_db_queries_total{{route="{_escape(r)}"}} {n}' for r, n in _db_queries.items()],
+            "# HELP foodtrend_rows_scanned_total Rows scanned per stage.",
+            "# TYPE foodtrend_rows_scanned_total counter",
+            *[f'foodtrend_rows_scanned_total{{stage="{_escape(s)}"}} {n}' for s, n in _rows_scanned.items()],
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def install_query_counter(sender, connection, **kwargs):
+    # connection_created receiver
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
@@ -0,0 +1,190 @@
+# posts/pg.py
+#
+# PostgreSQL-only code paths, selected at call time by connection.vendor. SQLite (the
+# default) keeps the Python aggregation in posts.services.*; these produce the same
+# by_term / by_origin dicts, so ranking and output shapes are shared.
+#
+# - trends / cuisines: one GROUP BY with the decay formula in SQL (EXP / LN)
+# - search: candidate posts from a 'simple' tsvector GIN index over the scorer's tokens
+#   (migration 0012), then the usual Python token scoring over the candidates only
+# - ingest: COPY into a temp table + INSERT ... ON CONFLICT DO NOTHING RETURNING
+
+import math
+
+from django.db import connection
+from django.db.models import BooleanField, Count, F, FloatField, Func, Q, Sum, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, Exp, Greatest, Ln, NullIf
+from django.utils import timezone
+
+from posts.models import Post, PostTerm
+
+# Must stay identical to the expression indexed in migration 0012 (copied there) for the
+# planner to use the index. Non-[a-z0-9] runs are blanked before parsing, so lexemes are
+# the search scorer's tokens: the 'simple' parser alone keeps 'jalapeño' or '3.5' whole,
+# and the pre-filter would drop posts the Python scorer matches.
+SEARCH_TSV_SQL = (
+    "to_tsvector('simple'::regconfig, regexp_replace(lower(COALESCE(\"posts_post\".\"title\", '') || ' ' || "
+    "COALESCE(\"posts_post\".\"body\", '')), '[^a-z0-9]+', ' ', 'g'))"
+)
+
+
+def is_postgres() -> bool:
+    return connection.vendor == "postgresql"
+
+
+class _EpochSeconds(Func):
+    template = "EXTRACT(EPOCH FROM %(expressions)s)"
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Django's SQLite datetime difference is in microseconds. Lets the aggregates run as
+        # a stand-in on the default backend (posts/tests/test_pg.py).
+        return self.as_sql(compiler, connection, template="(%(expressions)s / 1000000.0)", **extra_context)
+
+
+def _contrib_expr(now, half_life_days: float, a: float, b: float):
+    # decay(age) * (1 + a*ln(1 + score) + b*ln(1 + comments)), as in _match_contrib
+    age_days = Greatest(
+        _EpochSeconds(Value(now) - F("post__created_utc")) / Value(86400.0),
+        Value(0.0),
+    )
+    decay = Exp(Value(-math.log(2) / half_life_days) * age_days)
+    score = Greatest(Coalesce(F("post__score"), 0), 0)
+    comments = Greatest(Coalesce(F("post__num_comments"), 0), 0)
+    engagement = (
+        Value(1.0)
+        + Value(a) * Ln(Value(1.0) + score, output_field=FloatField())
+        + Value(b) * Ln(Value(1.0) + comments, output_field=FloatField())
+    )
+    return decay * engagement
+
+
+def _window_counts(last_24h_start, prev_24h_start) -> dict:
+    return {
+        "trend_mentions": Count("id"),
+        "recent": Count("id", filter=Q(post__created_utc__gte=last_24h_start)),
+        "prev": Count("id", filter=Q(post__created_utc__gte=prev_24h_start, post__created_utc__lt=last_24h_start)),
+    }
+
+
+def _window_links(window_start, dedupe: bool):
+    qs = PostTerm.objects.filter(post__created_utc__gte=window_start, term__is_active=True)
+    if dedupe:
+        from posts.services.trending import _counted_once  # services.trending imports this module
+
+        qs = qs.filter(_counted_once(window_start))
+    return qs
+
+
+def aggregate_terms(now, window_start, last_24h_start, prev_24h_start, half_life_days, a, b,
+                    dedupe: bool = False) -> dict:
+    rows = (
+        _window_links(window_start, dedupe)
+        .values("term_id", "term__text")
+        .annotate(
+            score=Sum(_contrib_expr(now, half_life_days, a, b), output_field=FloatField()),
+            sentiment_sum=Sum("post__sentiment"),
+            sentiment_n=Count("post__sentiment"),
+            **_window_counts(last_24h_start, prev_24h_start),
+        )
+        .order_by()
+    )
+    return {
+        r["term_id"]: {
+            "term": r["term__text"],
+            "trend_score": r["score"] or 0.0,
+            "mentions": r["trend_mentions"],
+            "recent_24h": r["recent"],
+            "prev_24h": r["prev"],
+            "sentiment_sum": r["sentiment_sum"] or 0.0,
+            "sentiment_n": r["sentiment_n"],
+        }
+        for r in rows
+    }
+
+
+def aggregate_origins(now, window_start, last_24h_start, prev_24h_start, half_life_days, a, b,
+                      dedupe: bool = False) -> dict:
+    rows = (
+        _window_links(window_start, dedupe)
+        # NULL / '' fold into "other" before grouping (as the Python scan does), so the
+        # distinct term / subreddit counts stay exact
+        .annotate(origin=Coalesce(NullIf(F("term__cultural_origin"), Value("")), Value("other")))
+        .values("origin")
+        .annotate(
+            score=Sum(_contrib_expr(now, half_life_days, a, b), output_field=FloatField()),
+            unique_terms=Count("term_id", distinct=True),
+            unique_subreddits=Count("post__subreddit", distinct=True),
+            **_window_counts(last_24h_start, prev_24h_start),
+        )
+        .order_by()
+    )
+    return {
+        r["origin"]: {
+            "origin": r["origin"],
+            "trend_score": r["score"] or 0.0,
+            "mentions": r["trend_mentions"],
+            "recent_24h": r["recent"],
+            "prev_24h": r["prev"],
+            # counts, not sets (see _rank_origins)
+            "unique_terms": r["unique_terms"],
+            "unique_subreddits": r["unique_subreddits"],
+        }
+        for r in rows
+    }
+
+
+def filter_search_candidates(posts_qs, query_tokens: set[str]):
+    # Any token in title or body (same condition as the Python scorer's hit check). Query
+    # and indexed text go through the same [a-z0-9]+ tokenization, and such tokens joined
+    # with | are a valid tsquery.
+    tsquery = " | ".join(sorted(query_tokens))
+    matches = RawSQL(
+        f"{SEARCH_TSV_SQL} @@ to_tsquery('simple'::regconfig, %s)", (tsquery,), output_field=BooleanField(),
+    )
+    return posts_qs.filter(matches)
+
+
+_COPY_COLUMNS = ("reddit_id", "subreddit", "title", "body", "created_utc", "score", "num_comments", "fetched_at")
+
+
+def copy_insert_posts(posts: list[Post]) -> list[Post]:
+    """
+    Bulk insert with COPY (psycopg 3). Rows whose reddit_id already exists are skipped by
+    ON CONFLICT, so no separate existence query is needed. Returns the inserted Posts
+    with ids set.
+    """
+    if not posts:
+        return []
+    fetched_at = timezone.now()
+    cols = ", ".join(_COPY_COLUMNS)
+
+    with connection.cursor() as cur:
+        cur.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS _post_copy ("
+            "reddit_id varchar(20), subreddit varchar(100), title text, body text, "
+            "created_utc timestamptz, score integer, num_comments integer, fetched_at timestamptz)"
+        )
+        cur.execute("TRUNCATE _post_copy")
+        with cur.cursor.copy(f"COPY _post_copy ({cols}) FROM STDIN") as copy:
+            for p in posts:
+                copy.write_row((
+                    p.reddit_id, p.subreddit, p.title, p.body, p.created_utc,
+                    p.score, p.num_comments, fetched_at,
+                ))
+        cur.execute(
+            f"INSERT INTO posts_post ({cols}) SELECT {cols} FROM _post_copy "
+            "ON CONFLICT (reddit_id) DO NOTHING RETURNING id, reddit_id"
+        )
+        inserted = {reddit_id: pk for pk, reddit_id in cur.fetchall()}
+
+    created = []
+    for p in posts:
+        pk = inserted.get(p.reddit_id)
+        if pk is not None:
+            p.id = pk
+            p.fetched_at = fetched_at
+            p._state.adding = False
+            created.append(p)
+    return created
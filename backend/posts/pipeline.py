@@ -0,0 +1,265 @@
+# posts/pipeline.py
+#
+# Long-running ingest pipeline (python manage.py run_pipeline):
+#
+#   fetcher (main thread)             bounded queue            matcher (worker thread)
+#   per-subreddit schedule  ──────fetch stats dicts──────▶  drain_match_queue (+ TermBucket
+#   adaptive intervals                (blocks when full)       rollups), sentiment, snapshots
+#
+# Fetching the next subreddit overlaps with matching the previous fetch. The in-memory
+# queue only wakes the matcher and carries fetch stats; the posts themselves come from the
+# durable MatchQueue table (store_posts enqueues them), so nothing is lost on a crash and
+# the matcher also picks up leftovers when idle. When the matcher falls behind, the queue
+# fills up and the fetcher blocks on put(): schedules slip instead of memory growing.
+# stop() finishes the current fetch, drains the queue, then exits.
+
+import queue
+import threading
+import time
+import traceback
+
+from django.db import OperationalError, close_old_connections, connections
+from django.utils import timezone
+
+from posts.match_queue import drain_match_queue
+from posts.models import IngestRun
+from posts.reddit_json_ingest import ingest_from_subreddit
+from posts.sentiment import run_sentiment_scoring
+from posts.services.pipeline_stats import record_fetches
+from posts.services.snapshots import publish_snapshots
+
+_STOP = object()
+IDLE_DRAIN_SECONDS = 10.0
+
+
+def _retry_locked(fn, *args, attempts: int = 3, **kwargs):
+    # SQLite fails a deferred transaction that needs to upgrade to a write lock while the
+    # other thread writes; the stages are atomic, so re-running them is safe.
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn(*args, **kwargs)
+        except OperationalError as e:
+            if "locked" not in str(e) or attempt == attempts:
+                raise
+            time.sleep(0.5 * attempt)
+
+
+class SubredditSchedule:
+    """
+    Adaptive fetch interval for one subreddit.
+    - rate: EWMA of new posts/sec between consecutive successful fetches
+    - interval aims for `target_fill` * limit new posts per fetch (a full page means we
+      may have missed posts, so it drops straight to min_interval)
+    - non-200 responses (throttling, outages) double the interval
+    """
+
+    __slots__ = ("subreddit", "interval", "min_interval", "max_interval", "rate", "last_fetch", "next_due")
+
+    def __init__(self, subreddit: str, min_interval: float, max_interval: float):
+        self.subreddit = subreddit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.rate = None
+        self.last_fetch = None
+        self.next_due = 0.0
+
+    def update(self, now: float, stats: dict, limit: int, target_fill: float = 0.5):
+        if stats["status"] != 200:
+            self.interval = min(self.max_interval, self.interval * 2)
+        else:
+            inserted = stats["posts_inserted"]
+            # The first fetch returns the backlog, not a rate sample
+            if self.last_fetch is not None:
+                observed = inserted / max(1.0, now - self.last_fetch)
+                self.rate = observed if self.rate is None else 0.3 * observed + 0.7 * self.rate
+            self.last_fetch = now
+
+            if inserted >= limit:
+                self.interval = self.min_interval
+            elif self.rate:
+                self.interval = target_fill * limit / self.rate
+            else:
+                self.interval = self.interval * 1.5
+            self.interval = min(self.max_interval, max(self.min_interval, self.interval))
+
+        self.next_due = now + self.interval
+
+
+class Pipeline:
+    def __init__(
+        self,
+        subreddits: list[str],
+        limit: int = 100,
+        min_interval: float = 30.0,
+        max_interval: float = 900.0,
+        queue_size: int = 20,
+        batch_posts: int = 500,
+        sentiment: bool = True,
+        sentiment_workers: int | None = None,
+        snapshot_interval: float = 300.0,
+    ):
+        self.limit = limit
+        self.batch_posts = batch_posts
+        self.sentiment = sentiment
+        self.sentiment_workers = sentiment_workers
+        self.snapshot_interval = snapshot_interval
+
+        self.schedules = [SubredditSchedule(sr, min_interval, max_interval) for sr in subreddits]
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.stopping = threading.Event()
+        self._matcher = threading.Thread(target=self._match_loop, name="pipeline-matcher", daemon=True)
+        self._last_snapshot = 0.0
+        self._last_drain = 0.0
+
+    def stop(self, *args):
+        # Also usable as a signal handler
+        if not self.stopping.is_set():
+            print("Stopping: finishing in-flight work...", flush=True)
+        self.stopping.set()
+
+    def run(self, run_for: float | None = None):
+        deadline = time.monotonic() + run_for if run_for else None
+        self._last_snapshot = time.monotonic()
+        self._matcher.start()
+        try:
+            self._fetch_loop(deadline)
+        finally:
+            self.stopping.set()
+            # A dead matcher never empties a full queue: only wait for a live one
+            while self._matcher.is_alive():
+                try:
+                    self.queue.put(_STOP, timeout=1.0)
+                    break
+                except queue.Full:
+                    continue
+            self._matcher.join()
+            connections.close_all()
+        print("Pipeline stopped.", flush=True)
+
+    # --- fetcher (main thread) ---
+
+    def _fetch_loop(self, deadline: float | None):
+        while not self.stopping.is_set():
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+            sched = min(self.schedules, key=lambda s: s.next_due)
+            delay = sched.next_due - time.monotonic()
+            if delay > 0:
+                # wakes early on stop()
+                self.stopping.wait(min(delay, 1.0))
+                continue
+
+            close_old_connections()
+            stats = {}
+            try:
+                _retry_locked(ingest_from_subreddit, sched.subreddit, limit=self.limit, stats=stats)
+            except OperationalError as e:
+                print(f"[{sched.subreddit}] store failed: {e}", flush=True)
+                stats.update(status=0, posts_inserted=0, post_ids=[])
+            sched.update(time.monotonic(), stats, self.limit)
+            print(
+                f"[{sched.subreddit}] next fetch in {sched.interval:.0f}s "
+                f"(rate {sched.rate or 0:.3f} posts/s, queue {self.queue.qsize()})",
+                flush=True,
+            )
+            self._enqueue(stats)
+
+    def _enqueue(self, stats: dict):
+        # Backpressure: block (re-checking stop) while the matcher is behind
+        warned = False
+        while True:
+            try:
+                self.queue.put(stats, timeout=1.0)
+                return
+            except queue.Full:
+                if not warned:
+                    print("Match queue full; pausing fetches.", flush=True)
+                    warned = True
+                if self.stopping.is_set() and not self._matcher.is_alive():
+                    return
+
+    # --- matcher (worker thread) ---
+
+    def _match_loop(self):
+        try:
+            done = False
+            while not done:
+                try:
+                    item = self.queue.get(timeout=1.0)
+                except queue.Empty:
+                    if time.monotonic() - self._last_drain >= IDLE_DRAIN_SECONDS:
+                        self._run_batch([])
+                    self._maybe_publish()
+                    continue
+                if item is _STOP:
+                    break
+
+                batch = [item]
+                n_posts = len(item["post_ids"])
+                while n_posts < self.batch_posts:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        done = True
+                        break
+                    batch.append(item)
+                    n_posts += len(item["post_ids"])
+
+                self._run_batch(batch)
+                self._maybe_publish()
+        finally:
+            connections.close_all()
+
+    def _run_batch(self, batch: list[dict]):
+        self._last_drain = time.monotonic()
+        close_old_connections()
+        try:
+            self._process(batch)
+        except Exception:
+            # Unacked MatchQueue rows are released (or their lease expires) and retried
+            traceback.print_exc()
+
+    def _process(self, batch: list[dict]):
+        started_at = timezone.now()
+        t_run = time.perf_counter()
+
+        t0 = time.perf_counter()
+        matched = _retry_locked(drain_match_queue, batch_size=self.batch_posts)
+        matching_seconds = time.perf_counter() - t0
+        if not batch and not matched["posts"]:
+            return
+
+        run = IngestRun.objects.create(
+            started_at=started_at,
+            fetch_seconds=sum(f["latency_seconds"] for f in batch),
+            matching_seconds=matching_seconds,
+            links_created=matched["links"],
+        )
+        record_fetches(run, batch)
+
+        if self.sentiment and matched["posts"]:
+            t0 = time.perf_counter()
+            _retry_locked(run_sentiment_scoring, workers=self.sentiment_workers)
+            run.sentiment_seconds = time.perf_counter() - t0
+
+        run.total_seconds = time.perf_counter() - t_run
+        run.finished_at = timezone.now()
+        run.save()
+
+    def _maybe_publish(self):
+        if not self.snapshot_interval:
+            return
+        now = time.monotonic()
+        if now - self._last_snapshot < self.snapshot_interval:
+            return
+        self._last_snapshot = now
+        close_old_connections()
+        try:
+            written = _retry_locked(publish_snapshots)
+            print(f"Published {written} snapshots.", flush=True)
+        except Exception:
+            traceback.print_exc()
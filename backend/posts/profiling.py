@@ -0,0 +1,199 @@
+# posts/profiling.py
+#
+# `--profile` for management commands (subclass ProfiledCommand instead of BaseCommand):
+#
+#   python manage.py extract_candidates --limit-posts 100000 --profile
+#   python manage.py ingest_reddit --profile cprofile --profile-top 40
+#   python manage.py rebuild_term_buckets --profile --profile-memory
+#
+# sample   : a background thread snapshots the command thread's stack every
+#            --profile-interval ms; writes <out>.collapsed (one "a;b;c count" line per
+#            stack, the input format of flamegraph.pl / speedscope / inferno) and prints
+#            the top-N functions by self and inclusive samples.
+# cprofile : deterministic cProfile; writes <out>.prof (pstats / snakeviz) and prints
+#            the top-N functions by cumulative time.
+# --profile-memory adds tracemalloc: peak traced memory and the top allocation sites.
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+_BASE = str(settings.BASE_DIR) + os.sep
+
+
+def _label(code) -> str:
+    path = code.co_filename
+    if path.startswith(_BASE):
+        path = path[len(_BASE):]
+    else:
+        # site-packages / stdlib: keep the last two components (e.g. "models/query.py")
+        path = "/".join(Path(path).parts[-2:])
+    return f"{path}:{code.co_qualname}"
+
+
+class StackSampler:
+    """
+    Wall-clock sampler for one thread (the one that creates it).
+    stacks: Counter of root-first tuples of frame labels, cut below `stop_at` (a code object)
+    so every stack starts at the profiled call.
+    """
+
+    def __init__(self, interval: float = 0.005, stop_at=None):
+        self.interval = interval
+        self.stop_at = stop_at
+        self.target = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        labels = {}
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code is self.stop_at:
+                    break
+                if code is _SAMPLER_EXIT:
+                    # the profiled call already returned and is waiting for this thread
+                    stack = []
+                    break
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _label(code)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+                self.samples += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def write_collapsed(self, path: Path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def top(self, n: int) -> str:
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+
+        total = max(1, self.samples)
+        lines = [f"{self.samples} samples @ {self.interval * 1000:.1f}ms", "", "  self%  total%  function"]
+        for label, count in self_counts.most_common(n):
+            lines.append(f"{100 * count / total:6.1f}  {100 * total_counts[label] / total:6.1f}  {label}")
+        lines += ["", "  total%  function (inclusive)"]
+        for label, count in total_counts.most_common(n):
+            lines.append(f"{100 * count / total:7.1f}  {label}")
+        return "\n".join(lines)
+
+
+_SAMPLER_EXIT = StackSampler.__exit__.__code__
+
+
+def _memory_report(snapshot, peak: int, current: int, n: int) -> str:
+    lines = [
+        f"tracemalloc: peak {peak / 1e6:.1f} MB, still allocated at exit {current / 1e6:.1f} MB",
+        "",
+        "top allocation sites still live at exit:",
+    ]
+    for stat in snapshot.statistics("lineno")[:n]:
+        frame = stat.traceback[0]
+        lines.append(f"  {stat.size / 1e6:8.2f} MB  {stat.count:>9} blocks  {frame.filename}:{frame.lineno}")
+    return "\n".join(lines)
+
+
+class ProfiledCommand(BaseCommand):
+    """
+    BaseCommand with --profile / --profile-memory options (see module comment).
+    """
+
+    def create_parser(self, prog_name, subcommand, **kwargs):
+        parser = super().create_parser(prog_name, subcommand, **kwargs)
+        self._profile_name = subcommand
+        group = parser.add_argument_group("profiling")
+        group.add_argument("--profile", nargs="?", const="sample", default=None, choices=["sample", "cprofile"],
+                           help="Profile the command (default mode: sample).")
+        group.add_argument("--profile-out", default=None,
+                           help="Output path prefix (default: profile-<command>-<timestamp> in the cwd).")
+        group.add_argument("--profile-interval", type=float, default=5.0, help="Sampling interval in ms.")
+        group.add_argument("--profile-top", type=int, default=25, help="Hotspots to print.")
+        group.add_argument("--profile-memory", action="store_true",
+                           help="Also trace allocations with tracemalloc (slow) and report peak memory.")
+        return parser
+
+    def execute(self, *args, **options):
+        # Profile handle() only, not Django's system checks / output setup
+        if options.get("profile") or options.get("profile_memory"):
+            handle = self.handle
+            self.handle = lambda *a, **kw: self._profiled(handle, *a, **kw)
+        return super().execute(*args, **options)
+
+    def _profiled(self, handle, *args, **options):
+        mode = options.get("profile")
+        memory = options.get("profile_memory")
+        name = getattr(self, "_profile_name", None) or self.__module__.rsplit(".", 1)[-1]
+        out = Path(options.get("profile_out") or f"profile-{name}-{time.strftime('%Y%m%d-%H%M%S')}")
+        top_n = options.get("profile_top") or 25
+        sampler = None
+
+        if memory:
+            tracemalloc.start()
+
+        t0 = time.perf_counter()
+        try:
+            if mode == "cprofile":
+                profiler = cProfile.Profile()
+                try:
+                    return profiler.runcall(handle, *args, **options)
+                finally:
+                    prof_path = out.with_name(out.name + ".prof")
+                    profiler.dump_stats(prof_path)
+                    buf = io.StringIO()
+                    pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(top_n)
+                    self.stderr.write(buf.getvalue())
+                    self.stderr.write(f"cProfile stats written to {prof_path}")
+            elif mode == "sample":
+                interval = max(0.1, options.get("profile_interval") or 5.0) / 1000.0
+                sampler = StackSampler(interval, stop_at=ProfiledCommand._profiled.__code__)
+                with sampler:
+                    return handle(*args, **options)
+            else:
+                return handle(*args, **options)
+        finally:
+            elapsed = time.perf_counter() - t0
+            if sampler is not None:
+                collapsed = out.with_name(out.name + ".collapsed")
+                sampler.write_collapsed(collapsed)
+                self.stderr.write(sampler.top(top_n))
+                self.stderr.write(f"Collapsed stacks written to {collapsed} (flamegraph.pl / speedscope)")
+            if memory:
+                current, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                tracemalloc.stop()
+                self.stderr.write(_memory_report(snapshot, peak, current, top_n))
+            self.stderr.write(f"Wall time {elapsed:.2f}s")
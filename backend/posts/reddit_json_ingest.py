@@ -1,7 +1,9 @@
 import time
-import requests
 from datetime import datetime, timezone
 from django.db import transaction
+from posts import pg
+from posts.dedup import mark_duplicates
+from posts.match_queue import enqueue_posts
 from posts.models import Post
 
 DEFAULT_SUBREDDITS = ["food", "Cooking", "recipes"]
@@ -14,49 +16,103 @@ HEADERS = {
 def _parse_created_utc(created_utc_value) -> datetime:
     return datetime.fromtimestamp(float(created_utc_value), tz=timezone.utc)
 
-@transaction.atomic
-def ingest_from_subreddit(subreddit: str, limit: int = 50) -> int:
-    url = f"https://www.reddit.com/r/{subreddit}/new.json?limit={limit}"
-    r = requests.get(url, headers=HEADERS, timeout=20)
-
-    if r.status_code != 200:
-        print(f"[{subreddit}] HTTP {r.status_code}")
-        return 0
-
-    data = r.json()
-    children = data.get("data", {}).get("children", [])
-
-    inserted = 0
+def store_posts(subreddit: str, children: list[dict]) -> list[Post]:
+    """
+    Bulk insert unseen posts from a listing payload (`data.children`).
+    - one query to find already-stored reddit_ids, one bulk INSERT for the rest
+    - near-duplicates of recent posts are flagged (posts.dedup)
+    - created posts are queued for matching (MatchQueue) in the same transaction
+    Returns the created Post rows (with ids).
+    """
+    candidates: dict[str, Post] = {}
     for item in children:
         d = item.get("data", {})
         reddit_id = d.get("id")
-        if not reddit_id:
-            continue
-
-        if Post.objects.filter(reddit_id=reddit_id).exists():
+        if not reddit_id or reddit_id in candidates:
             continue
 
-        created_dt = _parse_created_utc(d.get("created_utc", time.time()))
-
-        Post.objects.create(
+        candidates[reddit_id] = Post(
             reddit_id=reddit_id,
             subreddit=subreddit,
             title=d.get("title", "") or "",
             body=d.get("selftext", "") or "",
-            created_utc=created_dt,
+            created_utc=_parse_created_utc(d.get("created_utc", time.time())),
             score=int(d.get("score", 0) or 0),
             num_comments=int(d.get("num_comments", 0) or 0),
         )
-        inserted += 1
+
+    if not candidates:
+        return []
+
+    if pg.is_postgres():
+        with transaction.atomic():
+            created = pg.copy_insert_posts(list(candidates.values()))
+            mark_duplicates(created)
+            enqueue_posts(p.id for p in created)
+        return created
+
+    existing = set(
+        Post.objects.filter(reddit_id__in=list(candidates)).values_list("reddit_id", flat=True)
+    )
+    new_posts = [p for reddit_id, p in candidates.items() if reddit_id not in existing]
+    with transaction.atomic():
+        created = Post.objects.bulk_create(new_posts, batch_size=500)
+        mark_duplicates(created)
+        enqueue_posts(p.id for p in created)
+    return created
+
+def ingest_from_subreddit(subreddit: str, limit: int = 50, stats: dict | None = None) -> int:
+    """
+    Fetch r/<subreddit>/new and store unseen posts.
+    The fetch runs outside any transaction (an IMMEDIATE one would hold the SQLite write
+    lock for the whole request); only store_posts writes, in its own.
+    If `stats` is given it is filled in for IngestFetch: subreddit, status (0 = request
+    failed), latency_seconds, posts_seen, posts_inserted, post_ids.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(subreddit=subreddit, status=0, latency_seconds=0.0,
+                 posts_seen=0, posts_inserted=0, post_ids=[])
+
+    import requests  # lazy: commands that only store/match posts never load it
+
+    url = f"https://www.reddit.com/r/{subreddit}/new.json?limit={limit}"
+    t0 = time.perf_counter()
+    try:
+        r = requests.get(url, headers=HEADERS, timeout=20)
+    except requests.RequestException as e:
+        stats["latency_seconds"] = time.perf_counter() - t0
+        print(f"[{subreddit}] request failed: {e}")
+        return 0
+    stats["latency_seconds"] = time.perf_counter() - t0
+    stats["status"] = r.status_code
+
+    if r.status_code != 200:
+        print(f"[{subreddit}] HTTP {r.status_code}")
+        return 0
+
+    data = r.json()
+    children = data.get("data", {}).get("children", [])
+
+    created = store_posts(subreddit, children)
+    inserted = len(created)
+    stats.update(posts_seen=len(children), posts_inserted=inserted, post_ids=[p.id for p in created])
 
     print(f"[{subreddit}] inserted {inserted}")
     return inserted
 
-def ingest_reddit_json(subreddits=None, limit: int = 50, sleep_seconds: float = 2.0) -> int:
+def ingest_reddit_json(subreddits=None, limit: int = 50, sleep_seconds: float = 2.0,
+                       fetches: list | None = None) -> int:
+    """
+    Ingest each subreddit in turn; per-subreddit stats dicts are appended to `fetches`.
+    """
     subreddits = subreddits or DEFAULT_SUBREDDITS
     total = 0
     for sr in subreddits:
-        total += ingest_from_subreddit(sr, limit=limit)
+        stats = {}
+        total += ingest_from_subreddit(sr, limit=limit, stats=stats)
+        if fetches is not None:
+            fetches.append(stats)
         time.sleep(sleep_seconds)
     print(f"Total inserted: {total}")
-    return total
\ No newline at end of file
+    return total
@@ -0,0 +1,69 @@
+# posts/sentiment.py
+
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.utils import timezone
+
+from posts import hotstore
+from posts.models import Post
+from posts.sentiment_worker import init_worker, score_batch
+
+
+def _batches(rows, n: int):
+    for i in range(0, len(rows), n):
+        yield rows[i:i + n]
+
+
+def run_sentiment_scoring(limit: int | None = None, batch_size: int = 500, workers: int | None = None) -> int:
+    """
+    Post-processing stage (run after run_term_matching):
+    - Scores only posts where sentiment is NULL, so re-runs are cheap.
+    - Reads posts in id order chunks, scores batches in a process pool, bulk_updates results.
+    - workers=1 (or a small backlog) scores in-process; default is settings.SENTIMENT_WORKERS.
+    Returns number of posts scored.
+    """
+    workers = workers or settings.SENTIMENT_WORKERS
+    batch_size = max(1, batch_size)
+    chunk_size = batch_size * workers * 4
+
+    base_qs = Post.objects.filter(sentiment__isnull=True).order_by("id")
+
+    scored = 0
+    last_id = 0
+    pool = None
+
+    try:
+        while limit is None or scored < limit:
+            take = chunk_size if limit is None else min(chunk_size, limit - scored)
+            rows = list(
+                base_qs.filter(id__gt=last_id).values_list("id", "title", "body")[:take]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            items = [(post_id, f"{title or ''} {body or ''}".strip()) for post_id, title, body in rows]
+            batches = list(_batches(items, batch_size))
+
+            if workers > 1 and len(batches) > 1:
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+                results = [r for batch in pool.map(score_batch, batches) for r in batch]
+            else:
+                results = [r for batch in batches for r in score_batch(batch)]
+
+            scored_at = timezone.now()
+            Post.objects.bulk_update(
+                [Post(id=post_id, sentiment=compound, updated_at=scored_at) for post_id, compound in results],
+                ["sentiment", "updated_at"],
+                batch_size=batch_size,
+            )
+            hotstore.notify_sentiment(dict(results))
+            scored += len(results)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"Scored sentiment for {scored} posts.")
+    return scored
@@ -0,0 +1,22 @@
+# posts/sentiment_worker.py
+#
+# Worker-side VADER scoring. Kept free of Django imports so pool workers can start
+# with any multiprocessing start method (fork/spawn) without setting up Django.
+
+_analyzer = None
+
+
+def init_worker():
+    global _analyzer
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+    _analyzer = SentimentIntensityAnalyzer()
+
+
+def score_batch(items: list[tuple[int, str]]) -> list[tuple[int, float]]:
+    """
+    items: [(post_id, text)] -> [(post_id, compound)]
+    """
+    if _analyzer is None:
+        init_worker()
+    return [(post_id, _analyzer.polarity_scores(text)["compound"]) for post_id, text in items]
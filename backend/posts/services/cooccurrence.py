@@ -0,0 +1,134 @@
+import math
+from datetime import timedelta
+from itertools import groupby
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from posts.models import Post, PostTerm, Term, TermBucket, TermCooccurrence
+from posts.services.rollups import bulk_increment
+from posts.services.series import bucket_start
+
+RELATED_METRICS = ("pmi", "lift")
+
+
+def record_cooccurrences(posts) -> int:
+    """
+    Incrementally add co-occurrence counts for newly linked terms.
+      - posts: iterable of (post_created_utc, new_term_ids, existing_term_ids), where
+        existing_term_ids are the post's links from earlier runs (already counted together)
+    Each unordered pair with at least one new term adds 1 to (a, b, day) and (b, a, day).
+    """
+    deltas = {}
+    for created, new_ids, existing_ids in posts:
+        day = bucket_start(created, "day")
+        new_ids = set(new_ids)
+        all_ids = new_ids | set(existing_ids)
+        for a in new_ids:
+            for b in all_ids:
+                # new-new pairs once (from the smaller id), new-existing pairs once
+                if b == a or (b in new_ids and b < a):
+                    continue
+                for key in ((a, b, day), (b, a, day)):
+                    inc = deltas.setdefault(key, {"count": 0})
+                    inc["count"] += 1
+
+    return bulk_increment(TermCooccurrence, ("term_id", "other_id", "day"), deltas)
+
+
+def rebuild_cooccurrences(chunk_posts: int = 2000) -> tuple[int, int]:
+    """
+    Recompute TermCooccurrence from all PostTerm links (backfill). Caller owns the
+    transaction. Returns (posts_with_links, rows_written).
+    """
+    TermCooccurrence.objects.all().delete()
+
+    qs = (
+        PostTerm.objects
+        .order_by("post_id")
+        .values_list("post_id", "post__created_utc", "term_id")
+    )
+
+    n_posts = 0
+    rows = 0
+    chunk = []
+    for _, links in groupby(qs.iterator(chunk_size=10000), key=lambda r: r[0]):
+        links = list(links)
+        n_posts += 1
+        if len(links) > 1:
+            chunk.append((links[0][1], [term_id for _, _, term_id in links], ()))
+        if len(chunk) >= chunk_posts:
+            rows += record_cooccurrences(chunk)
+            chunk = []
+    if chunk:
+        rows += record_cooccurrences(chunk)
+    return n_posts, rows
+
+
+def get_related_terms(term_id: int, days: int = 30, limit: int = 20, min_count: int = 2, metric: str = "pmi"):
+    """
+    Terms that co-occur with `term_id` in posts of the last `days` (by post day), ranked by
+    association rather than raw count:
+      - lift = c(a,b) * N / (m(a) * m(b)), pmi = log2(lift)
+      - c from TermCooccurrence, m (posts mentioning a term) from day TermBuckets,
+        N = posts in the window
+      - pairs seen fewer than `min_count` times are dropped (PMI overrates rare pairs)
+    Returns None if the term does not exist.
+    """
+    if metric not in RELATED_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+
+    term = Term.objects.filter(id=term_id).only("id", "text").first()
+    if term is None:
+        return None
+
+    now = timezone.now()
+    start = bucket_start(now - timedelta(days=days), "day")
+
+    pairs = dict(
+        TermCooccurrence.objects
+        .filter(term_id=term_id, day__gte=start, other__is_active=True)
+        .values("other_id")
+        .annotate(n=Sum("count"))
+        .filter(n__gte=max(1, min_count))
+        .order_by()
+        .values_list("other_id", "n")
+    )
+
+    results = []
+    if pairs:
+        mentions = dict(
+            TermBucket.objects
+            .filter(term_id__in=[term_id, *pairs], bucket="day", start__gte=start)
+            .values("term_id")
+            .annotate(n=Sum("mentions"))
+            .order_by()
+            .values_list("term_id", "n")
+        )
+        texts = dict(Term.objects.filter(id__in=list(pairs)).values_list("id", "text"))
+        n_posts = Post.objects.filter(created_utc__gte=start).count()
+        m_a = mentions.get(term_id, 0)
+
+        for other_id, c in pairs.items():
+            m_b = mentions.get(other_id, 0)
+            if not (m_a and m_b and n_posts):
+                continue
+            lift = c * n_posts / (m_a * m_b)
+            results.append({
+                "term_id": other_id,
+                "term": texts.get(other_id, ""),
+                "cooccurrences": c,
+                "mentions": m_b,
+                "lift": round(lift, 4),
+                "pmi": round(math.log2(lift), 4),
+            })
+        results.sort(key=lambda r: (r[metric], r["cooccurrences"]), reverse=True)
+
+    return {
+        "term_id": term.id,
+        "term": term.text,
+        "days": days,
+        "metric": metric,
+        "min_count": min_count,
+        "results": results[:limit],
+    }
@@ -0,0 +1,83 @@
+from django.utils import timezone
+
+from posts import pg
+from posts.models import PostTerm
+from posts.perf import add_rows, stage
+from posts.services.search import search_posts
+from posts.services.singleflight import single_flight
+from posts.services.trending import _add_term_match, _match_contrib, _rank_terms, _window_bounds
+from posts.trending_cuisines import _add_origin_match, _rank_origins
+
+
+@single_flight
+def get_dashboard(
+    days: int = 7,
+    limit: int = 20,
+    cuisine_limit: int = 12,
+    q: str = "",
+    search_days: int = 30,
+    search_limit: int = 30,
+    term_text: str | None = None,
+    half_life_days: float = 2.5,
+    a: float = 0.25,
+    b: float = 0.15,
+):
+    """
+    Everything the dashboard needs in one call:
+      - trending terms + trending cuisines from ONE shared PostTerm scan of the window
+        (same scoring as get_trending_terms / get_trending_cuisines)
+      - search results, only when q is given
+    """
+    now = timezone.now()
+    window_start, last_24h_start, prev_24h_start = _window_bounds(now, days)
+
+    qs = (
+        PostTerm.objects
+        .select_related("term", "post")
+        .filter(post__created_utc__gte=window_start, term__is_active=True)
+        .only(
+            "term_id", "post_id",
+            "post__created_utc", "post__score", "post__num_comments", "post__subreddit", "post__sentiment",
+            "term__text", "term__cultural_origin"
+        )
+    )
+
+    by_term = {}
+    by_origin = {}
+
+    if pg.is_postgres():
+        # Two GROUP BYs in SQL beat shipping every link to Python for one shared scan
+        with stage("dashboard.aggregate"):
+            args = (now, window_start, last_24h_start, prev_24h_start, half_life_days, a, b)
+            by_term = pg.aggregate_terms(*args)
+            by_origin = pg.aggregate_origins(*args)
+    else:
+        with stage("dashboard.scan"):
+            for pt in qs.iterator():
+                post = pt.post
+                created = post.created_utc
+                contrib = _match_contrib(
+                    now, created, post.score or 0, post.num_comments or 0,
+                    half_life_days, a, b,
+                )
+                _add_term_match(
+                    by_term, pt.term_id, pt.term.text, created, contrib,
+                    last_24h_start, prev_24h_start, sentiment=post.sentiment,
+                )
+                _add_origin_match(
+                    by_origin, pt.term.cultural_origin or "other", pt.term_id, post.subreddit,
+                    created, contrib, last_24h_start, prev_24h_start,
+                )
+
+    add_rows("dashboard.scan", sum(d["mentions"] for d in by_term.values()))
+
+    search = []
+    if (q or "").strip():
+        search = search_posts(q=q, days=search_days, limit=search_limit, term_text=term_text)
+
+    with stage("dashboard.rank"):
+        return {
+            "trends": _rank_terms(by_term, limit),
+            "cuisines": _rank_origins(by_origin, cuisine_limit),
+            "search": search,
+        }
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from posts.models import IngestFetch, IngestRun
+
+
+def record_fetches(run: IngestRun, fetches: list[dict]):
+    """
+    Store per-subreddit stats dicts (from ingest_from_subreddit) and roll totals onto the run.
+    """
+    IngestFetch.objects.bulk_create([
+        IngestFetch(
+            run=run,
+            subreddit=f["subreddit"],
+            status=f["status"],
+            latency_seconds=f["latency_seconds"],
+            posts_seen=f["posts_seen"],
+            posts_inserted=f["posts_inserted"],
+        )
+        for f in fetches
+    ])
+    run.posts_seen = sum(f["posts_seen"] for f in fetches)
+    run.posts_inserted = sum(f["posts_inserted"] for f in fetches)
+
+
+def _percentiles(values: list[float]) -> dict:
+    # nearest-rank percentiles; None when there are no samples
+    if not values:
+        return {"n": 0, "p50": None, "p90": None, "p99": None, "max": None}
+    values = sorted(values)
+    n = len(values)
+
+    def pct(p):
+        return round(values[min(n - 1, max(0, -(-p * n // 100) - 1))], 4)
+
+    return {"n": n, "p50": pct(50), "p90": pct(90), "p99": pct(99), "max": round(values[-1], 4)}
+
+
+def get_pipeline_stats(days: int = 7) -> dict:
+    """
+    Run history summary for the last `days`:
+    - per subreddit: fetch latency percentiles, HTTP status counts, posts seen/inserted
+    - matching: duration percentiles, links created, links/sec
+    - runs: count, unfinished (crashed or still running), total duration percentiles
+    """
+    since = timezone.now() - timedelta(days=days)
+
+    by_sub: dict[str, dict] = {}
+    fetch_rows = (
+        IngestFetch.objects
+        .filter(run__started_at__gte=since)
+        .values_list("subreddit", "status", "latency_seconds", "posts_seen", "posts_inserted")
+    )
+    for subreddit, status, latency, seen, inserted in fetch_rows:
+        d = by_sub.setdefault(subreddit, {"latencies": [], "statuses": {}, "posts_seen": 0, "posts_inserted": 0})
+        d["latencies"].append(latency)
+        d["statuses"][str(status)] = d["statuses"].get(str(status), 0) + 1
+        d["posts_seen"] += seen
+        d["posts_inserted"] += inserted
+
+    subreddits = []
+    for subreddit, d in sorted(by_sub.items()):
+        errors = sum(n for status, n in d["statuses"].items() if status != "200")
+        subreddits.append({
+            "subreddit": subreddit,
+            "latency_seconds": _percentiles(d["latencies"]),
+            "statuses": d["statuses"],
+            "error_rate": round(errors / len(d["latencies"]), 4),
+            "posts_seen": d["posts_seen"],
+            "posts_inserted": d["posts_inserted"],
+        })
+
+    runs = list(
+        IngestRun.objects
+        .filter(started_at__gte=since)
+        .values_list("finished_at", "matching_seconds", "links_created", "total_seconds")
+    )
+    finished = [r for r in runs if r[0] is not None]
+    matching = [r[1] for r in finished if r[1] is not None]
+    links = sum(r[2] for r in finished)
+
+    return {
+        "days": days,
+        "runs": {
+            "count": len(runs),
+            "unfinished": len(runs) - len(finished),
+            "total_seconds": _percentiles([r[3] for r in finished if r[3] is not None]),
+        },
+        "matching": {
+            "seconds": _percentiles(matching),
+            "links_created": links,
+            "links_per_second": round(links / sum(matching), 2) if sum(matching) else None,
+        },
+        "subreddits": subreddits,
+    }
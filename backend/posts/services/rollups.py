@@ -0,0 +1,56 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+
+def bulk_increment(model, key_fields: tuple[str, ...], deltas: dict, batch_size: int = 500) -> int:
+    """
+    Add counters onto rollup rows, creating missing ones.
+      - deltas: {(key values...): {counter_field: delta}}
+      - existing rows are fetched with one __in filter per key field (superset), then
+        incremented with F() expressions in bulk_update (safe under concurrent writers)
+      - a unique-key race on create is retried once the other writer has committed its row
+    Returns number of rows touched.
+    """
+    if not deltas:
+        return 0
+
+    counter_fields = sorted({f for d in deltas.values() for f in d})
+
+    for attempt in range(3):
+        try:
+            with transaction.atomic():
+                _apply_increments(model, key_fields, counter_fields, deltas, batch_size)
+            return len(deltas)
+        except IntegrityError:
+            if attempt == 2:
+                raise
+    return len(deltas)
+
+
+def _apply_increments(model, key_fields, counter_fields, deltas, batch_size):
+    filters = {
+        f"{field}__in": {key[i] for key in deltas}
+        for i, field in enumerate(key_fields)
+    }
+    existing = {}
+    for row in model.objects.filter(**filters).only("pk", *key_fields):
+        existing[tuple(getattr(row, f) for f in key_fields)] = row
+
+    to_update = []
+    to_create = []
+    for key, inc in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            to_create.append(model(
+                **dict(zip(key_fields, key)),
+                **{f: inc.get(f, 0) for f in counter_fields},
+            ))
+        else:
+            for f in counter_fields:
+                setattr(row, f, F(f) + inc.get(f, 0))
+            to_update.append(row)
+
+    if to_update:
+        model.objects.bulk_update(to_update, counter_fields, batch_size=batch_size)
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=batch_size)
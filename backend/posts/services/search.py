@@ -3,13 +3,17 @@ import re
 from datetime import timedelta
 from django.utils import timezone
 
+from posts import hotstore, pg
 from posts.models import Post, PostTerm, Term
+from posts.perf import add_rows, stage
+from posts.services.singleflight import single_flight
 
 _WORD_RE = re.compile(r"[a-z0-9]+")
 
 def _tokens(s: str) -> set[str]:
     return set(_WORD_RE.findall((s or "").lower()))
 
+@single_flight
 def search_posts(
     q: str,
     days: int = 30,
@@ -43,45 +47,61 @@ def search_posts(
         except Term.DoesNotExist:
             return []
 
-        post_ids = PostTerm.objects.filter(term=term).values_list("post_id", flat=True)
-        posts_qs = posts_qs.filter(id__in=post_ids)
+        store = hotstore.get_store(days)
+        hot_ids = store.term_post_ids(term.id, now, days) if store is not None else None
+        if hot_ids is not None and len(hot_ids) <= hotstore.SEARCH_MAX_IDS:
+            # Candidate ids straight from the hot window (no PostTerm subquery)
+            posts_qs = posts_qs.filter(id__in=hot_ids.tolist())
+        else:
+            post_ids = PostTerm.objects.filter(term=term).values_list("post_id", flat=True)
+            posts_qs = posts_qs.filter(id__in=post_ids)
+
+    if pg.is_postgres():
+        # tsvector GIN index narrows to posts containing any query token; scoring below is unchanged
+        posts_qs = pg.filter_search_candidates(posts_qs, query_tokens)
 
     def decay(age_days: float) -> float:
         return math.exp(-math.log(2) * age_days / half_life_days)
 
     ranked = []
-
-    for p in posts_qs.iterator():
-        title_tokens = _tokens(p.title)
-        body_tokens = _tokens(p.body)
-
-        title_hits = len(query_tokens & title_tokens)
-        body_hits = len(query_tokens & body_tokens)
-
-        if title_hits == 0 and body_hits == 0:
-            continue
-
-        age_days = max(0.0, (now - p.created_utc).total_seconds() / 86400.0)
-        rec = decay(age_days)
-
-        score = p.score or 0
-        comments = p.num_comments or 0
-        engagement = math.log1p(score) + 0.5 * math.log1p(comments)
-
-        text_score = (2.0 * title_hits) + (1.0 * body_hits)
-        final = rec * (text_score + 0.2 * engagement)
-
-        ranked.append({
-            "reddit_id": p.reddit_id,
-            "title": p.title,
-            "subreddit": p.subreddit,
-            "created_utc": p.created_utc.isoformat(),
-            "score": score,
-            "num_comments": comments,
-            "rank_score": round(final, 6),
-            "title_hits": title_hits,
-            "body_hits": body_hits,
-        })
-
-    ranked.sort(key=lambda x: x["rank_score"], reverse=True)
+    scanned = 0
+
+    with stage("search.scan"):
+        for p in posts_qs.iterator():
+            scanned += 1
+            title_tokens = _tokens(p.title)
+            body_tokens = _tokens(p.body)
+
+            title_hits = len(query_tokens & title_tokens)
+            body_hits = len(query_tokens & body_tokens)
+
+            if title_hits == 0 and body_hits == 0:
+                continue
+
+            age_days = max(0.0, (now - p.created_utc).total_seconds() / 86400.0)
+            rec = decay(age_days)
+
+            score = max(p.score or 0, 0)
+            comments = max(p.num_comments or 0, 0)
+            engagement = math.log1p(score) + 0.5 * math.log1p(comments)
+
+            text_score = (2.0 * title_hits) + (1.0 * body_hits)
+            final = rec * (text_score + 0.2 * engagement)
+
+            ranked.append({
+                "reddit_id": p.reddit_id,
+                "title": p.title,
+                "subreddit": p.subreddit,
+                "created_utc": p.created_utc.isoformat(),
+                "score": score,
+                "num_comments": comments,
+                "rank_score": round(final, 6),
+                "title_hits": title_hits,
+                "body_hits": body_hits,
+            })
+
+    add_rows("search.scan", scanned)
+
+    with stage("search.rank"):
+        ranked.sort(key=lambda x: x["rank_score"], reverse=True)
     return ranked[:limit]
\ No newline at end of file
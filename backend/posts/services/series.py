@@ -0,0 +1,93 @@
+from datetime import timedelta
+from django.utils import timezone
+
+from posts.models import Term, TermBucket
+from posts.services.rollups import bulk_increment
+
+BUCKET_STEPS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+# Keep series payloads bounded (hour: 30 days, day: ~1 year)
+MAX_POINTS = {
+    "hour": 24 * 30,
+    "day": 366,
+}
+
+
+def bucket_start(dt, bucket: str):
+    if bucket == "hour":
+        return dt.replace(minute=0, second=0, microsecond=0)
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def record_link_buckets(links) -> int:
+    """
+    Incrementally add new PostTerm links to the hour + day buckets.
+      - links: iterable of (term_id, post_created_utc, post_score, post_num_comments)
+    Only call this for links that were actually created, so re-matching never double counts.
+    """
+    deltas = {}
+    for term_id, created, score, comments in links:
+        for bucket in BUCKET_STEPS:
+            key = (term_id, bucket, bucket_start(created, bucket))
+            inc = deltas.setdefault(key, {"mentions": 0, "score_sum": 0, "comments_sum": 0})
+            inc["mentions"] += 1
+            inc["score_sum"] += score or 0
+            inc["comments_sum"] += comments or 0
+
+    return bulk_increment(TermBucket, ("term_id", "bucket", "start"), deltas)
+
+
+def get_term_series(term_ids: list[int], bucket: str = "day", days: int = 7):
+    """
+    Dense mention/engagement series for one or more terms, read from TermBucket only
+    (one indexed query, no PostTerm scan). Missing buckets are zero-filled.
+    """
+    if bucket not in BUCKET_STEPS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+
+    step = BUCKET_STEPS[bucket]
+    now = timezone.now()
+    end = bucket_start(now, bucket)
+    start = bucket_start(now - timedelta(days=days), bucket)
+    n_points = min(MAX_POINTS[bucket], int((end - start) / step) + 1)
+    start = end - step * (n_points - 1)
+
+    index = {start + step * i: i for i in range(n_points)}
+
+    terms = dict(Term.objects.filter(id__in=term_ids).values_list("id", "text"))
+
+    series = {}
+    for term_id in term_ids:
+        if term_id in terms and term_id not in series:
+            series[term_id] = {
+                "term_id": term_id,
+                "term": terms[term_id],
+                "mentions": [0] * n_points,
+                "score": [0] * n_points,
+                "comments": [0] * n_points,
+            }
+
+    rows = (
+        TermBucket.objects
+        .filter(term_id__in=list(series), bucket=bucket, start__gte=start)
+        .values_list("term_id", "start", "mentions", "score_sum", "comments_sum")
+    )
+    for term_id, bstart, mentions, score_sum, comments_sum in rows:
+        i = index.get(bstart)
+        if i is None:
+            continue
+        s = series[term_id]
+        s["mentions"][i] = mentions
+        s["score"][i] = score_sum
+        s["comments"][i] = comments_sum
+
+    return {
+        "bucket": bucket,
+        "start": start.isoformat(),
+        "step_seconds": int(step.total_seconds()),
+        "points": n_points,
+        "series": list(series.values()),
+    }
@@ -0,0 +1,142 @@
+"""
+Single-flight wrapper for expensive ranking computations.
+
+Concurrent calls with identical (normalized) arguments wait for one in-flight computation
+and all get its result. Within a process this uses a lock + event per key. Across
+processes it is opt-in: set SINGLE_FLIGHT_LOCK_DIR and callers serialize on a per-key
+file lock; whoever waited on the lock reuses the JSON result written while it waited
+(a result file older than the wait is stale and ignored). A caller that waits longer
+than SINGLE_FLIGHT_LOCK_TIMEOUT computes without the lock. Every caller gets its own
+copy of the result, so callers may annotate it.
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread-level coalescing only
+    fcntl = None
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_calls: dict = {}
+_calls_lock = threading.Lock()
+
+
+def _normalized_key(fn, sig, args, kwargs):
+    bound = sig.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return (fn.__module__, fn.__qualname__, tuple(sorted(bound.arguments.items())))
+
+
+def _lock_paths(lock_dir: Path, key) -> tuple[Path, Path]:
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return lock_dir / f"{digest}.lock", lock_dir / f"{digest}.json"
+
+
+def _flock(fh, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+
+def _write_result(result_path: Path, result):
+    try:
+        tmp_path = result_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(result), encoding="utf-8")
+        os.replace(tmp_path, result_path)
+    except (TypeError, ValueError, OSError):
+        pass  # not JSON-serializable / disk issue: other processes just recompute
+
+
+def _compute_across_processes(key, fn, args, kwargs):
+    lock_dir = getattr(settings, "SINGLE_FLIGHT_LOCK_DIR", None)
+    if not lock_dir or fcntl is None:
+        return fn(*args, **kwargs)
+
+    lock_dir = Path(lock_dir)
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    lock_path, result_path = _lock_paths(lock_dir, key)
+
+    waiting_since = time.time_ns()
+    with open(lock_path, "a+") as fh:
+        if not _flock(fh, getattr(settings, "SINGLE_FLIGHT_LOCK_TIMEOUT", 30.0)):
+            # holder is stuck or very slow: do not queue behind it
+            return fn(*args, **kwargs)
+        try:
+            # Another process finished this computation while we waited -> reuse it
+            try:
+                if os.stat(result_path).st_mtime_ns >= waiting_since:
+                    with open(result_path, encoding="utf-8") as rf:
+                        return json.load(rf)
+            except (FileNotFoundError, ValueError):
+                pass
+
+            result = fn(*args, **kwargs)
+            _write_result(result_path, result)
+            return result
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def single_flight(fn):
+    """
+    Decorator: coalesce concurrent identical calls of `fn` into one computation.
+    """
+    sig = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = _normalized_key(fn, sig, args, kwargs)
+
+        with _calls_lock:
+            call = _calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                _calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = _compute_across_processes(key, fn, args, kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with _calls_lock:
+                _calls.pop(key, None)
+            call.done.set()
+
+        # call.result stays pristine for the waiters still copying it
+        return copy.deepcopy(call.result)
+
+    return wrapper
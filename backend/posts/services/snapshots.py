@@ -0,0 +1,79 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+
+from posts import hotstore
+from posts.models import TrendSnapshot
+from posts.services.dashboard import get_dashboard
+from posts.services.trending import get_trending_terms
+from posts.trending_cuisines import get_trending_cuisines
+
+
+def publish_snapshots(days_presets: list[int] | None = None) -> int:
+    """
+    Compute + store leaderboard snapshots for each preset window.
+      - terms and cuisines for the same window come from one shared scan (get_dashboard)
+      - rows are upserted per (kind, days)
+    Returns number of snapshots written.
+    """
+    days_presets = days_presets or settings.TREND_SNAPSHOT_DAYS
+    terms_limit = settings.TREND_SNAPSHOT_TERMS_LIMIT
+    cuisines_limit = settings.TREND_SNAPSHOT_CUISINES_LIMIT
+
+    written = 0
+    for days in days_presets:
+        computed_at = timezone.now()
+        data = get_dashboard(days=days, limit=terms_limit, cuisine_limit=cuisines_limit)
+
+        for kind, limit, results in (
+            ("terms", terms_limit, data["trends"]),
+            ("cuisines", cuisines_limit, data["cuisines"]),
+        ):
+            TrendSnapshot.objects.update_or_create(
+                kind=kind,
+                days=days,
+                defaults={"limit": limit, "results": results, "computed_at": computed_at},
+            )
+            written += 1
+
+    return written
+
+
+def get_snapshot(kind: str, days: int, limit: int):
+    """
+    Snapshot results for (kind, days) sliced to `limit`, or None when there is no fresh
+    snapshot that covers the request, or when the hot store covers `days`: it is as
+    cheap to read and current to the last sync, where a snapshot can be hours old.
+    """
+    if hotstore.enabled() and days <= settings.HOT_STORE_DAYS:
+        return None
+
+    snap = (
+        TrendSnapshot.objects
+        .filter(kind=kind, days=days, limit__gte=limit)
+        .only("results", "computed_at")
+        .first()
+    )
+    if snap is None:
+        return None
+
+    max_age = timedelta(seconds=settings.TREND_SNAPSHOT_MAX_AGE_SECONDS)
+    if snap.computed_at < timezone.now() - max_age:
+        return None
+
+    return snap.results[:limit]
+
+
+def get_terms_leaderboard(days: int = 7, limit: int = 20, dedupe: bool = False):
+    # Snapshots are published without dedupe
+    results = None if dedupe else get_snapshot("terms", days, limit)
+    if results is None:
+        results = get_trending_terms(days=days, limit=limit, dedupe=dedupe)
+    return results
+
+
+def get_cuisines_leaderboard(days: int = 7, limit: int = 12, dedupe: bool = False):
+    results = None if dedupe else get_snapshot("cuisines", days, limit)
+    if results is None:
+        results = get_trending_cuisines(days=days, limit=limit, dedupe=dedupe)
+    return results
@@ -0,0 +1,172 @@
+import csv
+from pathlib import Path
+
+from django.db import transaction
+from django.utils import timezone
+
+from posts.models import Term
+
+ORIGIN_KEYS = {key for key, _ in Term.ORIGINS}
+_TEXT_MAX = Term._meta.get_field("text").max_length
+_UPDATE_FIELDS = ["is_active", "cultural_origin", "origin_confidence", "updated_at"]
+
+
+def normalize_term(text: str) -> str:
+    return (text or "").strip().lower()
+
+
+def read_term_file(path: Path) -> tuple[dict[str, str | None], dict[str, int]]:
+    """
+    Read a vocabulary file once.
+      - .csv: header row with `text` (or `term`) and optional `cultural_origin`
+      - anything else: one term per line, # comments
+    Returns ({text: cultural_origin or None}, skipped counts). A term listed twice keeps
+    its last row.
+    """
+    skipped = {"blank": 0, "comment": 0, "duplicate": 0, "too_long": 0, "bad_origin": 0}
+    rows: dict[str, str | None] = {}
+
+    def add(raw_text, raw_origin=None):
+        text = normalize_term(raw_text)
+        if not text:
+            skipped["blank"] += 1
+            return
+        if text.startswith("#"):
+            skipped["comment"] += 1
+            return
+        if len(text) > _TEXT_MAX:
+            skipped["too_long"] += 1
+            return
+        origin = normalize_term(raw_origin) or None
+        if origin is not None and origin not in ORIGIN_KEYS:
+            skipped["bad_origin"] += 1
+            return
+        if text in rows:
+            skipped["duplicate"] += 1
+        rows[text] = origin
+
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            reader = csv.DictReader(f)
+            fields = {name.strip().lower(): name for name in reader.fieldnames or ()}
+            text_col = fields.get("text") or fields.get("term")
+            if text_col is None:
+                raise ValueError(f"{path}: CSV needs a 'text' (or 'term') column")
+            origin_col = fields.get("cultural_origin")
+            for row in reader:
+                add(row.get(text_col), row.get(origin_col) if origin_col else None)
+        else:
+            for line in f:
+                add(line)
+
+    return rows, skipped
+
+
+def diff_terms(
+    rows: dict[str, str | None],
+    is_active: bool = True,
+    update_active: bool = True,
+    deactivate_missing: bool = False,
+) -> dict:
+    """
+    Compare {text: cultural_origin or None} with the Term table (one query).
+      - new texts are created with `is_active`
+      - update_active: existing terms are switched to `is_active` (reactivated /
+        deactivated); otherwise their flag is left alone
+      - an origin in the file relabels the term (origin_confidence 1.0, a manual label)
+      - deactivate_missing: active terms absent from the file are deactivated
+    Returns {"is_active", "create": [(text, origin)], "unchanged": n,
+    "update": [(term_id, text, {field: (old, new)}, (is_active, origin, confidence))]}.
+    """
+    existing = {
+        text: (term_id, active, origin, confidence)
+        for term_id, text, active, origin, confidence in (
+            Term.objects.values_list("id", "text", "is_active", "cultural_origin", "origin_confidence")
+        )
+    }
+
+    create = []
+    update = []
+    unchanged = 0
+
+    def change(term_id, text, current, new):
+        fields = {
+            name: (old, value)
+            for name, old, value in zip(("is_active", "cultural_origin", "origin_confidence"), current, new)
+            if old != value
+        }
+        if not fields:
+            return False
+        update.append((term_id, text, fields, new))
+        return True
+
+    for text, origin in sorted(rows.items()):
+        row = existing.get(text)
+        if row is None:
+            create.append((text, origin))
+            continue
+        term_id, *current = row
+        active, cur_origin, confidence = current
+        new_active = is_active if update_active else active
+        new_origin, new_confidence = (origin, 1.0) if origin else (cur_origin, confidence)
+        if not change(term_id, text, current, (new_active, new_origin, new_confidence)):
+            unchanged += 1
+
+    if deactivate_missing:
+        for text, (term_id, active, origin, confidence) in sorted(existing.items()):
+            if active and text not in rows:
+                change(term_id, text, (active, origin, confidence), (False, origin, confidence))
+
+    return {"is_active": is_active, "create": create, "update": update, "unchanged": unchanged}
+
+
+def apply_term_diff(diff: dict, batch_size: int = 1000) -> tuple[int, int]:
+    """
+    Write a diff_terms() result with bulk_create / bulk_update in chunks, in one
+    transaction. updated_at is set explicitly (bulk_update skips auto_now), so the
+    compiled term index sees the change. Returns (created, updated).
+    """
+    now = timezone.now()
+    is_active = diff["is_active"]
+    to_create = [
+        Term(
+            text=text,
+            is_active=is_active,
+            cultural_origin=origin or "other",
+            origin_confidence=1.0 if origin else 0.0,
+        )
+        for text, origin in diff["create"]
+    ]
+    to_update = [
+        Term(id=term_id, is_active=active, cultural_origin=origin, origin_confidence=confidence, updated_at=now)
+        for term_id, _, _, (active, origin, confidence) in diff["update"]
+    ]
+
+    with transaction.atomic():
+        Term.objects.bulk_create(to_create, batch_size=batch_size)
+        Term.objects.bulk_update(to_update, _UPDATE_FIELDS, batch_size=batch_size)
+    return len(to_create), len(to_update)
+
+
+def format_term_diff(diff: dict) -> list[str]:
+    """
+    One line per change: "+ text (state, origin)" for creates, "~ text: field old -> new, ..."
+    for updates.
+    """
+    state = "active" if diff["is_active"] else "inactive"
+    lines = [f"+ {text} ({state}{', ' + origin if origin else ''})" for text, origin in diff["create"]]
+    for _, text, fields, _ in diff["update"]:
+        parts = ", ".join(f"{name} {old} -> {new}" for name, (old, new) in fields.items())
+        lines.append(f"~ {text}: {parts}")
+    return lines
+
+
+def summarize_term_diff(diff: dict) -> dict[str, int]:
+    counts = {"created": len(diff["create"]), "reactivated": 0, "deactivated": 0, "relabeled": 0,
+              "unchanged": diff["unchanged"]}
+    for _, _, fields, _ in diff["update"]:
+        if "is_active" in fields:
+            counts["reactivated" if fields["is_active"][1] else "deactivated"] += 1
+        if "cultural_origin" in fields or "origin_confidence" in fields:
+            counts["relabeled"] += 1
+    return counts
@@ -1,9 +1,12 @@
 import math
 from datetime import timedelta
-from django.db.models import F
+from django.db.models import F, Min, Q
 from django.utils import timezone
 
-from posts.models import PostTerm, Term
+from posts.models import Post, PostTerm, Term
+from posts import hotstore, pg
+from posts.perf import add_rows, stage
+from posts.services.singleflight import single_flight
 
 
 def _decay_weight(age_days: float, half_life_days: float) -> float:
@@ -12,78 +15,78 @@ def _decay_weight(age_days: float, half_life_days: float) -> float:
     return math.exp(-math.log(2) * age_days / half_life_days)
 
 
-def get_trending_terms(
-    days: int = 7,
-    limit: int = 20,
-    half_life_days: float = 2.5,
-    a: float = 0.25,
-    b: float = 0.15,
-):
+def _window_bounds(now, days: int):
     """
-    Returns ranked terms with:
-      - trend_score (mentions + engagement + recency)
-      - mentions in window
-      - spike ratio (last 24h vs prev 24h)
+    (window_start, last_24h_start, prev_24h_start) for a trend window ending at `now`.
     """
-    now = timezone.now()
-    window_start = now - timedelta(days=days)
-    last_24h_start = now - timedelta(hours=24)
-    prev_24h_start = now - timedelta(hours=48)
+    return (
+        now - timedelta(days=days),
+        now - timedelta(hours=24),
+        now - timedelta(hours=48),
+    )
 
-    # Pull matches in the window
-    qs = (
-        PostTerm.objects
-        .select_related("term", "post")
-        .filter(post__created_utc__gte=window_start, term__is_active=True)
-        .only(
-            "term_id", "post_id",
-            "post__created_utc", "post__score", "post__num_comments",
-            "term__text"
-        )
+
+def _counted_once(window_start) -> Q:
+    """
+    PostTerm filter for dedupe: one post per near-duplicate cluster in the window.
+    - cluster roots (dup_of NULL); their in-window duplicates are dropped
+    - for a cluster whose root is older than window_start, its first in-window duplicate
+      (lowest id, i.e. first ingested) stands in for it
+    """
+    representatives = (
+        Post.objects
+        .filter(created_utc__gte=window_start, dup_of__created_utc__lt=window_start)
+        .values("dup_of_id")
+        .annotate(first_id=Min("id"))
+        .order_by()
+        .values("first_id")
     )
+    return Q(post__dup_of__isnull=True) | Q(post_id__in=representatives)
 
-    # Aggregate in Python (SQLite-friendly; avoids DB-specific funcs)
-    by_term = {}
 
-    for pt in qs.iterator():
-        term_id = pt.term_id
-        term_text = pt.term.text
+def _match_contrib(now, created, score: int, comments: int, half_life_days: float, a: float, b: float) -> float:
+    # One PostTerm match: decayed (1 + engagement) weight; downvoted posts (negative
+    # score) get no engagement, as in posts.pg and the hot store
+    age_days = max(0.0, (now - created).total_seconds() / 86400.0)
+    decay = _decay_weight(age_days, half_life_days)
+    return decay * (1.0 + a * math.log1p(max(score, 0)) + b * math.log1p(max(comments, 0)))
 
-        post = pt.post
-        created = post.created_utc
-        age_days = max(0.0, (now - created).total_seconds() / 86400.0)
-        decay = _decay_weight(age_days, half_life_days)
 
-        score = post.score or 0
-        comments = post.num_comments or 0
+def _add_term_match(by_term, term_id, term_text, created, contrib, last_24h_start, prev_24h_start, sentiment=None):
+    if term_id not in by_term:
+        by_term[term_id] = {
+            "term": term_text,
+            "trend_score": 0.0,
+            "mentions": 0,
+            "recent_24h": 0,
+            "prev_24h": 0,
+            "sentiment_sum": 0.0,
+            "sentiment_n": 0,
+        }
 
-        engagement = math.log1p(score) + 0.5 * math.log1p(comments)
-        contrib = decay * (1.0 + a * math.log1p(score) + b * math.log1p(comments))
+    bucket = by_term[term_id]
+    bucket["trend_score"] += contrib
+    bucket["mentions"] += 1
 
-        if term_id not in by_term:
-            by_term[term_id] = {
-                "term": term_text,
-                "trend_score": 0.0,
-                "mentions": 0,
-                "recent_24h": 0,
-                "prev_24h": 0,
-            }
+    if sentiment is not None:
+        bucket["sentiment_sum"] += sentiment
+        bucket["sentiment_n"] += 1
 
-        bucket = by_term[term_id]
-        bucket["trend_score"] += contrib
-        bucket["mentions"] += 1
+    if created >= last_24h_start:
+        bucket["recent_24h"] += 1
+    elif created >= prev_24h_start:
+        bucket["prev_24h"] += 1
 
-        if created >= last_24h_start:
-            bucket["recent_24h"] += 1
-        elif created >= prev_24h_start:
-            bucket["prev_24h"] += 1
 
+def _rank_terms(by_term, limit: int):
     # Add spike ratio + sort
     results = []
     for term_id, data in by_term.items():
         recent = data["recent_24h"]
         prev = data["prev_24h"]
         spike = (recent + 1) / (prev + 1)  # smoothing
+        scored = data["sentiment_n"]
+        sentiment = round(data["sentiment_sum"] / scored, 4) if scored else None
 
         results.append({
             "term_id": term_id,
@@ -93,7 +96,78 @@ def get_trending_terms(
             "recent_24h": recent,
             "prev_24h": prev,
             "spike": round(spike, 4),
+            "sentiment": sentiment,  # mean VADER compound of scored posts (None if none scored)
         })
 
     results.sort(key=lambda x: x["trend_score"], reverse=True)
-    return results[:limit]
\ No newline at end of file
+    return results[:limit]
+
+
+@single_flight
+def get_trending_terms(
+    days: int = 7,
+    limit: int = 20,
+    half_life_days: float = 2.5,
+    a: float = 0.25,
+    b: float = 0.15,
+    dedupe: bool = False,
+):
+    """
+    Returns ranked terms with:
+      - trend_score (mentions + engagement + recency)
+      - mentions in window
+      - spike ratio (last 24h vs prev 24h)
+      - sentiment (mean stored VADER compound; see posts.sentiment)
+    dedupe=True counts each near-duplicate cluster once (posts.dedup; see _counted_once).
+    """
+    now = timezone.now()
+    window_start, last_24h_start, prev_24h_start = _window_bounds(now, days)
+
+    # The hot store has no duplicate flags; dedupe reads the DB
+    store = None if dedupe else hotstore.get_store(days)
+    if store is not None:
+        with stage("trending.aggregate"):
+            by_term = store.aggregate_terms(now, days, half_life_days, a, b)
+        with stage("trending.rank"):
+            return _rank_terms(by_term, limit)
+
+    if pg.is_postgres():
+        with stage("trending.aggregate"):
+            by_term = pg.aggregate_terms(
+                now, window_start, last_24h_start, prev_24h_start, half_life_days, a, b, dedupe=dedupe,
+            )
+        with stage("trending.rank"):
+            return _rank_terms(by_term, limit)
+
+    # Pull matches in the window
+    qs = (
+        PostTerm.objects
+        .select_related("term", "post")
+        .filter(post__created_utc__gte=window_start, term__is_active=True)
+        .only(
+            "term_id", "post_id",
+            "post__created_utc", "post__score", "post__num_comments", "post__sentiment",
+            "term__text"
+        )
+    )
+    if dedupe:
+        qs = qs.filter(_counted_once(window_start))
+
+    # Aggregate in Python (SQLite-friendly; Postgres aggregates in SQL above)
+    by_term = {}
+
+    with stage("trending.scan"):
+        for pt in qs.iterator():
+            post = pt.post
+            contrib = _match_contrib(
+                now, post.created_utc, post.score or 0, post.num_comments or 0,
+                half_life_days, a, b,
+            )
+            _add_term_match(
+                by_term, pt.term_id, pt.term.text, post.created_utc, contrib,
+                last_24h_start, prev_24h_start, sentiment=post.sentiment,
+            )
+    add_rows("trending.scan", sum(d["mentions"] for d in by_term.values()))
+
+    with stage("trending.rank"):
+        return _rank_terms(by_term, limit)
@@ -0,0 +1,244 @@
+# posts/term_index.py
+#
+# Compiled term vocabulary for run_term_matching, persisted to TERM_INDEX_DIR and
+# memory-mapped, so a matching job does not rebuild dicts from the Term table on start.
+#
+# File: term-index-v<FORMAT_VERSION>-<fingerprint>.bin
+#   header   magic, format version, entry count, delete-key count, blob length,
+#            fuzzy minimum token length
+#   entries  fixed-width records sorted by first-token hash:
+#            (crc32 of first token, token count, term_id, text offset, text length)
+#            exact term texts plus their inflections (posts.term_variants)
+#   deletes  same record shape, sorted by crc32 of a SymSpell delete key; text is the
+#            term word the key came from (single-word terms only)
+#   blob     normalized term texts ("tom yum", "ramen"), utf-8
+#
+# The fingerprint comes from one aggregate over active Terms (count, id sum, max id,
+# max updated_at) plus the stop list, so a changed vocabulary gets a new file and stale
+# files are never read. Opening an index is a header read + np.frombuffer over the mmap:
+# nothing is materialized per term. Matching hashes the post's tokens, finds candidate
+# entries with one vectorized searchsorted, and confirms hits against the stored text
+# (which also rules out crc32 collisions). Tokens of at least `fuzzy_min_len` characters
+# that are not vocabulary words, nor inflected forms of one, are then looked up by their
+# delete keys and accepted within one edit of a term word with the same first letter,
+# unless the edit only swaps a word ending (posts.term_variants); results are cached
+# per token, so repeated words cost a dict lookup.
+
+import mmap
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from posts.term_variants import delete_keys, inflection_stems, other_word_form, within_one_edit
+
+FORMAT_VERSION = 2
+_MAGIC = b"FTTI"
+_HEADER = struct.Struct("<4sIIIII")
+_ENTRY = np.dtype([
+    ("first", "<u4"),
+    ("ntok", "<u4"),
+    ("term_id", "<i8"),
+    ("off", "<u4"),
+    ("len", "<u4"),
+])
+_FUZZY_CACHE_SIZE = 100_000
+
+
+def _hash(token: str) -> int:
+    return zlib.crc32(token.encode("utf-8"))
+
+
+class TermIndex:
+    """
+    Read-only view over one index file (see module comment).
+    match(tokens) -> set of term ids whose text occurs as a contiguous token run.
+    """
+
+    __slots__ = (
+        "fingerprint", "path", "size", "fuzzy_min_len", "_mm", "_entries", "_first",
+        "_deletes", "_delete_first", "_blob_start", "_texts", "_fuzzy",
+    )
+
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n, n_deletes, _, fuzzy_min_len = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path}: not a v{FORMAT_VERSION} term index")
+        self.size = n
+        self.fuzzy_min_len = fuzzy_min_len
+        offset = _HEADER.size
+        self._entries = np.frombuffer(self._mm, dtype=_ENTRY, count=n, offset=offset)
+        offset += n * _ENTRY.itemsize
+        self._deletes = np.frombuffer(self._mm, dtype=_ENTRY, count=n_deletes, offset=offset)
+        self._first = self._entries["first"]
+        self._delete_first = self._deletes["first"]
+        self._blob_start = offset + n_deletes * _ENTRY.itemsize
+        # decoded texts seen so far (only hash hits get here), fuzzy results per token
+        self._texts: dict[int, str] = {}
+        self._fuzzy: dict[str, tuple[int, ...]] = {}
+
+    def _text(self, off: int, length: int) -> str:
+        text = self._texts.get(off)
+        if text is None:
+            start = self._blob_start + off
+            text = self._texts[off] = self._mm[start:start + length].decode("utf-8")
+        return text
+
+    def match(self, tokens: list[str]) -> set[int]:
+        matched: set[int] = set()
+        if not self.size or not tokens:
+            return matched
+
+        hashes = np.fromiter((_hash(t) for t in tokens), dtype=np.uint32, count=len(tokens))
+        lo = np.searchsorted(self._first, hashes, side="left")
+        hi = np.searchsorted(self._first, hashes, side="right")
+
+        entries = self._entries
+        known: set[str] = set()
+        for pos in np.flatnonzero(hi > lo).tolist():
+            for i in range(int(lo[pos]), int(hi[pos])):
+                e = entries[i]
+                ntok = int(e["ntok"])
+                if pos + ntok > len(tokens):
+                    continue
+                span = tokens[pos] if ntok == 1 else " ".join(tokens[pos:pos + ntok])
+                if span == self._text(int(e["off"]), int(e["len"])):
+                    matched.add(int(e["term_id"]))
+                    if ntok == 1:
+                        known.add(span)
+
+        if len(self._deletes) and self.fuzzy_min_len:
+            for token in set(tokens):
+                if len(token) >= self.fuzzy_min_len and token not in known:
+                    matched.update(self._fuzzy_match(token))
+        return matched
+
+    def _is_word(self, word: str) -> bool:
+        # word is a single-token vocabulary entry (term text or inflection)
+        h = _hash(word)
+        lo = int(np.searchsorted(self._first, h, side="left"))
+        hi = int(np.searchsorted(self._first, h, side="right"))
+        return any(
+            int(self._entries[i]["ntok"]) == 1
+            and self._text(int(self._entries[i]["off"]), int(self._entries[i]["len"])) == word
+            for i in range(lo, hi)
+        )
+
+    def _fuzzy_match(self, token: str) -> tuple[int, ...]:
+        hit = self._fuzzy.get(token)
+        if hit is not None:
+            return hit
+
+        found = set()
+        # "smoked" next to a "smoke" term is that word's past tense, not a typo
+        if not any(self._is_word(stem) for stem in inflection_stems(token)):
+            keys = delete_keys(token)
+            hashes = np.fromiter((_hash(k) for k in keys), dtype=np.uint32, count=len(keys))
+            lo = np.searchsorted(self._delete_first, hashes, side="left")
+            hi = np.searchsorted(self._delete_first, hashes, side="right")
+
+            for k in np.flatnonzero(hi > lo).tolist():
+                for i in range(int(lo[k]), int(hi[k])):
+                    e = self._deletes[i]
+                    word = self._text(int(e["off"]), int(e["len"]))
+                    # misspellings rarely change the first letter; this keeps e.g. "baking" off "making"
+                    if (word[0] == token[0] and within_one_edit(token, word)
+                            and not other_word_form(token, word)):
+                        found.add(int(e["term_id"]))
+
+        if len(self._fuzzy) >= _FUZZY_CACHE_SIZE:
+            self._fuzzy.clear()
+        hit = self._fuzzy[token] = tuple(sorted(found))
+        return hit
+
+
+def write_index(path: Path, entries: list[tuple[str, int]], fuzzy_words: list[tuple[str, int]],
+                fuzzy_min_len: int):
+    """
+    Compile [(normalized_text, term_id)] entries and [(word, term_id)] fuzzy words into
+    `path` (written to a temp file, then renamed).
+    """
+    blob = bytearray()
+    offsets: dict[str, tuple[int, int]] = {}
+
+    def text_ref(text: str) -> tuple[int, int]:
+        ref = offsets.get(text)
+        if ref is None:
+            data = text.encode("utf-8")
+            ref = offsets[text] = (len(blob), len(data))
+            blob.extend(data)
+        return ref
+
+    records = []
+    for text, term_id in entries:
+        tokens = text.split(" ")
+        records.append((_hash(tokens[0]), len(tokens), term_id, *text_ref(text)))
+
+    delete_records = []
+    for word, term_id in fuzzy_words:
+        ref = text_ref(word)
+        for key in delete_keys(word):
+            delete_records.append((_hash(key), 1, term_id, *ref))
+
+    table = np.array(records, dtype=_ENTRY)
+    table.sort(order=["first", "ntok", "term_id"], kind="stable")
+    deletes = np.unique(np.array(delete_records, dtype=_ENTRY))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, len(table), len(deletes), len(blob), fuzzy_min_len))
+        f.write(table.tobytes())
+        f.write(deletes.tobytes())
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+_cache: TermIndex | None = None
+_cache_lock = threading.Lock()
+
+
+def _index_dir() -> Path:
+    return Path(getattr(settings, "TERM_INDEX_DIR", None) or Path(settings.BASE_DIR) / "cache")
+
+
+def get_term_index(fingerprint: str, vocabulary) -> TermIndex:
+    """
+    The index for `fingerprint`: this process's open copy, else the file on disk, else
+    built from `vocabulary()`, a callable returning the write_index() arguments
+    (entries, fuzzy_words, fuzzy_min_len).
+    """
+    global _cache
+    index = _cache
+    if index is not None and index.fingerprint == fingerprint:
+        return index
+
+    with _cache_lock:
+        if _cache is not None and _cache.fingerprint == fingerprint:
+            return _cache
+
+        directory = _index_dir()
+        path = directory / f"term-index-v{FORMAT_VERSION}-{fingerprint}.bin"
+        if not path.exists():
+            write_index(path, *vocabulary())
+            # Older vocabularies are never read again
+            for old in directory.glob("term-index-v*.bin"):
+                if old != path:
+                    old.unlink(missing_ok=True)
+
+        try:
+            _cache = TermIndex(path, fingerprint)
+        except FileNotFoundError:
+            # Removed by a process that saw a newer vocabulary in between; rebuild ours
+            write_index(path, *vocabulary())
+            _cache = TermIndex(path, fingerprint)
+        return _cache
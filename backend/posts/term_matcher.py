@@ -1,10 +1,21 @@
 # posts/term_matcher.py
 
+import hashlib
 import re
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, Max, Sum
 from django.utils import timezone
 
+from posts.alerts import schedule_alerts
 from posts.models import Post, Term, PostTerm
+from posts.perf import add_rows, stage
+from posts.services.cooccurrence import record_cooccurrences
+from posts.services.series import record_link_buckets
+from posts.term_index import get_term_index
+from posts.term_variants import expand_variants
 
 _WORD_RE = re.compile(r"[a-z0-9]+")
 
@@ -31,16 +42,16 @@ def _term_ok(t: str) -> bool:
         return False
     return True
 
-def _build_term_index():
+def _exact_vocabulary() -> list[tuple[str, int]]:
     """
-    Build term index for fast matching.
-    - single_terms: dict[word -> term_id]
-    - phrase_terms: list[(normalized_phrase, term_id)] longest-first
+    Matchable vocabulary as (normalized_text, term_id):
+    - single words: lowercased text (one Term per word, the last by id wins)
+    - phrases: space-normalized tokens, matched as a contiguous token run
     """
     single_terms: dict[str, int] = {}
     phrase_terms: list[tuple[str, int]] = []
 
-    for term in Term.objects.filter(is_active=True).only("id", "text"):
+    for term in Term.objects.filter(is_active=True).order_by("id").only("id", "text"):
         raw = (term.text or "").strip()
         if not raw:
             continue
@@ -48,12 +59,50 @@ def _build_term_index():
             continue
 
         if " " in raw:
-            phrase_terms.append((_norm(raw), term.id))
+            phrase = _norm(raw)
+            if phrase:
+                phrase_terms.append((phrase, term.id))
         else:
             single_terms[raw.lower()] = term.id
 
-    phrase_terms.sort(key=lambda x: len(x[0]), reverse=True)
-    return single_terms, phrase_terms
+    return list(single_terms.items()) + phrase_terms
+
+def _vocabulary():
+    """
+    Index contents (posts.term_index.write_index arguments):
+    - entries: exact vocabulary + inflections (posts.term_variants), if TERM_MATCH_VARIANTS
+    - fuzzy_words: single words of at least TERM_FUZZY_MIN_LEN chars (0 turns fuzzy off)
+    """
+    entries = _exact_vocabulary()
+    if settings.TERM_MATCH_VARIANTS:
+        entries += [(v, term_id) for v, term_id in expand_variants(entries) if " " in v or _term_ok(v)]
+
+    min_len = settings.TERM_FUZZY_MIN_LEN
+    fuzzy_words = [
+        (text, term_id) for text, term_id in entries
+        if min_len and len(text) >= min_len and _WORD_RE.fullmatch(text)
+    ]
+    return entries, fuzzy_words, min_len
+
+def _vocabulary_fingerprint() -> str:
+    # One aggregate query; changes whenever an active Term is added, removed,
+    # (de)activated or edited (updated_at), or when STOP_TERMS / variant settings change
+    agg = Term.objects.filter(is_active=True).aggregate(
+        n=Count("id"), id_sum=Sum("id"), id_max=Max("id"), updated=Max("updated_at"),
+    )
+    updated = agg["updated"].isoformat() if agg["updated"] else ""
+    raw = (
+        f"{agg['n']}|{agg['id_sum']}|{agg['id_max']}|{updated}|{','.join(sorted(STOP_TERMS))}|"
+        f"{settings.TERM_MATCH_VARIANTS}|{settings.TERM_FUZZY_MIN_LEN}"
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+def _build_term_index():
+    """
+    Compiled term index (posts.term_index): memory-mapped from TERM_INDEX_DIR, rebuilt
+    only when the active vocabulary changes.
+    """
+    return get_term_index(_vocabulary_fingerprint(), _vocabulary)
 
 @transaction.atomic
 def run_term_matching(posts_qs=None, limit: int | None = 500, force: bool = False):
@@ -64,7 +113,8 @@ def run_term_matching(posts_qs=None, limit: int | None = 500, force: bool = Fals
     - If force=True, it will re-process posts (useful when you updated STOP_TERMS/Terms).
     - Uses limit to keep it fast (defaults to latest 500).
     """
-    single_terms, phrase_terms = _build_term_index()
+    with stage("matching.index"):
+        index = _build_term_index()
 
     posts = posts_qs if posts_qs is not None else Post.objects.all()
 
@@ -77,40 +127,53 @@ def run_term_matching(posts_qs=None, limit: int | None = 500, force: bool = Fals
 
     created_links = 0
     processed_posts = 0
+    new_links = []  # (term_id, created_utc, score, num_comments) for rollups
+    new_pairs = []  # (created_utc, new_term_ids, existing_term_ids) for co-occurrence
     now = timezone.now()
 
-    for post in posts.iterator():
-        processed_posts += 1
-
-        hay = _norm(f"{post.title} {post.body}")
-        if not hay:
+    with stage("matching.scan"):
+        for post in posts.iterator():
+            processed_posts += 1
+
+            hay = _norm(f"{post.title} {post.body}")
+            if not hay:
+                post.term_matched_at = now
+                post.save(update_fields=["term_matched_at"])
+                continue
+
+            # Single words and phrases (contiguous token runs)
+            matched_term_ids = index.match(hay.split())
+
+            # Create links
+            created_ids = set()
+            for term_id in matched_term_ids:
+                _, created = PostTerm.objects.get_or_create(post=post, term_id=term_id)
+                if created:
+                    created_links += 1
+                    created_ids.add(term_id)
+                    new_links.append((term_id, post.created_utc, post.score, post.num_comments))
+
+            if created_ids:
+                existing_ids = matched_term_ids - created_ids
+                if force:
+                    # re-matching: links from earlier runs may include terms not matched now
+                    existing_ids = set(post.term_links.values_list("term_id", flat=True)) - created_ids
+                new_pairs.append((post.created_utc, created_ids, existing_ids))
+
+            # Mark as processed (even if no terms matched)
             post.term_matched_at = now
             post.save(update_fields=["term_matched_at"])
-            continue
 
-        tok_set = set(hay.split())
-        matched_term_ids: set[int] = set()
-
-        # Phrase matches (space-normalized boundaries)
-        padded = f" {hay} "
-        for phrase_norm, term_id in phrase_terms:
-            if f" {phrase_norm} " in padded:
-                matched_term_ids.add(term_id)
-
-        # Single word matches (set intersection)
-        if single_terms:
-            for w in (tok_set & set(single_terms.keys())):
-                matched_term_ids.add(single_terms[w])
-
-        # Create links
-        for term_id in matched_term_ids:
-            _, created = PostTerm.objects.get_or_create(post=post, term_id=term_id)
-            if created:
-                created_links += 1
-
-        # Mark as processed (even if no terms matched)
-        post.term_matched_at = now
-        post.save(update_fields=["term_matched_at"])
+    add_rows("matching.scan", processed_posts)
+
+    # Keep TermBucket rollups and co-occurrence counts in step with the links (same transaction)
+    with stage("matching.rollups"):
+        record_link_buckets(new_links)
+        record_cooccurrences(new_pairs)
+
+    # Alert rules for terms whose last-24h buckets just moved (evaluated after commit)
+    recent = now - timedelta(hours=24)
+    schedule_alerts({term_id for term_id, created, _, _ in new_links if created >= recent})
 
     print(f"Processed {processed_posts} posts. Created {created_links} term links.")
     return created_links
\ No newline at end of file
@@ -0,0 +1,130 @@
+# posts/term_variants.py
+#
+# Variant expansion for the compiled term index (posts.term_index):
+#
+# - inflections: singular <-> plural of a single word, or of a phrase's last word
+#   ("dumpling" <-> "dumplings", "curry" <-> "curries", "soup dumpling" -> "soup
+#   dumplings"). The rules are an S-stemmer run in both directions, so every surface
+#   form is precomputed and matching stays an exact lookup.
+# - misspellings: SymSpell-style delete keys (the word plus every one-character deletion).
+#   A post token matches when it shares a delete key with a term word and the
+#   Damerau-Levenshtein (optimal string alignment) distance is <= 1. One edit inside a
+#   word ending is a different word form, not a typo ("cooked" is not "cooker"), and a
+#   token that is an inflected form of a vocabulary word ("smoked" with a "smoke" term)
+#   is never fuzzy-matched.
+#
+# Exact term texts always win: a variant that is another term's text, or that two terms
+# both produce, is dropped.
+
+_SIBILANT = ("s", "x", "z", "ch", "sh")
+_VOWELS = set("aeiou")
+# English inflectional / derivational endings, longest first
+_ENDINGS = ("ing", "est", "ed", "er", "es", "ly", "s")
+
+
+def plural_forms(word: str) -> set[str]:
+    if len(word) < 3:
+        return set()
+    if word.endswith("y") and word[-2] not in _VOWELS:
+        return {word[:-1] + "ies"}
+    if word.endswith(_SIBILANT):
+        return {word + "es"}
+    if word.endswith("o"):
+        return {word + "s", word + "es"}
+    if word.endswith("fe"):
+        return {word + "s", word[:-2] + "ves"}
+    if word.endswith("f"):
+        return {word + "s", word[:-1] + "ves"}
+    return {word + "s"}
+
+
+def singular_forms(word: str) -> set[str]:
+    if len(word) < 4 or not word.endswith("s") or word.endswith(("ss", "us", "is")):
+        return set()
+    # Ambiguous endings keep both readings ("cookies" -> cookie / cooky); the unused one
+    # never occurs in text
+    if word.endswith("ies"):
+        return {word[:-3] + "y", word[:-1]}
+    if word.endswith("ves"):
+        return {word[:-3] + "f", word[:-3] + "fe", word[:-1]}
+    if word.endswith("oes") or word.endswith(tuple(s + "es" for s in _SIBILANT)):
+        return {word[:-2], word[:-1]}
+    return {word[:-1]}
+
+
+def inflections(text: str) -> set[str]:
+    """
+    Other inflected forms of a normalized single word or phrase (last word varies).
+    """
+    head, _, last = text.rpartition(" ")
+    prefix = f"{head} " if head else ""
+    # a word that reads as a plural is only singularized ("tacos" -> "taco", not "tacoses")
+    forms = singular_forms(last) or plural_forms(last)
+    forms.discard(last)
+    return {prefix + f for f in forms}
+
+
+def expand_variants(entries: list[tuple[str, int]]) -> list[tuple[str, int]]:
+    """
+    [(normalized_text, term_id)] -> additional (variant_text, term_id) entries.
+    """
+    exact = {text for text, _ in entries}
+    owners: dict[str, set[int]] = {}
+    for text, term_id in entries:
+        for form in inflections(text):
+            if form not in exact:
+                owners.setdefault(form, set()).add(term_id)
+    return sorted((form, next(iter(ids))) for form, ids in owners.items() if len(ids) == 1)
+
+
+def delete_keys(word: str) -> set[str]:
+    # The word and all its one-character deletions (edit distance 1)
+    keys = {word}
+    for i in range(len(word)):
+        keys.add(word[:i] + word[i + 1:])
+    return keys
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """
+    Optimal string alignment distance(a, b) <= 1: one insertion, deletion,
+    substitution or adjacent transposition.
+    """
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    if la > lb:
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+def inflection_stems(token: str) -> set[str]:
+    """
+    Candidate base words of a token read as base + ending: "smoked" -> smok / smoke,
+    "chopped" -> chopp / chop. Stems shorter than 3 characters are not produced.
+    """
+    stems = set()
+    for ending in _ENDINGS:
+        stem = token[:-len(ending)]
+        if token.endswith(ending) and len(stem) >= 3:
+            stems.update((stem, stem + "e"))
+            if stem[-1] == stem[-2] and stem[-1] not in _VOWELS:
+                stems.add(stem[:-1])
+    return stems
+
+
+def other_word_form(token: str, word: str) -> bool:
+    # token is word's stem plus a different ending: "cooked" vs "cooker", "roasts" vs "roaster"
+    return any(
+        token.endswith(ending) and word.startswith(token[:-len(ending)]) and len(token) > len(ending) + 2
+        for ending in _ENDINGS
+    )
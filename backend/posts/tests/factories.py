@@ -0,0 +1,96 @@
+import itertools
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.test import override_settings
+from django.utils import timezone
+
+from posts.models import Post, PostTerm, Term
+
+_ids = itertools.count(1)
+
+# Compiled term indexes built by tests stay out of the repo's cache directory
+isolated_term_index = override_settings(TERM_INDEX_DIR=tempfile.mkdtemp(prefix="foodtrend-test-index-"))
+
+
+def make_post(title: str, hours_ago: float = 1.0, subreddit: str = "food", **fields) -> Post:
+    fields.setdefault("created_utc", timezone.now() - timedelta(hours=hours_ago))
+    return Post.objects.create(reddit_id=f"t{next(_ids)}", subreddit=subreddit, title=title, **fields)
+
+
+def make_terms(*texts: str, **fields) -> list[Term]:
+    return [Term.objects.create(text=text, **fields) for text in texts]
+
+
+def make_trend_corpus():
+    """
+    Posts and links covering every branch of the trend aggregation:
+    - an inactive term, a term with a blank origin next to an explicit "other" one
+    - unscored sentiment (NULL), negative scores, missing comments
+    - posts in the last 24h, the 24h before, the rest of a 7-day window and outside it
+    - a duplicate cluster whose root predates the window, reposted twice inside it
+    """
+    ramen, tacos, kimchi, pho, sushi = make_terms("ramen", "tacos", "kimchi", "pho", "sushi")
+    Term.objects.filter(id=ramen.id).update(cultural_origin="japanese")
+    Term.objects.filter(id=sushi.id).update(cultural_origin="japanese", is_active=False)
+    Term.objects.filter(id=tacos.id).update(cultural_origin="mexican")
+    Term.objects.filter(id=kimchi.id).update(cultural_origin="")
+    # pho keeps the default "other"
+
+    rows = [
+        # hours ago, subreddit, score, comments, sentiment, terms
+        (0.5, "food", 120, 14, 0.6, [ramen, tacos]),
+        (3, "Cooking", -4, 0, None, [ramen, kimchi]),
+        (20, "recipes", 8, 2, -0.3, [pho, sushi]),
+        (30, "food", 0, 0, None, [kimchi, pho]),
+        (45, "KoreanFood", 55, 9, 0.1, [kimchi, ramen]),
+        (80, "food", 3, 1, 0.9, [tacos]),
+        (150, "ramen", 900, 230, None, [ramen, sushi]),
+        (200, "food", 10, 5, 0.2, [ramen, tacos]),  # outside a 7-day window
+    ]
+    posts = []
+    for hours_ago, subreddit, score, comments, sentiment, terms in rows:
+        post = make_post(
+            f"{' '.join(t.text for t in terms)} post", hours_ago=hours_ago, subreddit=subreddit,
+            score=score, num_comments=comments, sentiment=sentiment,
+        )
+        PostTerm.objects.bulk_create([PostTerm(post=post, term=t) for t in terms])
+        posts.append(post)
+    # two reposts of the pre-window post
+    for hours_ago, subreddit in ((10, "Cooking"), (4, "recipes")):
+        repost = make_post("ramen tacos post", hours_ago=hours_ago, subreddit=subreddit, dup_of=posts[-1])
+        PostTerm.objects.bulk_create([PostTerm(post=repost, term=t) for t in (ramen, tacos)])
+
+
+def orm_aggregates(now, days: int = 7, **kwargs) -> tuple[dict, dict]:
+    """
+    (by_term, by_origin) from the SQLite / Python scan of get_trending_terms and
+    get_trending_cuisines at `now`, before ranking. Distinct sets become counts, as in
+    posts.pg and the hot store.
+    """
+    from posts import hotstore, pg, trending_cuisines
+    from posts.services import trending
+
+    with (
+        mock.patch.object(pg, "is_postgres", return_value=False),
+        mock.patch.object(hotstore, "get_store", return_value=None),
+        mock.patch.object(trending, "_rank_terms", side_effect=lambda by_term, limit: by_term),
+        mock.patch.object(trending_cuisines, "_rank_origins", side_effect=lambda by_origin, limit: by_origin),
+        mock.patch("django.utils.timezone.now", return_value=now),
+    ):
+        by_term = trending.get_trending_terms(days=days, **kwargs)
+        by_origin = trending_cuisines.get_trending_cuisines(days=days, **kwargs)
+
+    for data in by_origin.values():
+        data["unique_terms"] = len(data["unique_terms"])
+        data["unique_subreddits"] = len(data["unique_subreddits"])
+    return by_term, by_origin
+
+
+def rounded(aggregates: dict, places: int = 6) -> dict:
+    # Float sums differ in the last bits between SQL, numpy and Python
+    return {
+        key: {k: round(v, places) if isinstance(v, float) else v for k, v in data.items()}
+        for key, data in aggregates.items()
+    }
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from posts import alerts
+from posts.alerts import find_alerts, fire_alerts
+from posts.models import Alert, Term, TermBucket
+from posts.tests.factories import make_terms
+
+# a quarter past the hour: the current hour bucket is partial
+NOW = datetime(2026, 3, 10, 12, 15, tzinfo=dt_timezone.utc)
+END = NOW.replace(minute=0)
+
+ZSCORE_RULE = {"name": "term_zscore", "scope": "term", "metric": "zscore", "threshold": 4.0, "min_mentions": 10}
+
+
+@override_settings(ALERT_BASELINE_DAYS=14, ALERT_SINKS=[], ALERT_COOLDOWN_SECONDS=6 * 60 * 60)
+class AlertWindowTests(TestCase):
+    def setUp(self):
+        (self.term,) = make_terms("birria", cultural_origin="mexican")
+        patcher = mock.patch.dict(alerts._baseline, {"end": None, "hours": {}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _hours(self, mentions_by_offset: dict, term=None):
+        # hour buckets `offset` hours before the current hour (0 = current, partial)
+        for offset, mentions in mentions_by_offset.items():
+            TermBucket.objects.update_or_create(
+                term=term or self.term, bucket="hour", start=END - timedelta(hours=offset),
+                defaults={"mentions": mentions},
+            )
+
+    def _flat(self, per_hour=1, term=None):
+        self._hours({o: per_hour for o in range(1, 24 * 15 + 1)}, term)
+
+    @override_settings(ALERT_RULES=[{"name": "all", "scope": "term", "metric": "zscore", "threshold": -100}])
+    def test_partial_hour_does_not_bias_flat_series(self):
+        self._flat()
+
+        (hit,) = find_alerts([self.term.id], now=NOW)
+
+        # 23 closed hours + 3/4 of the hour 24h back + nothing yet in the current hour
+        self.assertEqual(hit["recent_24h"], round(23.75))
+        self.assertAlmostEqual(hit["value"], -0.25, places=4)
+
+    @override_settings(ALERT_RULES=[ZSCORE_RULE])
+    def test_burst_fires_once_then_cools_down(self):
+        self._flat()
+        self._hours({0: 5, 1: 30})
+
+        (hit,) = find_alerts([self.term.id], now=NOW)
+        self.assertEqual(hit["rule"], "term_zscore")
+        self.assertEqual(hit["window_start"], END)
+        self.assertEqual(len(fire_alerts([hit], now=NOW)), 1)
+
+        # same hour window: deduplicated; later hours inside the cooldown: quiet
+        self.assertEqual(fire_alerts(find_alerts([self.term.id], now=NOW), now=NOW), [])
+        for hours_later in (1, 5):
+            later = NOW + timedelta(hours=hours_later)
+            hits = find_alerts([self.term.id], now=later)
+            self.assertEqual(len(hits), 1)
+            self.assertEqual(fire_alerts(hits, now=later), [])
+
+        later = NOW + timedelta(hours=7)
+        self.assertEqual(len(fire_alerts(find_alerts([self.term.id], now=later), now=later)), 1)
+        self.assertEqual(Alert.objects.count(), 2)
+
+    @override_settings(ALERT_RULES=[{**ZSCORE_RULE, "scope": "cuisine", "name": "cuisine_zscore"}])
+    def test_cuisine_baseline_is_read_once_per_hour(self):
+        (other,) = make_terms("pozole", cultural_origin="mexican")
+        self._flat()
+        self._flat(term=other)
+        self._hours({1: 40}, term=other)
+
+        with mock.patch.object(alerts, "_bucket_rows", wraps=alerts._bucket_rows) as reads:
+            (hit,) = find_alerts([self.term.id], now=NOW)
+            find_alerts([other.id], now=NOW + timedelta(minutes=20))
+
+        self.assertEqual(hit["key"], "mexican")
+        # two flat terms at 23.75 each (as above) plus the burst
+        self.assertEqual(hit["recent_24h"], round(2 * 23.75 + 39))
+        # baseline once, then only the recent hours on each batch
+        self.assertEqual(len(reads.call_args_list), 3)
+
+
+def failing_sink(alerts):
+    raise RuntimeError("webhook down")
+
+
+recorded = []
+
+
+def recording_sink(alerts):
+    recorded.extend(a.rule for a in alerts)
+
+
+@override_settings(
+    ALERT_BASELINE_DAYS=14, ALERT_COOLDOWN_SECONDS=6 * 60 * 60,
+    ALERT_RULES=[{"name": "term_spike", "scope": "term", "metric": "spike", "threshold": 3.0, "min_mentions": 10}],
+)
+class AlertRuleTests(TestCase):
+    def setUp(self):
+        self.birria, self.pozole = make_terms("birria", "pozole")
+        patcher = mock.patch.dict(alerts._baseline, {"end": None, "hours": {}})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        recorded.clear()
+
+    def _hours(self, term, mentions_by_offset: dict):
+        TermBucket.objects.bulk_create([
+            TermBucket(term=term, bucket="hour", start=END - timedelta(hours=offset), mentions=mentions)
+            for offset, mentions in mentions_by_offset.items()
+        ])
+
+    def test_spike_and_min_mentions(self):
+        self._hours(self.birria, {2: 12, 30: 2})  # 12 vs 2: spike 13/3
+        self._hours(self.pozole, {2: 8, 30: 0})  # spike 9, but under min_mentions
+
+        (hit,) = find_alerts([self.birria.id, self.pozole.id], now=NOW)
+
+        self.assertEqual((hit["key"], hit["label"]), (str(self.birria.id), "birria"))
+        self.assertEqual((hit["recent_24h"], hit["prev_24h"]), (12, 2))
+        self.assertAlmostEqual(hit["value"], 13 / 3, places=4)
+
+    def test_inactive_and_unscoped_terms_are_skipped(self):
+        self._hours(self.birria, {2: 12})
+        Term.objects.filter(id=self.birria.id).update(is_active=False)
+
+        self.assertEqual(find_alerts([self.birria.id], now=NOW), [])
+        # the rule set has no cuisine scope: origins are not read at all
+        with mock.patch.object(alerts, "_bucket_rows", wraps=alerts._bucket_rows) as reads:
+            find_alerts([self.pozole.id], now=NOW)
+        self.assertEqual({c.args[0] for c in reads.call_args_list}, {"term"})
+
+    @override_settings(ALERT_SINKS=[f"{__name__}.failing_sink", f"{__name__}.recording_sink"])
+    def test_failing_sink_does_not_stop_the_others(self):
+        self._hours(self.birria, {2: 12})
+
+        with self.assertLogs("posts.alerts", "ERROR"):
+            (alert,) = fire_alerts(find_alerts([self.birria.id], now=NOW), now=NOW)
+
+        self.assertEqual(recorded, ["term_spike"])
+        alert.refresh_from_db()
+        self.assertEqual(alert.delivered, {
+            f"{__name__}.failing_sink": "error: webhook down",
+            f"{__name__}.recording_sink": "ok",
+        })
+
+    @override_settings(ALERT_SINKS=[f"{__name__}.recording_sink"])
+    def test_one_alert_per_rule_key_and_window(self):
+        self._hours(self.birria, {2: 12})
+        hits = find_alerts([self.birria.id], now=NOW)
+
+        # no cooldown: only the unique (rule, key, window) row keeps the second one out
+        with self.settings(ALERT_COOLDOWN_SECONDS=0):
+            first = fire_alerts(hits, now=NOW)
+            second = fire_alerts(hits, now=NOW + timedelta(seconds=1))
+
+        self.assertEqual((len(first), second), (1, []))
+        self.assertEqual(recorded, ["term_spike"])
+
+    @override_settings(ALERTS=True, ALERT_SINKS=[])
+    def test_evaluated_on_commit(self):
+        self._hours(self.birria, {0: 12})
+
+        with mock.patch.object(alerts, "evaluate_alerts") as evaluate, self.captureOnCommitCallbacks(execute=True):
+            alerts.schedule_alerts({self.birria.id})
+            evaluate.assert_not_called()
+
+        evaluate.assert_called_once_with({self.birria.id})
@@ -0,0 +1,26 @@
+import asyncio
+import json
+import threading
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+
+from posts import async_views
+
+
+class AsyncViewsTests(SimpleTestCase):
+    def test_scoring_runs_on_the_pool_once_per_request(self):
+        threads = []
+
+        def leaderboard(days, limit, dedupe):
+            threads.append(threading.current_thread().name)
+            return [{"term": "ramen", "days": days, "limit": limit}]
+
+        request = RequestFactory().get("/api/trends/", {"days": 3, "limit": 5})
+        with mock.patch.object(async_views, "get_terms_leaderboard", side_effect=leaderboard):
+            response = asyncio.run(async_views.api_trends(request))
+
+        payload = json.loads(response.content)
+        self.assertEqual(payload["results"], [{"term": "ramen", "days": 3, "limit": 5}])
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("scoring"))
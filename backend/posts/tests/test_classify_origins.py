@@ -0,0 +1,72 @@
+import contextlib
+import io
+import random
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import Term
+from posts.term_matcher import run_term_matching
+from posts.tests.factories import isolated_term_index, make_post, make_terms
+
+ORIGINS = ["japanese", "mexican", "italian"]
+
+
+@isolated_term_index
+class ClassifyOriginsTests(TestCase):
+    """
+    Synthetic corpus: per origin, labeled seed terms and hidden terms (stored unlabeled)
+    that co-occur with them, one "deep" term seen only next to hidden terms, plus a
+    ubiquitous unlabeled term and some cross-origin noise.
+    """
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.truth = {}
+        seeds, hidden = {}, {}
+        for origin in ORIGINS:
+            seeds[origin] = make_terms(*(f"{origin}seed{i}" for i in range(3)), cultural_origin=origin)
+            hidden[origin] = make_terms(*(f"{origin}hidden{i}" for i in range(4)))
+            (deep,) = make_terms(f"{origin}deep")
+            self.truth.update({t.text: origin for t in [*hidden[origin], deep]})
+        make_terms("chicken")
+
+        for origin in ORIGINS:
+            others = [o for o in ORIGINS if o != origin]
+            for _ in range(40):
+                words = [t.text for t in rng.sample(seeds[origin], 2) + rng.sample(hidden[origin], 2)]
+                if rng.random() < 0.5:
+                    words.append("chicken")
+                if rng.random() < 0.15:
+                    words.append(rng.choice(seeds[rng.choice(others)]).text)
+                make_post(" ".join(words), hours_ago=rng.uniform(1, 100))
+            for _ in range(6):
+                make_post(f"{origin}deep {rng.choice(hidden[origin]).text} chicken", hours_ago=rng.uniform(1, 100))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_term_matching(limit=None)
+
+    def _classify(self, **opts):
+        call_command("classify_origins", stdout=io.StringIO(), **opts)
+        return {t.text: t for t in Term.objects.all()}
+
+    def test_recovers_hidden_labels(self):
+        terms = self._classify()
+
+        for text, origin in self.truth.items():
+            self.assertEqual(terms[text].cultural_origin, origin, text)
+            self.assertGreaterEqual(terms[text].origin_confidence, 0.5, text)
+        # co-occurs with every origin: no majority, stays unlabeled
+        self.assertEqual(terms["chicken"].cultural_origin, "other")
+        self.assertEqual(terms["chicken"].origin_confidence, 0.0)
+
+    def test_deep_terms_need_a_second_round(self):
+        terms = self._classify(rounds=1)
+
+        self.assertEqual(terms["japanesedeep"].cultural_origin, "other")
+        self.assertEqual(terms["japanesehidden0"].cultural_origin, "japanese")
+
+    def test_dry_run_writes_nothing(self):
+        terms = self._classify(dry_run=True)
+
+        self.assertTrue(all(terms[text].cultural_origin == "other" for text in self.truth))
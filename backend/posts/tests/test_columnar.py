@@ -0,0 +1,55 @@
+import contextlib
+import io
+import tempfile
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from posts import columnar, hotstore, pg
+from posts.models import Post
+from posts.sentiment import run_sentiment_scoring
+from posts.services.trending import get_trending_terms
+from posts.tests.factories import make_post, make_trend_corpus
+from posts.trending_cuisines import get_trending_cuisines
+
+
+class ColumnarTests(TestCase):
+    def setUp(self):
+        make_trend_corpus()
+        self.now = timezone.now()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def test_vectorized_rankings_match_services(self):
+        columnar.write_snapshot(self.root)
+        frames = columnar.load_frames(self.root)
+
+        with (
+            mock.patch.object(pg, "is_postgres", return_value=False),
+            mock.patch.object(hotstore, "get_store", return_value=None),
+            mock.patch("django.utils.timezone.now", return_value=self.now),
+        ):
+            for days in (1, 7):
+                self.assertEqual(
+                    columnar.trending_terms(frames, now=self.now, days=days), get_trending_terms(days=days),
+                )
+                self.assertEqual(
+                    columnar.trending_cuisines(frames, now=self.now, days=days), get_trending_cuisines(days=days),
+                )
+
+    def test_partition_with_late_sentiment_is_rewritten(self):
+        old = make_post("week old tacos, amazing", hours_ago=24 * 6)
+        columnar.write_snapshot(self.root, refresh_days=0)
+        # nothing changed: nothing rewritten
+        self.assertEqual(columnar.write_snapshot(self.root, refresh_days=0)["partitions_written"], 0)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_sentiment_scoring()
+        summary = columnar.write_snapshot(self.root, refresh_days=0)
+
+        changed_days = set(Post.objects.filter(updated_at__isnull=False).dates("created_utc", "day"))
+        self.assertEqual(summary["partitions_written"], len(changed_days))
+        posts = columnar.load_frames(self.root)["posts"].set_index("id")
+        self.assertGreater(posts.loc[old.id, "sentiment"], 0)
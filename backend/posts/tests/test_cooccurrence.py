@@ -0,0 +1,54 @@
+import contextlib
+import io
+
+from django.test import TestCase
+
+from posts.models import PostTerm, TermCooccurrence
+from posts.services.cooccurrence import rebuild_cooccurrences
+from posts.term_matcher import run_term_matching
+from posts.tests.factories import isolated_term_index, make_post, make_terms
+
+
+def _counts() -> dict:
+    return {
+        (term_id, other_id, day): count
+        for term_id, other_id, day, count in TermCooccurrence.objects.values_list("term_id", "other_id", "day", "count")
+    }
+
+
+@isolated_term_index
+class IncrementalCooccurrenceTests(TestCase):
+    def setUp(self):
+        self.ramen, self.tacos, self.kimchi = make_terms("ramen", "tacos", "kimchi")
+        make_post("ramen and tacos with miso", hours_ago=1)
+        make_post("kimchi ramen", hours_ago=1)
+        make_post("tacos al pastor", hours_ago=30)
+        make_post("miso ramen, kimchi on the side", hours_ago=50)
+
+    def _match(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_term_matching(limit=None, **kwargs)
+
+    def _assert_matches_rebuild(self):
+        incremental = _counts()
+        rebuild_cooccurrences()
+        self.assertEqual(incremental, _counts())
+
+    def test_first_pass_matches_rebuild(self):
+        self._match()
+        self._assert_matches_rebuild()
+
+    def test_force_rematch_matches_rebuild(self):
+        self._match()
+        # A new term, and a linked term the index no longer matches
+        (miso,) = make_terms("miso")
+        self.tacos.is_active = False
+        self.tacos.save()
+
+        self._match(force=True)
+        # a second re-match creates no links, so adds nothing
+        self._match(force=True)
+
+        self.assertTrue(PostTerm.objects.filter(term=self.tacos).exists())
+        self.assertTrue(TermCooccurrence.objects.filter(term=miso, other=self.tacos).exists())
+        self._assert_matches_rebuild()
@@ -0,0 +1,54 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from posts import pg
+from posts.services.dashboard import get_dashboard
+from posts.services.search import search_posts
+from posts.services.trending import get_trending_terms
+from posts.tests.factories import make_trend_corpus
+from posts.trending_cuisines import get_trending_cuisines
+
+
+@override_settings(HOT_STORE=False)
+class DashboardTests(TestCase):
+    def setUp(self):
+        make_trend_corpus()
+        patcher = mock.patch("django.utils.timezone.now", return_value=timezone.now())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_scan_matches_the_separate_services(self):
+        for postgres in (False, True):
+            with mock.patch.object(pg, "is_postgres", return_value=postgres):
+                data = get_dashboard(days=7, limit=3, cuisine_limit=2)
+                self.assertEqual(data["trends"], get_trending_terms(days=7, limit=3), postgres)
+                self.assertEqual(data["cuisines"], get_trending_cuisines(days=7, limit=2), postgres)
+            self.assertEqual(data["search"], [])
+
+    def test_search_only_with_a_query(self):
+        data = get_dashboard(days=7, q="ramen", search_days=3, search_limit=2)
+
+        self.assertEqual(data["search"], search_posts(q="ramen", days=3, limit=2))
+        self.assertEqual(len(data["search"]), 2)
+        self.assertEqual(get_dashboard(days=7, q="   ")["search"], [])
+
+    def test_api_payload(self):
+        resp = self.client.get("/api/dashboard", {
+            "days": 7, "limit": 2, "cuisine_limit": 1, "q": "kimchi", "search_days": 30, "term": "kimchi",
+        })
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(
+            {k: data[k] for k in ("days", "limit", "cuisine_limit")}, {"days": 7, "limit": 2, "cuisine_limit": 1},
+        )
+        self.assertEqual(data["trends"], get_trending_terms(days=7, limit=2))
+        self.assertEqual(data["cuisines"], get_trending_cuisines(days=7, limit=1))
+        self.assertEqual(
+            {k: v for k, v in data["search"].items() if k != "results"},
+            {"q": "kimchi", "days": 30, "limit": 30, "term": "kimchi"},
+        )
+        self.assertEqual(data["search"]["results"], search_posts(q="kimchi", days=30, limit=30, term_text="kimchi"))
+        self.assertTrue(data["search"]["results"])
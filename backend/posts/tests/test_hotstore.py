@@ -0,0 +1,91 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from posts.hotstore_columns import HotStore
+from posts.models import PostTerm
+from posts.tests.factories import make_post, make_terms, make_trend_corpus, orm_aggregates, rounded
+
+HALF_LIFE, A, B = 2.5, 0.25, 0.15
+
+
+class HotStoreParityTests(TestCase):
+    def setUp(self):
+        make_trend_corpus()
+        self.now = timezone.now()
+        self.store = HotStore(30)
+        with mock.patch("django.utils.timezone.now", return_value=self.now):
+            self.store.load()
+
+    def test_terms_match_orm_scan(self):
+        by_term, _ = orm_aggregates(self.now)
+        hot = self.store.aggregate_terms(self.now, 7, HALF_LIFE, A, B)
+
+        self.assertEqual(rounded(hot), rounded(by_term))
+        # inactive terms are left out; posts without sentiment are not averaged in
+        self.assertNotIn("sushi", {d["term"] for d in hot.values()})
+        self.assertLess(max(d["sentiment_n"] for d in hot.values()), max(d["mentions"] for d in hot.values()))
+
+    def test_origins_match_orm_scan(self):
+        _, by_origin = orm_aggregates(self.now)
+        hot = self.store.aggregate_origins(self.now, 7, HALF_LIFE, A, B)
+
+        self.assertEqual(rounded(hot), rounded(by_origin))
+        # blank and explicit "other" origins land in one bucket
+        self.assertEqual(hot["other"]["unique_terms"], 2)
+        self.assertNotIn("", hot)
+
+
+class HotStoreSyncTests(TestCase):
+    def setUp(self):
+        (self.term,) = make_terms("birria")
+        self.store = HotStore(30)
+        self.store.load()
+
+    def _mentions(self):
+        by_term = self.store.aggregate_terms(timezone.now(), 7, HALF_LIFE, A, B)
+        return by_term.get(self.term.id, {}).get("mentions", 0)
+
+    def _link(self, **fields):
+        return PostTerm.objects.create(post=make_post("birria tacos"), term=self.term, **fields)
+
+    @override_settings(HOT_STORE_SYNC_LOOKBACK=100)
+    def test_late_commit_below_high_water_is_loaded_once(self):
+        # the first link's id was allocated first but its transaction commits last
+        late = self._link()
+        self._link()
+        late_id, late_post = late.id, late.post
+        late.delete()
+        self.store.sync()
+        self.assertEqual(self._mentions(), 1)
+
+        PostTerm.objects.create(id=late_id, post=late_post, term=self.term)
+        self.store.sync()
+        self.store.sync()
+        self.assertEqual(self._mentions(), 2)
+
+    @override_settings(HOT_STORE_SYNC_SECONDS=0.0)
+    def test_concurrent_maybe_sync_runs_once(self):
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def slow_sync():
+            calls.append(1)
+            time.sleep(0.2)
+            self.store.synced_at = time.monotonic() + 60
+
+        def reader():
+            barrier.wait()
+            self.store.maybe_sync()
+
+        with mock.patch.object(self.store, "_sync_or_reload_locked", side_effect=slow_sync):
+            threads = [threading.Thread(target=reader) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,88 @@
+import io
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import Term
+from posts.tests.factories import make_terms
+
+CSV = """text,cultural_origin
+Ramen,japanese
+tacos,
+kimchi,korean
+birria,mexican
+RAMEN,
+bad,klingon
+"""
+
+
+def _state():
+    return {
+        t.text: (t.is_active, t.cultural_origin, t.origin_confidence, t.updated_at)
+        for t in Term.objects.all()
+    }
+
+
+class ImportTermsTests(TestCase):
+    def setUp(self):
+        make_terms("ramen", cultural_origin="japanese", origin_confidence=1.0)
+        make_terms("tacos", is_active=False)
+        make_terms("kimchi", "sushi")
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "terms.csv"
+        self.path.write_text(CSV, encoding="utf-8")
+
+    def _import(self, *args):
+        out = io.StringIO()
+        call_command("import_terms", "--file", str(self.path), *args, stdout=out)
+        return out.getvalue().splitlines()
+
+    def test_dry_run_prints_the_exact_diff_and_writes_nothing(self):
+        before = _state()
+
+        lines = self._import("--dry-run", "--deactivate-missing")
+
+        self.assertEqual(lines[:-1], [
+            "+ birria (active, mexican)",
+            "~ kimchi: cultural_origin other -> korean, origin_confidence 0.0 -> 1.0",
+            "~ tacos: is_active False -> True",
+            "~ sushi: is_active True -> False",
+        ])
+        self.assertTrue(lines[-1].startswith(
+            "DRY RUN: created=1, reactivated=1, deactivated=1, relabeled=1, unchanged=1, "
+            "skipped_blank=0, skipped_comment=0, skipped_duplicate=1, skipped_too_long=0, skipped_bad_origin=1"
+        ))
+        self.assertEqual(_state(), before)
+
+    def test_apply_matches_the_dry_run_and_is_idempotent(self):
+        self._import("--deactivate-missing")
+        after = _state()
+
+        self.assertEqual({text: state[:3] for text, state in after.items()}, {
+            "ramen": (True, "japanese", 1.0),
+            "tacos": (True, "other", 0.0),
+            "kimchi": (True, "korean", 1.0),
+            "sushi": (False, "other", 0.0),
+            "birria": (True, "mexican", 1.0),
+        })
+
+        lines = self._import("--deactivate-missing", "--dry-run")
+        self.assertEqual(lines[:-1], [])
+        self.assertIn("created=0, reactivated=0, deactivated=0, relabeled=0, unchanged=4", lines[-1])
+        self._import("--deactivate-missing")
+        self.assertEqual(_state(), after)
+
+    def test_without_deactivate_missing_other_terms_are_kept(self):
+        self._import()
+
+        self.assertTrue(Term.objects.get(text="sushi").is_active)
+
+    def test_inactive_import_only_sets_new_terms(self):
+        self._import("--deactivate")
+
+        self.assertFalse(Term.objects.get(text="birria").is_active)
+        self.assertFalse(Term.objects.get(text="tacos").is_active)
+        self.assertTrue(Term.objects.get(text="ramen").is_active)
@@ -0,0 +1,46 @@
+import contextlib
+import io
+import time
+from unittest import mock
+
+import requests
+from django.db import connection
+from django.test import TestCase
+
+from posts.models import MatchQueue, Post
+from posts.reddit_json_ingest import ingest_from_subreddit
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, children):
+        self._children = children
+
+    def json(self):
+        return {"data": {"children": self._children}}
+
+
+def _child(reddit_id, title):
+    return {"data": {"id": reddit_id, "title": title, "selftext": "", "created_utc": time.time()}}
+
+
+class IngestFromSubredditTests(TestCase):
+    def test_fetch_runs_outside_a_transaction(self):
+        # TestCase wraps each test in atomic blocks of its own; the fetch must not add one
+        depth = len(connection.atomic_blocks)
+        seen = []
+
+        def get(url, **kwargs):
+            seen.append(len(connection.atomic_blocks))
+            return _Response([_child("a1", "ramen night"), _child("a2", "taco tuesday")])
+
+        stats = {}
+        with mock.patch.object(requests, "get", side_effect=get), contextlib.redirect_stdout(io.StringIO()):
+            inserted = ingest_from_subreddit("food", limit=2, stats=stats)
+
+        self.assertEqual(seen, [depth])
+        self.assertEqual(inserted, 2)
+        self.assertEqual(stats["posts_inserted"], 2)
+        self.assertEqual(MatchQueue.objects.count(), 2)
+        self.assertEqual(set(Post.objects.values_list("reddit_id", flat=True)), {"a1", "a2"})
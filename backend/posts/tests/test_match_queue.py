@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase
+
+from posts import match_queue
+from posts.match_queue import drain_match_queue, enqueue_posts
+from posts.models import MatchQueue, Post, PostTerm
+from posts.tests.factories import isolated_term_index, make_post, make_terms
+from posts.term_matcher import run_term_matching
+
+
+@isolated_term_index
+class DrainMatchQueueTests(TestCase):
+    def setUp(self):
+        make_terms("ramen")
+        self.posts = [make_post(f"ramen night {i}") for i in range(10)]
+        enqueue_posts([p.id for p in self.posts])
+        self.bad = self.posts[3].id
+
+    def _failing_on(self, post_id, exc):
+        def run(posts_qs=None, **kwargs):
+            if posts_qs.filter(id=post_id).exists():
+                raise exc
+            return run_term_matching(posts_qs=posts_qs, **kwargs)
+        return mock.patch.object(match_queue, "run_term_matching", side_effect=run)
+
+    def test_bad_post_is_isolated_from_its_batch(self):
+        with self._failing_on(self.bad, ValueError("unparseable")):
+            stats = drain_match_queue(batch_size=10)
+
+        self.assertEqual(stats["posts"], 9)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(PostTerm.objects.count(), 9)
+        # only the bad post stays queued, still leased, with its one spent attempt
+        row = MatchQueue.objects.get()
+        self.assertEqual(row.post_id, self.bad)
+        self.assertEqual(row.attempts, 1)
+        self.assertIsNotNone(row.lease_until)
+        self.assertFalse(PostTerm.objects.filter(post_id=self.bad).exists())
+
+    def test_database_errors_release_the_whole_batch(self):
+        with self._failing_on(self.bad, OperationalError("database is locked")):
+            with self.assertRaises(OperationalError):
+                drain_match_queue(batch_size=10)
+
+        self.assertEqual(MatchQueue.objects.count(), 10)
+        self.assertFalse(MatchQueue.objects.exclude(claim_token="").exists())
+        self.assertFalse(Post.objects.filter(term_matched_at__isnull=False).exists())
@@ -0,0 +1,76 @@
+import asyncio
+import re
+from unittest import mock
+
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+
+from posts import async_views, perf
+from posts.tests.factories import make_trend_corpus
+
+
+def _request_count(route: str) -> int:
+    pattern = rf'foodtrend_request_seconds_count\{{route="{re.escape(route)}",status="2xx"\}} (\d+)'
+    match = re.search(pattern, perf.prometheus_text())
+    return int(match.group(1)) if match else 0
+
+
+@override_settings(HOT_STORE=False, ALERTS=False)
+class PerfMiddlewareTests(TestCase):
+    def setUp(self):
+        make_trend_corpus()
+
+    @override_settings(PERF_INSTRUMENTATION=True)
+    def test_server_timing_and_registry(self):
+        before = _request_count("api/trends/")
+
+        with connection.execute_wrapper(perf.count_queries):
+            resp = self.client.get("/api/trends/", {"days": 7})
+
+        header = resp["Server-Timing"]
+        names = [part.split(";")[0] for part in header.split(", ")]
+        self.assertIn("trending.scan", names)
+        self.assertIn("serialize", names)
+        self.assertEqual(names[-2:], ["db", "total"])
+        queries = int(re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', header).group(1))
+        self.assertGreaterEqual(queries, 1)
+
+        self.assertEqual(_request_count("api/trends/"), before + 1)
+        metrics = self.client.get("/api/metrics").content.decode()
+        self.assertRegex(metrics, r'foodtrend_rows_scanned_total\{stage="trending.scan"\} \d+')
+        self.assertRegex(metrics, r'foodtrend_stage_seconds_count\{stage="trending.scan"\} \d+')
+
+    @override_settings(PERF_INSTRUMENTATION=False)
+    def test_off_by_default(self):
+        before = _request_count("api/trends/")
+
+        resp = self.client.get("/api/trends/", {"days": 7})
+
+        self.assertNotIn("Server-Timing", resp)
+        self.assertEqual(_request_count("api/trends/"), before)
+        self.assertIs(perf.stage("trending.scan"), perf._NOOP)
+
+    def test_recording_sums_repeated_stages(self):
+        with perf.recording() as timings:
+            for n in (2, 3):
+                with perf.stage("scan"):
+                    perf.add_rows("scan", n)
+            self.assertIs(perf.active(), timings)
+
+        self.assertIsNone(perf.active())
+        self.assertEqual(list(timings.stages), ["scan"])
+        self.assertEqual(timings.rows, {"scan": 5})
+
+    def test_async_scoring_pool_records_into_the_request(self):
+        def leaderboard(days, limit, dedupe):
+            with perf.stage("trending.scan"):
+                perf.add_rows("trending.scan", 4)
+            return []
+
+        request = RequestFactory().get("/api/trends/")
+        with mock.patch.object(async_views, "get_terms_leaderboard", side_effect=leaderboard):
+            with perf.recording() as timings:
+                asyncio.run(async_views.api_trends(request))
+
+        self.assertIn("trending.scan", timings.stages)
+        self.assertEqual(timings.rows, {"trending.scan": 4})
@@ -0,0 +1,91 @@
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from posts import pg
+from posts.models import Post
+from posts.services.search import _tokens
+from posts.services.trending import _rank_terms, _window_bounds
+from posts.trending_cuisines import _rank_origins
+from posts.tests.factories import make_post, make_trend_corpus, orm_aggregates, rounded
+
+# COPY and tsvector need a server: FOODTREND_DB_ENGINE=postgres (the CI postgres job).
+# The SQL aggregates also run on SQLite, so their parity with the Python scan is always checked.
+needs_postgres = skipUnless(connection.vendor == "postgresql", "needs PostgreSQL (FOODTREND_DB_ENGINE=postgres)")
+
+HALF_LIFE, A, B = 2.5, 0.25, 0.15
+
+
+class AggregateParityTests(TestCase):
+    def setUp(self):
+        make_trend_corpus()
+        self.now = timezone.now()
+
+    def _sql(self, fn, dedupe=False):
+        return fn(self.now, *_window_bounds(self.now, 7), HALF_LIFE, A, B, dedupe=dedupe)
+
+    def test_terms_match_python_scan(self):
+        for dedupe in (False, True):
+            by_term, _ = orm_aggregates(self.now, dedupe=dedupe)
+            sql = self._sql(pg.aggregate_terms, dedupe)
+            self.assertEqual(rounded(sql), rounded(by_term))
+            self.assertEqual(_rank_terms(sql, 20), _rank_terms(by_term, 20))
+
+    def test_origins_match_python_scan(self):
+        for dedupe in (False, True):
+            _, by_origin = orm_aggregates(self.now, dedupe=dedupe)
+            sql = self._sql(pg.aggregate_origins, dedupe)
+            self.assertEqual(rounded(sql), rounded(by_origin))
+            self.assertEqual(_rank_origins(sql, 20), _rank_origins(by_origin, 20))
+            # blank and explicit "other" origins land in one bucket
+            self.assertEqual(sql["other"]["unique_terms"], 2)
+
+
+@needs_postgres
+class CopyInsertPostsTests(TestCase):
+    def _post(self, reddit_id, title="ramen night"):
+        return Post(
+            reddit_id=reddit_id, subreddit="food", title=title, body="",
+            created_utc=timezone.now() - timedelta(hours=1), score=1, num_comments=0,
+        )
+
+    def test_existing_reddit_ids_are_skipped(self):
+        first = pg.copy_insert_posts([self._post("c1"), self._post("c2")])
+        self.assertEqual(sorted(p.reddit_id for p in first), ["c1", "c2"])
+
+        again = pg.copy_insert_posts([self._post("c2", title="edited"), self._post("c3")])
+
+        self.assertEqual([p.reddit_id for p in again], ["c3"])
+        self.assertEqual(again[0].id, Post.objects.get(reddit_id="c3").id)
+        self.assertFalse(again[0]._state.adding)
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(Post.objects.get(reddit_id="c2").title, "ramen night")
+
+
+@needs_postgres
+class FilterSearchCandidatesTests(TestCase):
+    def test_any_token_in_title_or_body(self):
+        in_title = make_post("Ramen night")
+        in_body = make_post("Weeknight dinner", body="quick miso ramen")
+        both = make_post("tacos", body="and pho")
+        make_post("pizza friday")
+
+        found = pg.filter_search_candidates(Post.objects.all(), {"ramen", "pho"})
+
+        self.assertEqual(set(found.values_list("id", flat=True)), {in_title.id, in_body.id, both.id})
+
+    def test_non_ascii_text_matches_python_tokens(self):
+        posts = [
+            make_post("Jalapeño poppers"),
+            make_post("Crème brûlée for two", body="torch + sugar"),
+            make_post("3.5 hour brisket"),
+            make_post("Smoked BRISKET", body="mac-n-cheese on the side"),
+        ]
+        for q in ["jalapeño", "jalape", "o", "brûlée", "creme", "3", "brisket", "mac n cheese"]:
+            tokens = _tokens(q)
+            expected = {p.id for p in posts if tokens & (_tokens(p.title) | _tokens(p.body))}
+            found = set(pg.filter_search_candidates(Post.objects.all(), tokens).values_list("id", flat=True))
+            self.assertEqual(found, expected, q)
@@ -0,0 +1,33 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from posts.pipeline import Pipeline
+
+
+class PipelineShutdownTests(SimpleTestCase):
+    def test_run_returns_when_matcher_died_with_full_queue(self):
+        pipeline = Pipeline(["food"], queue_size=1, snapshot_interval=0)
+        # matcher exits at once; the fetcher leaves the bounded queue full
+        pipeline._matcher = threading.Thread(target=lambda: None, daemon=True)
+        pipeline._fetch_loop = lambda deadline: pipeline.queue.put({"post_ids": []})
+
+        done = threading.Event()
+        runner = threading.Thread(target=lambda: (pipeline.run(), done.set()), daemon=True)
+        runner.start()
+        self.assertTrue(done.wait(timeout=10), "Pipeline.run() hung on shutdown")
+
+    def test_stop_marker_reaches_live_matcher(self):
+        pipeline = Pipeline(["food"], queue_size=1, snapshot_interval=0)
+        seen = []
+
+        def matcher():
+            time.sleep(0.3)  # queue is full while run() starts shutting down
+            seen.append(pipeline.queue.get())
+            seen.append(pipeline.queue.get(timeout=5))
+
+        pipeline._matcher = threading.Thread(target=matcher, daemon=True)
+        pipeline._fetch_loop = lambda deadline: pipeline.queue.put({"post_ids": []})
+        pipeline.run()
+        self.assertEqual(len(seen), 2)
@@ -0,0 +1,99 @@
+import io
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from posts.models import IngestFetch, IngestRun
+from posts.services.pipeline_stats import get_pipeline_stats
+
+
+def _fetch(subreddit, status=200, latency=0.5, seen=10, inserted=2):
+    return {
+        "subreddit": subreddit, "status": status, "latency_seconds": latency,
+        "posts_seen": seen, "posts_inserted": inserted, "post_ids": [],
+    }
+
+
+class PipelineStatsTests(TestCase):
+    def _run(self, hours_ago=1.0, finished=True, matching=2.0, links=10, total=5.0, fetches=()):
+        started = timezone.now() - timedelta(hours=hours_ago)
+        run = IngestRun.objects.create(
+            started_at=started, finished_at=started + timedelta(seconds=total) if finished else None,
+            matching_seconds=matching if finished else None, links_created=links if finished else 0,
+            total_seconds=total if finished else None,
+        )
+        IngestFetch.objects.bulk_create([
+            IngestFetch(run=run, **{k: v for k, v in f.items() if k != "post_ids"}) for f in fetches
+        ])
+        return run
+
+    def test_summary(self):
+        latencies = [0.1 * i for i in range(1, 11)]
+        self._run(matching=2.0, links=10, total=5.0,
+                  fetches=[_fetch("food", latency=latency) for latency in latencies[:5]])
+        self._run(matching=3.0, links=40, total=7.0,
+                  fetches=[_fetch("food", latency=latency) for latency in latencies[5:]]
+                  + [_fetch("ramen", status=429, seen=0, inserted=0), _fetch("ramen", status=0, latency=0.0)])
+        self._run(finished=False, fetches=[_fetch("ramen")])
+        self._run(hours_ago=24 * 8, fetches=[_fetch("food", status=500)])  # outside the window
+
+        stats = get_pipeline_stats(days=7)
+
+        self.assertEqual(stats["runs"]["count"], 3)
+        self.assertEqual(stats["runs"]["unfinished"], 1)
+        self.assertEqual(stats["runs"]["total_seconds"], {"n": 2, "p50": 5.0, "p90": 7.0, "p99": 7.0, "max": 7.0})
+        self.assertEqual(stats["matching"]["links_created"], 50)
+        self.assertEqual(stats["matching"]["links_per_second"], 10.0)
+
+        food, ramen = stats["subreddits"]
+        self.assertEqual(food["statuses"], {"200": 10})
+        self.assertEqual(food["error_rate"], 0.0)
+        self.assertEqual(food["latency_seconds"], {"n": 10, "p50": 0.5, "p90": 0.9, "p99": 1.0, "max": 1.0})
+        self.assertEqual(ramen["statuses"], {"429": 1, "0": 1, "200": 1})
+        self.assertEqual(ramen["error_rate"], round(2 / 3, 4))
+        self.assertEqual((ramen["posts_seen"], ramen["posts_inserted"]), (20, 4))
+
+    def test_empty_window(self):
+        stats = get_pipeline_stats(days=1)
+
+        self.assertEqual(stats["runs"], {"count": 0, "unfinished": 0, "total_seconds": {
+            "n": 0, "p50": None, "p90": None, "p99": None, "max": None,
+        }})
+        self.assertIsNone(stats["matching"]["links_per_second"])
+        self.assertEqual(self.client.get("/api/pipeline/stats", {"days": 1}).json(), stats)
+
+
+class IngestRunHistoryTests(TestCase):
+    def _ingest(self, **patches):
+        def fake_ingest(subreddits, limit, sleep_seconds, fetches):
+            fetches.extend([_fetch("food", seen=25, inserted=3), _fetch("ramen", status=429, seen=0, inserted=0)])
+
+        with (
+            mock.patch("posts.management.commands.ingest_reddit.ingest_reddit_json", side_effect=fake_ingest),
+            mock.patch("posts.management.commands.ingest_reddit.drain_match_queue",
+                       **patches.get("drain", {"return_value": {"links": 7}})),
+        ):
+            call_command("ingest_reddit", "--no-sentiment", "--no-snapshots", stdout=io.StringIO())
+
+    def test_run_is_recorded_with_its_fetches(self):
+        self._ingest()
+
+        run = IngestRun.objects.get()
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual((run.posts_seen, run.posts_inserted, run.links_created), (25, 3, 7))
+        self.assertIsNotNone(run.matching_seconds)
+        self.assertIsNone(run.sentiment_seconds)
+        self.assertGreaterEqual(run.total_seconds, run.fetch_seconds)
+        self.assertEqual(sorted(run.fetches.values_list("subreddit", "status")), [("food", 200), ("ramen", 429)])
+
+    def test_crashed_run_stays_unfinished(self):
+        with self.assertRaises(RuntimeError):
+            self._ingest(drain={"side_effect": RuntimeError("db locked")})
+
+        run = IngestRun.objects.get()
+        self.assertIsNone(run.finished_at)
+        self.assertEqual(run.fetches.count(), 2)
+        self.assertEqual(get_pipeline_stats()["runs"]["unfinished"], 1)
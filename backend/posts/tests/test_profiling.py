@@ -0,0 +1,85 @@
+import io
+import pstats
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from posts.profiling import ProfiledCommand
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < deadline:
+        n += 1
+    return n
+
+
+class BusyCommand(ProfiledCommand):
+    def add_arguments(self, parser):
+        parser.add_argument("--fail", action="store_true")
+
+    def handle(self, *args, **opts):
+        self.blocks = [bytearray(1024) for _ in range(2000)]
+        _busy(0.15)
+        if opts["fail"]:
+            raise RuntimeError("boom")
+        self.stdout.write("done")
+
+
+class ProfiledCommandTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out = Path(tmp.name) / "run"
+
+    def _call(self, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command(BusyCommand(), *args, "--profile-out", str(self.out), stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_sample_mode_writes_collapsed_stacks_rooted_at_handle(self):
+        stdout, stderr = self._call("--profile", "--profile-interval", "1")
+
+        self.assertEqual(stdout.strip(), "done")
+        lines = self.out.with_name("run.collapsed").read_text().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("posts/tests/test_profiling.py:BusyCommand.handle"), stack)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any("test_profiling.py:_busy" in line for line in lines))
+        self.assertIn("samples @ 1.0ms", stderr)
+        self.assertIn("Wall time", stderr)
+
+    def test_cprofile_mode_writes_pstats(self):
+        _, stderr = self._call("--profile", "cprofile", "--profile-top", "5")
+
+        stats = pstats.Stats(str(self.out.with_name("run.prof")))
+        self.assertIn("_busy", {func for _, _, func in stats.stats})
+        self.assertIn("cProfile stats written to", stderr)
+        self.assertFalse(self.out.with_name("run.collapsed").exists())
+
+    def test_memory_report_alone(self):
+        _, stderr = self._call("--profile-memory")
+
+        self.assertIn("tracemalloc: peak", stderr)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(list(self.out.parent.iterdir()), [])
+
+    def test_off_by_default(self):
+        stdout, stderr = self._call()
+
+        self.assertEqual(stdout.strip(), "done")
+        self.assertEqual(stderr, "")
+        self.assertEqual(list(self.out.parent.iterdir()), [])
+
+    def test_failing_command_still_reports(self):
+        with self.assertRaises(RuntimeError):
+            self._call("--profile", "--fail")
+
+        self.assertTrue(self.out.with_name("run.collapsed").exists())
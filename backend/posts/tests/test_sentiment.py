@@ -0,0 +1,42 @@
+import contextlib
+import io
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from posts.models import Post
+from posts.sentiment import run_sentiment_scoring
+from posts.tests.factories import make_post
+
+
+class SentimentScoringTests(TestCase):
+    def setUp(self):
+        self.scored = make_post("terrible soggy fries", sentiment=0.5)
+        self.pending = [make_post("amazing crispy tacos, love them"), make_post("awful burnt pizza, hate it")]
+
+    def _score(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()), mock.patch("posts.hotstore.notify_sentiment") as notify:
+            count = run_sentiment_scoring(**kwargs)
+        return count, notify
+
+    def test_only_unscored_posts_are_scored(self):
+        count, notify = self._score(batch_size=1)
+
+        self.assertEqual(count, 2)
+        (scores,), _ = notify.call_args
+        self.assertEqual(set(scores), {p.id for p in self.pending})
+        # the stored score is left alone, even though VADER would disagree with it
+        self.assertEqual(Post.objects.get(id=self.scored.id).sentiment, 0.5)
+        positive, negative = (Post.objects.get(id=p.id).sentiment for p in self.pending)
+        self.assertGreater(positive, 0)
+        self.assertLess(negative, 0)
+
+        self.assertEqual(self._score()[0], 0)
+
+    @override_settings(SENTIMENT_WORKERS=1)
+    def test_default_scores_in_process(self):
+        with mock.patch("posts.sentiment.ProcessPoolExecutor") as pool:
+            count, _ = self._score(batch_size=1)
+
+        self.assertEqual(count, 2)
+        pool.assert_not_called()
@@ -0,0 +1,76 @@
+import contextlib
+import io
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from unittest import mock
+
+from django.test import TestCase
+
+from posts.services.series import MAX_POINTS, get_term_series
+from posts.term_matcher import run_term_matching
+from posts.tests.factories import isolated_term_index, make_post, make_terms
+
+NOW = datetime(2026, 3, 10, 12, 15, tzinfo=dt_timezone.utc)
+
+
+@isolated_term_index
+class TermSeriesTests(TestCase):
+    def setUp(self):
+        self.ramen, self.tacos = make_terms("ramen", "tacos")
+        for hours_ago, score, title in ((0.1, 5, "ramen"), (0.2, 3, "ramen and tacos"), (2.1, 1, "ramen"),
+                                        (50, 7, "tacos")):
+            make_post(title, created_utc=NOW - timedelta(hours=hours_ago), score=score, num_comments=1)
+        patcher = mock.patch("django.utils.timezone.now", return_value=NOW)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._match()
+
+    def _match(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_term_matching(limit=None, **kwargs)
+
+    def test_hour_series_is_dense_and_ends_at_the_current_hour(self):
+        data = get_term_series([self.ramen.id], bucket="hour", days=1)
+
+        self.assertEqual(data["points"], 25)
+        self.assertEqual(data["step_seconds"], 3600)
+        self.assertEqual(data["start"], "2026-03-09T12:00:00+00:00")
+        (ramen,) = data["series"]
+        self.assertEqual(ramen["term"], "ramen")
+        self.assertEqual(ramen["mentions"][-1], 2)
+        self.assertEqual(ramen["score"][-1], 8)
+        self.assertEqual(ramen["comments"][-1], 2)
+        self.assertEqual(ramen["mentions"][-3], 1)
+        self.assertEqual(sum(ramen["mentions"]), 3)
+
+    def test_several_terms_in_request_order(self):
+        data = get_term_series([self.tacos.id, 999999, self.ramen.id, self.tacos.id], bucket="day", days=3)
+
+        self.assertEqual([s["term"] for s in data["series"]], ["tacos", "ramen"])
+        self.assertEqual(data["points"], 4)
+        # Mar 7..10: the 50h-old post falls on Mar 8
+        self.assertEqual(data["series"][0]["mentions"], [0, 1, 0, 1])
+
+    def test_rematching_does_not_double_count(self):
+        self._match(force=True)
+
+        (ramen,) = get_term_series([self.ramen.id], bucket="hour", days=1)["series"]
+        self.assertEqual(sum(ramen["mentions"]), 3)
+
+    def test_points_are_capped(self):
+        data = get_term_series([self.ramen.id], bucket="hour", days=365)
+
+        self.assertEqual(data["points"], MAX_POINTS["hour"])
+        self.assertEqual(sum(data["series"][0]["mentions"]), 3)
+
+    def test_api(self):
+        resp = self.client.get(f"/api/terms/{self.ramen.id}/series", {"bucket": "hour", "days": 1})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["days"], 1)
+        self.assertEqual(sum(resp.json()["series"][0]["mentions"]), 3)
+
+        resp = self.client.get("/api/terms/series", {"ids": f"{self.ramen.id}, {self.tacos.id}"})
+        self.assertEqual([s["term"] for s in resp.json()["series"]], ["ramen", "tacos"])
+
+        for params in ({"ids": "1,x"}, {"ids": ""}, {"ids": "1", "bucket": "week"}):
+            self.assertEqual(self.client.get("/api/terms/series", params).status_code, 400, params)
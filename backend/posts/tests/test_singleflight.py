@@ -0,0 +1,126 @@
+import fcntl
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from posts.services.singleflight import _lock_paths, _normalized_key, single_flight
+
+
+class InProcessTests(SimpleTestCase):
+    def test_concurrent_callers_share_one_call(self):
+        calls = []
+        barrier = threading.Barrier(8)
+
+        @single_flight
+        def ranking(days=7):
+            calls.append(days)
+            time.sleep(0.2)
+            return [{"term": "ramen", "mentions": 3}]
+
+        results = []
+
+        def caller():
+            barrier.wait()
+            results.append(ranking(days=7))
+
+        threads = [threading.Thread(target=caller) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(calls, [7])
+        self.assertEqual(len(results), 8)
+        # each caller owns its copy
+        results[0][0]["mentions"] = 99
+        self.assertTrue(all(r == [{"term": "ramen", "mentions": 3}] for r in results[1:]))
+        self.assertEqual(len({id(r) for r in results}), 8)
+
+    def test_waiters_see_the_leaders_error(self):
+        barrier = threading.Barrier(4)
+
+        @single_flight
+        def ranking():
+            time.sleep(0.2)
+            raise ValueError("boom")
+
+        errors = []
+
+        def caller():
+            barrier.wait()
+            try:
+                ranking()
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=caller) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(errors), 4)
+
+
+class CrossProcessTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.lock_dir = Path(tmp.name)
+        settings_override = override_settings(SINGLE_FLIGHT_LOCK_DIR=tmp.name, SINGLE_FLIGHT_LOCK_TIMEOUT=5.0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.calls = []
+
+        def ranking(days=7):
+            self.calls.append(days)
+            return {"computed": True}
+
+        self.ranking = single_flight(ranking)
+        key = _normalized_key(ranking, inspect.signature(ranking), (), {"days": 7})
+        self.lock_path, self.result_path = _lock_paths(self.lock_dir, key)
+
+    def _hold_lock(self):
+        # flock is per open file: a second handle stands in for another process
+        fh = open(self.lock_path, "a+")
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        self.addCleanup(fh.close)
+        return fh
+
+    def test_stale_result_file_is_recomputed(self):
+        self.result_path.write_text(json.dumps({"computed": False}))
+        old = time.time() - 3600
+        os.utime(self.result_path, (old, old))
+
+        self.assertEqual(self.ranking(days=7), {"computed": True})
+        self.assertEqual(self.calls, [7])
+        self.assertEqual(json.loads(self.result_path.read_text()), {"computed": True})
+
+    def test_result_written_while_waiting_is_reused(self):
+        fh = self._hold_lock()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(self.ranking(days=7)))
+        waiter.start()
+        time.sleep(0.2)
+        self.result_path.write_text(json.dumps({"computed": "elsewhere"}))
+        fcntl.flock(fh, fcntl.LOCK_UN)
+        waiter.join()
+
+        self.assertEqual(results, [{"computed": "elsewhere"}])
+        self.assertEqual(self.calls, [])
+
+    @override_settings(SINGLE_FLIGHT_LOCK_TIMEOUT=0.2)
+    def test_lock_timeout_computes_without_the_lock(self):
+        self._hold_lock()
+        started = time.monotonic()
+
+        self.assertEqual(self.ranking(days=7), {"computed": True})
+        self.assertEqual(self.calls, [7])
+        self.assertLess(time.monotonic() - started, 2.0)
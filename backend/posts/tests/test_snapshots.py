@@ -0,0 +1,90 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from posts import hotstore
+from posts.models import TrendSnapshot
+from posts.services.snapshots import get_snapshot
+from posts.tests.factories import make_trend_corpus
+
+TERMS = [{"term": f"t{i}", "trend_score": 10.0 - i} for i in range(5)]
+CUISINES = [{"origin": f"o{i}", "trend_score": 5.0 - i} for i in range(3)]
+
+
+@override_settings(HOT_STORE=False, TREND_SNAPSHOT_MAX_AGE_SECONDS=3600)
+class GetSnapshotTests(TestCase):
+    def _snapshot(self, kind="terms", days=7, results=TERMS, age=timedelta(minutes=5)):
+        TrendSnapshot.objects.create(
+            kind=kind, days=days, limit=len(results), results=results, computed_at=timezone.now() - age,
+        )
+
+    def test_fresh_snapshot_is_sliced_to_limit(self):
+        self._snapshot()
+
+        self.assertEqual(get_snapshot("terms", 7, 3), TERMS[:3])
+        self.assertEqual(get_snapshot("terms", 7, 5), TERMS)
+
+    def test_uncovered_requests_fall_back(self):
+        self._snapshot()
+
+        self.assertIsNone(get_snapshot("terms", 7, 6))  # more rows than stored
+        self.assertIsNone(get_snapshot("terms", 14, 3))  # not a preset
+        self.assertIsNone(get_snapshot("cuisines", 7, 3))  # other kind
+
+    def test_stale_snapshot_falls_back(self):
+        self._snapshot(age=timedelta(hours=2))
+
+        self.assertIsNone(get_snapshot("terms", 7, 3))
+
+    @override_settings(HOT_STORE=True, HOT_STORE_DAYS=7)
+    def test_hot_store_window_skips_snapshots(self):
+        self._snapshot(days=7)
+        self._snapshot(days=30)
+
+        self.assertIsNone(get_snapshot("terms", 7, 3))
+        self.assertEqual(get_snapshot("terms", 30, 3), TERMS[:3])
+
+
+@override_settings(HOT_STORE=False)
+class DashboardSnapshotTests(TestCase):
+    def setUp(self):
+        make_trend_corpus()
+
+    def _dashboard(self, **params):
+        return self.client.get("/api/dashboard", {"days": 7, "limit": 3, "cuisine_limit": 2, **params}).json()
+
+    def test_served_from_fresh_snapshots(self):
+        for kind, results in (("terms", TERMS), ("cuisines", CUISINES)):
+            TrendSnapshot.objects.create(
+                kind=kind, days=7, limit=len(results), results=results, computed_at=timezone.now(),
+            )
+
+        with mock.patch("posts.views.get_dashboard") as live:
+            data = self._dashboard()
+
+        live.assert_not_called()
+        self.assertEqual(data["trends"], TERMS[:3])
+        self.assertEqual(data["cuisines"], CUISINES[:2])
+
+    def test_missing_cuisine_snapshot_computes_both_live(self):
+        TrendSnapshot.objects.create(kind="terms", days=7, limit=5, results=TERMS, computed_at=timezone.now())
+
+        data = self._dashboard()
+
+        self.assertEqual([t["term"] for t in data["trends"]], ["ramen", "tacos", "kimchi"])
+        self.assertEqual(len(data["cuisines"]), 2)
+
+    @override_settings(HOT_STORE=True, HOT_STORE_DAYS=30)
+    def test_hot_store_wins_over_fresh_snapshots(self):
+        for kind, results in (("terms", TERMS), ("cuisines", CUISINES)):
+            TrendSnapshot.objects.create(
+                kind=kind, days=7, limit=len(results), results=results, computed_at=timezone.now(),
+            )
+        self.addCleanup(setattr, hotstore, "_store", None)
+
+        data = self._dashboard()
+
+        self.assertNotIn("t0", [t["term"] for t in data["trends"]])
+        self.assertEqual(data["trends"][0]["term"], "ramen")
@@ -0,0 +1,87 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from posts import term_index
+from posts.models import Term
+from posts.term_matcher import _build_term_index, _tokens
+from posts.tests.factories import make_terms
+
+
+class TermIndexRebuildTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        settings_override = override_settings(TERM_INDEX_DIR=self.dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache = mock.patch.object(term_index, "_cache", None)
+        cache.start()
+        self.addCleanup(cache.stop)
+        self.ramen, self.tacos = make_terms("ramen", "tacos")
+
+    def _files(self):
+        return sorted(p.name for p in self.dir.glob("term-index-*.bin"))
+
+    def _matches(self, index, text):
+        return {Term.objects.get(id=i).text for i in index.match(_tokens(text))}
+
+    def test_unchanged_vocabulary_reuses_the_file(self):
+        first = _build_term_index()
+        (name,) = self._files()
+
+        # another process: nothing open yet, the file on disk is mapped as is
+        with mock.patch.object(term_index, "_cache", None), mock.patch.object(term_index, "write_index") as write:
+            second = _build_term_index()
+
+        write.assert_not_called()
+        self.assertEqual(second.fingerprint, first.fingerprint)
+        self.assertEqual(self._files(), [name])
+        self.assertIs(_build_term_index(), first)
+
+    def test_vocabulary_changes_rebuild_and_drop_old_files(self):
+        first = _build_term_index()
+        self.assertEqual(self._matches(first, "birria tacos and ramen"), {"ramen", "tacos"})
+
+        make_terms("birria")
+        added = _build_term_index()
+        self.assertNotEqual(added.fingerprint, first.fingerprint)
+        self.assertEqual(self._matches(added, "birria tacos and ramen"), {"birria", "ramen", "tacos"})
+        self.assertEqual(len(self._files()), 1)
+
+        self.tacos.is_active = False
+        self.tacos.save()
+        deactivated = _build_term_index()
+        self.assertNotEqual(deactivated.fingerprint, added.fingerprint)
+        self.assertEqual(self._matches(deactivated, "birria tacos and ramen"), {"birria", "ramen"})
+
+        # an edit keeps count and ids, but bumps updated_at
+        self.ramen.text = "pho"
+        self.ramen.save()
+        edited = _build_term_index()
+        self.assertEqual(self._matches(edited, "birria, ramen or pho"), {"birria", "pho"})
+        self.assertEqual(len(self._files()), 1)
+
+    def test_file_removed_under_a_reader_is_rebuilt(self):
+        _build_term_index()
+        (name,) = self._files()
+
+        with mock.patch.object(term_index, "_cache", None):
+            real_init = term_index.TermIndex.__init__
+            calls = []
+
+            def vanish_once(index, path, fingerprint):
+                # a process with a newer vocabulary deletes our file between exists() and open()
+                if not calls:
+                    calls.append(path)
+                    path.unlink()
+                real_init(index, path, fingerprint)
+
+            with mock.patch.object(term_index.TermIndex, "__init__", vanish_once):
+                index = _build_term_index()
+
+        self.assertEqual(self._files(), [name])
+        self.assertEqual(self._matches(index, "tacos"), {"tacos"})
@@ -0,0 +1,48 @@
+import contextlib
+import io
+
+from django.test import TestCase, override_settings
+
+from posts.models import PostTerm
+from posts.term_matcher import run_term_matching
+from posts.tests.factories import isolated_term_index, make_post, make_terms
+
+
+@isolated_term_index
+@override_settings(TERM_MATCH_VARIANTS=True, TERM_FUZZY_MIN_LEN=7)
+class FuzzyMatchTests(TestCase):
+    def setUp(self):
+        make_terms("brisket", "tiramisu", "shawarma", "pressure cooker", "cooker", "roaster", "chop", "chipped")
+
+    def _terms_of(self, *titles):
+        posts = [make_post(title) for title in titles]
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_term_matching(limit=None)
+        return [
+            set(PostTerm.objects.filter(post=post).values_list("term__text", flat=True))
+            for post in posts
+        ]
+
+    def test_typos_match(self):
+        self.assertEqual(
+            self._terms_of("smoked briskett sandwich", "homemade tiramsu", "chicken shawarm wrap"),
+            [{"brisket"}, {"tiramisu"}, {"shawarma"}],
+        )
+
+    def test_inflections_match_exactly(self):
+        self.assertEqual(self._terms_of("two cookers, one roasters"), [{"cooker", "roaster"}])
+
+    def test_other_word_forms_do_not_match(self):
+        self.assertEqual(
+            self._terms_of(
+                "slow cooked beef",  # cooked / cooker: ending swap
+                "roasted carrots",  # roasted / roaster
+                "chopped salad",  # chopped is chop + ed, though one edit from "chipped"
+            ),
+            [set(), set(), set()],
+        )
+
+    def test_short_tokens_are_exact_only(self):
+        make_terms("ramen")
+
+        self.assertEqual(self._terms_of("raman bowl"), [set()])
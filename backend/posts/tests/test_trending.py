@@ -0,0 +1,39 @@
+from django.test import TestCase
+
+from posts.models import PostTerm
+from posts.services.trending import get_trending_terms
+from posts.tests.factories import make_post, make_terms
+from posts.trending_cuisines import get_trending_cuisines
+
+
+class DedupeTests(TestCase):
+    def setUp(self):
+        (self.ramen,) = make_terms("ramen", cultural_origin="japanese")
+        # cluster A: root and a crosspost, both in the 7-day window
+        root_a = make_post("tonkotsu ramen at home", hours_ago=30)
+        dup_a = make_post("tonkotsu ramen at home", hours_ago=29, subreddit="ramen", dup_of=root_a)
+        # cluster B: root 10 days ago, reposted twice inside the window
+        root_b = make_post("shoyu ramen recipe", hours_ago=240)
+        dup_b = make_post("shoyu ramen recipe", hours_ago=5, subreddit="Cooking", dup_of=root_b)
+        dup_b2 = make_post("shoyu ramen recipe", hours_ago=2, subreddit="recipes", dup_of=root_b)
+        for post in (root_a, dup_a, root_b, dup_b, dup_b2):
+            PostTerm.objects.create(post=post, term=self.ramen)
+
+    def test_terms_count_each_cluster_once(self):
+        (raw,) = get_trending_terms(days=7)
+        (deduped,) = get_trending_terms(days=7, dedupe=True)
+
+        self.assertEqual(raw["mentions"], 4)
+        # cluster A once (its root), cluster B once (its first repost stands in for the old root)
+        self.assertEqual(deduped["mentions"], 2)
+        self.assertEqual(deduped["recent_24h"], 1)
+
+    def test_cuisines_count_each_cluster_once(self):
+        (raw,) = get_trending_cuisines(days=7)
+        (deduped,) = get_trending_cuisines(days=7, dedupe=True)
+
+        self.assertEqual(raw["mentions"], 4)
+        self.assertEqual(raw["subreddit_spread"], 4)
+        self.assertEqual(deduped["mentions"], 2)
+        # food (root A) and Cooking (first repost of B)
+        self.assertEqual(deduped["subreddit_spread"], 2)
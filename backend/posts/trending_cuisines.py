@@ -1,27 +1,95 @@
-import math
-from datetime import timedelta
 from django.utils import timezone
 
+from posts import hotstore, pg
 from posts.models import PostTerm
+from posts.perf import add_rows, stage
+from posts.services.singleflight import single_flight
+from posts.services.trending import _counted_once, _match_contrib, _window_bounds
 
-def _decay_weight(age_days: float, half_life_days: float) -> float:
-    return math.exp(-math.log(2) * age_days / half_life_days)
 
+def _add_origin_match(by_origin, origin, term_id, subreddit, created, contrib, last_24h_start, prev_24h_start):
+    if origin not in by_origin:
+        by_origin[origin] = {
+            "origin": origin,
+            "trend_score": 0.0,
+            "mentions": 0,
+            "recent_24h": 0,
+            "prev_24h": 0,
+            "unique_terms": set(),
+            "unique_subreddits": set(),
+        }
+
+    bucket = by_origin[origin]
+    bucket["trend_score"] += contrib
+    bucket["mentions"] += 1
+    bucket["unique_terms"].add(term_id)
+    bucket["unique_subreddits"].add(subreddit)
+
+    if created >= last_24h_start:
+        bucket["recent_24h"] += 1
+    elif created >= prev_24h_start:
+        bucket["prev_24h"] += 1
+
+
+def _count(v) -> int:
+    # sets from the Python scan, ints from the SQL aggregate (posts.pg) / posts.hotstore
+    return v if isinstance(v, int) else len(v)
+
+
+def _rank_origins(by_origin, limit: int):
+    results = []
+    for origin, data in by_origin.items():
+        recent = data["recent_24h"]
+        prev = data["prev_24h"]
+        spike = (recent + 1) / (prev + 1)
+
+        results.append({
+            "origin": origin,
+            "trend_score": round(data["trend_score"], 4),
+            "mentions": data["mentions"],
+            "recent_24h": recent,
+            "prev_24h": prev,
+            "spike": round(spike, 4),
+            "unique_terms": _count(data["unique_terms"]),
+            "subreddit_spread": _count(data["unique_subreddits"]),  # diffusion metric
+        })
+
+    results.sort(key=lambda x: x["trend_score"], reverse=True)
+    return results[:limit]
+
+
+@single_flight
 def get_trending_cuisines(
     days: int = 7,
     limit: int = 20,
     half_life_days: float = 2.5,
     a: float = 0.25,
     b: float = 0.15,
+    dedupe: bool = False,
 ):
     """
     Cuisine-level trending using the SAME scoring logic as get_trending_terms(),
-    but grouped by Term.cultural_origin.
+    but grouped by Term.cultural_origin. dedupe=True counts each near-duplicate cluster
+    once, so crossposts do not inflate mentions / subreddit_spread.
     """
     now = timezone.now()
-    window_start = now - timedelta(days=days)
-    last_24h_start = now - timedelta(hours=24)
-    prev_24h_start = now - timedelta(hours=48)
+    window_start, last_24h_start, prev_24h_start = _window_bounds(now, days)
+
+    # The hot store has no duplicate flags; dedupe reads the DB
+    store = None if dedupe else hotstore.get_store(days)
+    if store is not None:
+        with stage("cuisines.aggregate"):
+            by_origin = store.aggregate_origins(now, days, half_life_days, a, b)
+        with stage("cuisines.rank"):
+            return _rank_origins(by_origin, limit)
+
+    if pg.is_postgres():
+        with stage("cuisines.aggregate"):
+            by_origin = pg.aggregate_origins(
+                now, window_start, last_24h_start, prev_24h_start, half_life_days, a, b, dedupe=dedupe,
+            )
+        with stage("cuisines.rank"):
+            return _rank_origins(by_origin, limit)
 
     qs = (
         PostTerm.objects
@@ -29,64 +97,27 @@ def get_trending_cuisines(
         .filter(post__created_utc__gte=window_start, term__is_active=True)
         .only(
             "term_id", "post_id",
-            "post__created_utc", "post__score", "post__num_comments",
+            "post__created_utc", "post__score", "post__num_comments", "post__subreddit",
             "term__cultural_origin"
         )
     )
+    if dedupe:
+        qs = qs.filter(_counted_once(window_start))
 
     by_origin = {}
 
-    for pt in qs.iterator():
-        origin = pt.term.cultural_origin or "other"
-        post = pt.post
-        created = post.created_utc
-
-        age_days = max(0.0, (now - created).total_seconds() / 86400.0)
-        decay = _decay_weight(age_days, half_life_days)
-
-        score = post.score or 0
-        comments = post.num_comments or 0
-
-        contrib = decay * (1.0 + a * math.log1p(score) + b * math.log1p(comments))
-
-        if origin not in by_origin:
-            by_origin[origin] = {
-                "origin": origin,
-                "trend_score": 0.0,
-                "mentions": 0,
-                "recent_24h": 0,
-                "prev_24h": 0,
-                "unique_terms": set(),
-                "unique_subreddits": set(),
-            }
-
-        bucket = by_origin[origin]
-        bucket["trend_score"] += contrib
-        bucket["mentions"] += 1
-        bucket["unique_terms"].add(pt.term_id)
-        bucket["unique_subreddits"].add(post.subreddit)
-
-        if created >= last_24h_start:
-            bucket["recent_24h"] += 1
-        elif created >= prev_24h_start:
-            bucket["prev_24h"] += 1
-
-    results = []
-    for origin, data in by_origin.items():
-        recent = data["recent_24h"]
-        prev = data["prev_24h"]
-        spike = (recent + 1) / (prev + 1)
+    with stage("cuisines.scan"):
+        for pt in qs.iterator():
+            post = pt.post
+            contrib = _match_contrib(
+                now, post.created_utc, post.score or 0, post.num_comments or 0,
+                half_life_days, a, b,
+            )
+            _add_origin_match(
+                by_origin, pt.term.cultural_origin or "other", pt.term_id, post.subreddit,
+                post.created_utc, contrib, last_24h_start, prev_24h_start,
+            )
+    add_rows("cuisines.scan", sum(d["mentions"] for d in by_origin.values()))
 
-        results.append({
-            "origin": origin,
-            "trend_score": round(data["trend_score"], 4),
-            "mentions": data["mentions"],
-            "recent_24h": recent,
-            "prev_24h": prev,
-            "spike": round(spike, 4),
-            "unique_terms": len(data["unique_terms"]),
-            "subreddit_spread": len(data["unique_subreddits"]),  # diffusion metric
-        })
-
-    results.sort(key=lambda x: x["trend_score"], reverse=True)
-    return results[:limit]
\ No newline at end of file
+    with stage("cuisines.rank"):
+        return _rank_origins(by_origin, limit)
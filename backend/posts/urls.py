@@ -1,10 +1,20 @@
+from django.conf import settings
 from django.urls import path
-from posts import views
-from .views import api_trending_cuisines
+from posts import async_views, views
+
+# ASGI deployments serve the read API from async views (same URLs)
+read_api = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("api/trending-cuisines", api_trending_cuisines),
-    path("api/trends/", views.api_trends),
-    path("api/search/", views.api_search),
-    path("api/posts/", views.api_posts),
-]
\ No newline at end of file
+    path("api/trending-cuisines", read_api.api_trending_cuisines),
+    path("api/trends/", read_api.api_trends),
+    path("api/search/", read_api.api_search),
+    path("api/posts/", read_api.api_posts),
+    path("api/dashboard", views.api_dashboard),
+    path("api/terms/series", views.api_terms_series),
+    path("api/terms/<int:term_id>/series", views.api_term_series),
+    path("api/terms/<int:term_id>/related", views.api_term_related),
+    path("api/alerts", views.api_alerts),
+    path("api/pipeline/stats", views.api_pipeline_stats),
+    path("api/metrics", views.api_metrics),
+]
@@ -1,18 +1,27 @@
-from django.http import JsonResponse
+from datetime import timedelta
+
+from django.http import HttpResponse
+from django.utils import timezone
 from django.views.decorators.http import require_GET
 
-from posts.models import Post
+from posts.alerts import alert_payload
+from posts.models import Alert, Post
+from posts.perf import json_response, prometheus_text
+from posts.services.cooccurrence import RELATED_METRICS, get_related_terms
+from posts.services.dashboard import get_dashboard
+from posts.services.pipeline_stats import get_pipeline_stats
 from posts.services.search import search_posts
-from posts.services.trending import get_trending_terms
-from posts.trending_cuisines import get_trending_cuisines
+from posts.services.series import BUCKET_STEPS, get_term_series
+from posts.services.snapshots import get_cuisines_leaderboard, get_snapshot, get_terms_leaderboard
 
 
 @require_GET
 def api_trending_cuisines(request):
     days = int(request.GET.get("days", 7))
     limit = int(request.GET.get("limit", 12))
-    results = get_trending_cuisines(days=days, limit=limit)
-    return JsonResponse({"days": days, "limit": limit, "results": results})
+    dedupe = request.GET.get("dedupe") == "1"  # count each near-duplicate cluster once
+    results = get_cuisines_leaderboard(days=days, limit=limit, dedupe=dedupe)
+    return json_response({"days": days, "limit": limit, "dedupe": dedupe, "results": results})
 
 
 @require_GET
@@ -29,26 +38,127 @@ def api_posts(request):
         "num_comments": p.num_comments,
     } for p in qs]
 
-    return JsonResponse({"limit": limit, "results": results})
+    return json_response({"limit": limit, "results": results})
 
 
 @require_GET
 def api_trends(request):
     days = int(request.GET.get("days", 7))
     limit = int(request.GET.get("limit", 20))
-    results = get_trending_terms(days=days, limit=limit)
-    return JsonResponse({"days": days, "limit": limit, "results": results})
+    dedupe = request.GET.get("dedupe") == "1"
+    results = get_terms_leaderboard(days=days, limit=limit, dedupe=dedupe)
+    return json_response({"days": days, "limit": limit, "dedupe": dedupe, "results": results})
 
 
 @require_GET
 def api_search(request):
     q = request.GET.get("q", "").strip()
     if not q:
-        return JsonResponse({"results": [], "error": "Missing q parameter"}, status=400)
+        return json_response({"results": [], "error": "Missing q parameter"}, status=400)
 
     days = int(request.GET.get("days", 30))
     limit = int(request.GET.get("limit", 20))
     term = request.GET.get("term")  # optional exact Term.text
 
     results = search_posts(q=q, days=days, limit=limit, term_text=term)
-    return JsonResponse({"q": q, "days": days, "limit": limit, "term": term, "results": results})
\ No newline at end of file
+    return json_response({"q": q, "days": days, "limit": limit, "term": term, "results": results})
+
+
+@require_GET
+def api_dashboard(request):
+    days = int(request.GET.get("days", 7))
+    limit = int(request.GET.get("limit", 20))
+    cuisine_limit = int(request.GET.get("cuisine_limit", 12))
+    q = request.GET.get("q", "").strip()
+    search_days = int(request.GET.get("search_days", 30))
+    search_limit = int(request.GET.get("search_limit", 30))
+    term = request.GET.get("term")  # optional exact Term.text
+
+    trends = get_snapshot("terms", days, limit)
+    cuisines = get_snapshot("cuisines", days, cuisine_limit)
+    if trends is not None and cuisines is not None:
+        search = search_posts(q=q, days=search_days, limit=search_limit, term_text=term) if q else []
+        data = {"trends": trends, "cuisines": cuisines, "search": search}
+    else:
+        data = get_dashboard(
+            days=days, limit=limit, cuisine_limit=cuisine_limit,
+            q=q, search_days=search_days, search_limit=search_limit, term_text=term,
+        )
+    return json_response({
+        "days": days,
+        "limit": limit,
+        "cuisine_limit": cuisine_limit,
+        "trends": data["trends"],
+        "cuisines": data["cuisines"],
+        "search": {"q": q, "days": search_days, "limit": search_limit, "term": term, "results": data["search"]},
+    })
+
+
+def _series_response(request, term_ids):
+    bucket = request.GET.get("bucket", "day")
+    if bucket not in BUCKET_STEPS:
+        return json_response({"results": [], "error": "bucket must be hour or day"}, status=400)
+
+    days = int(request.GET.get("days", 7))
+    data = get_term_series(term_ids=term_ids[:50], bucket=bucket, days=days)
+    return json_response({"days": days, **data})
+
+
+@require_GET
+def api_term_series(request, term_id):
+    return _series_response(request, [term_id])
+
+
+@require_GET
+def api_terms_series(request):
+    # Several terms in one call: ?ids=1,2,3 (max 50)
+    try:
+        term_ids = [int(x) for x in request.GET.get("ids", "").split(",") if x.strip()]
+    except ValueError:
+        return json_response({"results": [], "error": "ids must be comma-separated integers"}, status=400)
+    if not term_ids:
+        return json_response({"results": [], "error": "Missing ids parameter"}, status=400)
+    return _series_response(request, term_ids)
+
+
+@require_GET
+def api_term_related(request, term_id):
+    # ?days=30&limit=20&min_count=2&metric=pmi|lift
+    metric = request.GET.get("metric", "pmi")
+    if metric not in RELATED_METRICS:
+        return json_response({"results": [], "error": "metric must be pmi or lift"}, status=400)
+
+    data = get_related_terms(
+        term_id,
+        days=int(request.GET.get("days", 30)),
+        limit=min(int(request.GET.get("limit", 20)), 100),
+        min_count=int(request.GET.get("min_count", 2)),
+        metric=metric,
+    )
+    if data is None:
+        return json_response({"results": [], "error": "Unknown term"}, status=404)
+    return json_response(data)
+
+
+@require_GET
+def api_alerts(request):
+    # ?hours=24&limit=50&scope=term|cuisine -- newest first
+    since = timezone.now() - timedelta(hours=int(request.GET.get("hours", 24)))
+    qs = Alert.objects.filter(fired_at__gte=since).order_by("-fired_at", "-id")
+    scope = request.GET.get("scope")
+    if scope:
+        qs = qs.filter(scope=scope)
+    limit = min(int(request.GET.get("limit", 50)), 500)
+    return json_response({"results": [alert_payload(a) for a in qs[:limit]]})
+
+
+@require_GET
+def api_pipeline_stats(request):
+    days = int(request.GET.get("days", 7))
+    return json_response(get_pipeline_stats(days=days))
+
+
+@require_GET
+def api_metrics(request):
+    # Prometheus text exposition (populated when PERF_INSTRUMENTATION is on)
+    return HttpResponse(prometheus_text(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,166 @@
+"""
+Load test for the read API: compares throughput/latency under WSGI vs ASGI.
+
+Starts each server itself (run from backend/ with a populated db.sqlite3):
+
+    python scripts/loadtest.py --concurrency 32 --duration 20
+
+Or point it at an already running server:
+
+    python scripts/loadtest.py --url http://127.0.0.1:8000
+
+Server commands default to gunicorn (WSGI) and uvicorn (ASGI); both must be installed
+(pip install gunicorn uvicorn). Override with --wsgi-cmd / --asgi-cmd.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+DEFAULT_PATHS = [
+    "/api/trends/?days=7&limit=20",
+    "/api/trending-cuisines?days=7&limit=12",
+    "/api/search/?q=ramen&days=30&limit=30",
+    "/api/posts/?limit=20",
+]
+
+WSGI_CMD = "gunicorn config.wsgi:application --workers {workers} --threads 1 --bind 127.0.0.1:{port}"
+ASGI_CMD = "uvicorn config.asgi:application --workers {workers} --host 127.0.0.1 --port {port}"
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(pct / 100.0 * (len(values) - 1)))))
+    return values[k]
+
+
+def run_load(base_url: str, paths: list[str], concurrency: int, duration: float, timeout: float = 30.0):
+    """
+    Closed-loop load: `concurrency` threads each cycle through `paths` until `duration` ends.
+    """
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset: int):
+        nonlocal errors
+        i = offset
+        local_lat = []
+        local_err = 0
+        while time.perf_counter() < deadline:
+            url = base_url + paths[i % len(paths)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as r:
+                    r.read()
+                local_lat.append(time.perf_counter() - t0)
+            except (urllib.error.URLError, OSError):
+                local_err += 1
+        with lock:
+            latencies.extend(local_lat)
+            errors += local_err
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + "/api/posts/?limit=1", timeout=2) as r:
+                r.read()
+                return
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.3)
+    raise RuntimeError(f"Server at {base_url} did not become ready in {timeout}s")
+
+
+def run_server_and_load(name: str, cmd: str, port: int, args):
+    base_url = f"http://127.0.0.1:{port}"
+    argv = shlex.split(cmd.format(workers=args.workers, port=port))
+    print(f"[{name}] starting: {' '.join(argv)}")
+    try:
+        proc = subprocess.Popen(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=os.environ.copy())
+    except FileNotFoundError:
+        print(f"[{name}] {argv[0]} not installed; skipping")
+        return None
+
+    try:
+        _wait_ready(base_url)
+        # warm caches / connections before measuring
+        run_load(base_url, args.paths, concurrency=2, duration=1.0)
+        result = run_load(base_url, args.paths, args.concurrency, args.duration)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    print(f"[{name}] {result}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="Load an already running server instead of starting WSGI/ASGI.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per server.")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes.")
+    parser.add_argument("--path", dest="paths", action="append", default=None, help="Request path (repeatable).")
+    parser.add_argument("--wsgi-cmd", default=WSGI_CMD)
+    parser.add_argument("--asgi-cmd", default=ASGI_CMD)
+    parser.add_argument("--json", dest="json_out", default=None, help="Write results to this JSON file.")
+    args = parser.parse_args(argv)
+    args.paths = args.paths or DEFAULT_PATHS
+
+    if args.url:
+        results = {"server": run_load(args.url.rstrip("/"), args.paths, args.concurrency, args.duration)}
+        print(json.dumps(results, indent=2))
+    else:
+        results = {
+            "wsgi": run_server_and_load("wsgi", args.wsgi_cmd, 8011, args),
+            "asgi": run_server_and_load("asgi", args.asgi_cmd, 8012, args),
+        }
+        print(f"\n{'server':<6} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for name, r in results.items():
+            if r:
+                print(f"{name:<6} {r['rps']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9} {r['errors']:>7}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
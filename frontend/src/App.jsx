@@ -52,41 +52,26 @@ export default function App() {
 
   const top5 = useMemo(() => trending.slice(0, 5), [trending]);
 
-  async function fetchTrending() {
+  // Trends + cuisines in one round trip (shared backend scan)
+  async function refreshAll() {
     setTrendLoading(true);
-    setTrendErr("");
-    try {
-      const r = await fetch(`${API_BASE}/api/trends/?days=${days}&limit=${limit}`);
-      const data = await r.json();
-      setTrending(data.results || []);
-    } catch (e) {
-      setTrendErr("Failed to load trends. Is Django running on 8000?");
-    } finally {
-      setTrendLoading(false);
-    }
-  }
-
-  // NEW: fetch cuisines
-  async function fetchCuisines() {
     setCuisineLoading(true);
+    setTrendErr("");
     setCuisineErr("");
     try {
-      const r = await fetch(`${API_BASE}/api/trending-cuisines?days=${days}&limit=12`);
+      const r = await fetch(`${API_BASE}/api/dashboard?days=${days}&limit=${limit}&cuisine_limit=12`);
       const data = await r.json();
-      setCuisines(data.results || []);
+      setTrending(data.trends || []);
+      setCuisines(data.cuisines || []);
     } catch (e) {
+      setTrendErr("Failed to load trends. Is Django running on 8000?");
       setCuisineErr("Failed to load cuisines. Is Django running on 8000?");
     } finally {
+      setTrendLoading(false);
       setCuisineLoading(false);
     }
   }
 
-  // Refresh both at once
-  function refreshAll() {
-    fetchTrending();
-    fetchCuisines();
-  }
-
   async function runSearch(nextQ, nextTerm) {
     const query = (nextQ ?? q).trim();
     const term = (nextTerm ?? activeTerm).trim();